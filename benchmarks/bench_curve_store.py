@@ -0,0 +1,86 @@
+"""Benchmark kho đường cong (gui.curve_store): ghi file LAS lớn và đọc theo khoảng độ sâu.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_curve_store [--rows 5000000] [--points 2000] [--dir /tmp/curve-bench]
+
+File LAS giả lập (--rows dòng x 8 đường cong, bước 0.1524 m) được ghi vào
+--dir và dùng lại ở lần chạy sau. So sánh đọc một khoảng độ sâu ở độ phân
+giải màn hình (--points điểm) từ kho đường cong với cách đọc cả file LAS rồi
+cắt mảng; min/max của kết quả được kiểm tra với mẫu gốc.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import write_las
+from gui.curve_store import CurveStore
+from gui.loaders.las_reader import LasFile
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def check(curve_set, data, top, bottom, points):
+    """Min/max của kết quả phải bằng min/max mẫu gốc trên đúng các khối đã đọc"""
+    window = curve_set.window("C01", top, bottom, points)
+    assert len(window.depth) <= points + 1, (len(window.depth), points)
+    if not len(window.depth):
+        return
+    size = curve_set.factor ** window.level
+    first = np.searchsorted(data[:, 0], window.depth[0])
+    samples = data[first:first + len(window.depth) * size, 1]
+    assert np.nanmin(window.low) == np.nanmin(samples) and np.nanmax(window.high) == np.nanmax(samples)
+
+
+def _las_arrays(path):
+    las = LasFile(path)
+    data = las.data()
+    curves = [{"mnemonic": c.mnemonic, "unit": c.unit, "description": c.description} for c in las.curves[1:]]
+    return las.value("WELL"), os.path.basename(path), data[:, 0], data[:, 1:], curves
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--points", type=int, default=2000, help="số điểm tối đa mỗi lần đọc (chiều cao track)")
+    parser.add_argument("--windows", type=int, default=200, help="số khoảng độ sâu ngẫu nhiên")
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "curve-bench"))
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    path = os.path.join(args.dir, f"log-{args.rows}.las")
+    if not os.path.exists(path):
+        write_las(path, args.rows, well="CURVE-BENCH")
+    print(f"File LAS: {os.path.getsize(path) / 1e6:.0f} MB, {args.rows:,} dòng x 8 đường cong")
+
+    store = CurveStore(os.path.join(args.dir, "store"))
+    arrays = _las_arrays(path)
+    set_path, write_time = timed(lambda: store.write(*arrays))
+    size = sum(entry.stat().st_size for entry in os.scandir(set_path)) / 1e6
+    curve_set = store.open("CURVE-BENCH", os.path.basename(path))
+    print(f"  ghi kho (đã parse LAS)   {write_time:8.2f}s  {size:.0f} MB trên đĩa, "
+          f"tầng {', '.join(f'{count:,}' for count in curve_set.levels)} khối")
+
+    data, parse_time = timed(LasFile(path).data)
+    rng = np.random.default_rng(0)
+    tops = rng.uniform(curve_set.top, curve_set.bottom, args.windows)
+    spans = rng.uniform(10, curve_set.bottom - curve_set.top, args.windows)
+    for top, span in zip(tops[:20], spans[:20]):
+        check(curve_set, data, top, top + span, args.points)
+    print("  kết quả khớp min/max của mẫu gốc")
+
+    full, full_time = timed(lambda: curve_set.window("C01", max_points=args.points))
+    print(f"  cả log ({curve_set.bottom - curve_set.top:,.0f} m): {len(full.depth):,} điểm (tầng {full.level}) "
+          f"trong {full_time * 1000:.2f} ms; đọc cả file LAS: {parse_time:.2f}s")
+    _, windows_time = timed(lambda: [curve_set.window("C01", top, top + span, args.points)
+                                     for top, span in zip(tops, spans)])
+    _, slice_time = timed(lambda: [(np.nanmin(data[a:b, 1]), np.nanmax(data[a:b, 1])) for a, b in (
+        np.searchsorted(data[:, 0], (top, top + span)) for top, span in zip(tops, spans))])
+    print(f"  {args.windows} khoảng ngẫu nhiên: kho {windows_time / args.windows * 1000:.2f} ms/lần, "
+          f"min/max trên mảng đã load {slice_time / args.windows * 1000:.2f} ms/lần")
+
@@ -0,0 +1,99 @@
+"""Benchmark đọc file LAS: header-only so với đọc cả ~A, và tốc độ đọc đường cong của file lớn.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_las [--mb 300] [--files 200] [--dir /tmp/las-bench]
+
+File giả lập được ghi vào --dir (mặc định thư mục tạm) và dùng lại ở lần chạy sau.
+"""
+import argparse
+import mmap
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import WELL_LOG_COLUMNS, write_las
+from gui.loaders.file_loaders import LasLoader
+from gui.loaders.las_reader import LasFile, _chunks, _parse_tokens
+
+BYTES_PER_ROW = 81  # 8 đường cong x 10 ký tự + xuống dòng
+
+
+def ensure_file(path, rows):
+    if not os.path.exists(path):
+        write_las(path, rows, well=os.path.splitext(os.path.basename(path))[0])
+    return path
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def bench_headers(directory, count, rows_per_file):
+    paths = [ensure_file(os.path.join(directory, f"well-{i:04d}.las"), rows_per_file) for i in range(count)]
+    total_mb = sum(os.path.getsize(path) for path in paths) / 1e6
+    print(f"\n{count} file LAS x {rows_per_file:,} dòng ({total_mb:.0f} MB)")
+
+    rows, header_time = timed(lambda: [row for batch in LasLoader(paths, WELL_LOG_COLUMNS).iter_batches()
+                                       for row in batch])
+    assert len(rows) == count and rows[0][0] == "well-0000"
+    _, full_time = timed(lambda: [LasFile(path).data() for path in paths])
+    print(f"  header-only (dòng WellLog)  {header_time:8.3f}s  {count / header_time:10.0f} file/s")
+    print(f"  header + toàn bộ ~A         {full_time:8.3f}s  {count / full_time:10.0f} file/s")
+
+
+def bench_curves(directory, size_mb):
+    rows = int(size_mb * 1e6 / BYTES_PER_ROW)
+    path = ensure_file(os.path.join(directory, f"big-{size_mb}mb.las"), rows)
+    size = os.path.getsize(path) / 1e6
+    print(f"\nFile lớn: {size:.0f} MB, {rows:,} dòng x 8 đường cong")
+
+    las, header_time = timed(lambda: LasFile(path))
+    print(f"  header-only                 {header_time * 1000:8.1f} ms")
+
+    data, fast_time = timed(las.data)
+    print(f"  data() cột cố định + mmap   {fast_time:8.2f}s  {size / fast_time:7.0f} MB/s")
+    tracemalloc.start()
+    LasFile(path).data()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  bộ nhớ đỉnh khi đọc         {peak / 2**20:8.0f} MiB (kết quả {data.nbytes / 2**20:.0f} MiB)")
+
+    def tokens():
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return np.concatenate([_parse_tokens(mm[start:stop], " ", 8)
+                                       for start, stop in _chunks(mm, las.data_offset, len(mm))])
+    values, token_time = timed(tokens)
+    print(f"  np.fromstring theo chunk    {token_time:8.2f}s  {size / token_time:7.0f} MB/s")
+
+    sample = 200_000
+    def python_floats():
+        with open(path, "rb") as f:
+            f.seek(las.data_offset)
+            return [[float(token) for token in next(f).split()] for _ in range(sample)]
+    _, python_time = timed(python_floats)
+    python_time *= rows / sample
+    print(f"  float() từng dòng (ước tính){python_time:8.2f}s  {size / python_time:7.0f} MB/s")
+
+    values = values.reshape(-1, 8)
+    values[values == las.null_value] = np.nan
+    assert np.array_equal(data, values, equal_nan=True)
+    print(f"  kết quả giống hệt np.fromstring; nhanh hơn {token_time / fast_time:.1f}x, "
+          f"hơn float() {python_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, nargs="+", default=[300])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--rows-per-file", type=int, default=5000)
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "las-bench"))
+    args = parser.parse_args()
+    os.makedirs(args.dir, exist_ok=True)
+    bench_headers(args.dir, args.files, args.rows_per_file)
+    for size_mb in args.mb:
+        bench_curves(args.dir, size_mb)
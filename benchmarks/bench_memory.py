@@ -0,0 +1,72 @@
+"""Báo cáo bộ nhớ của dữ liệu WellLog: list các dòng chuỗi so với ColumnStore có kiểu.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_memory [--rows 1000000]
+"""
+import argparse
+import csv
+import gc
+import io
+import time
+import tracemalloc
+
+from benchmarks.synthetic import WELL_LOG_COLUMNS, iter_well_log_rows
+from gui.column_store import ColumnStore
+from gui.loaders.base import batched
+from gui.schema import build_schema
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def csv_text(count):
+    """Dữ liệu dạng CSV để mỗi ô là một chuỗi riêng như khi đọc từ file"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(iter_well_log_rows(count))
+    return buffer.getvalue()
+
+
+def build_rows(text):
+    return list(csv.reader(io.StringIO(text)))
+
+
+def build_store(text):
+    store = ColumnStore(build_schema(WELL_LOG_COLUMNS))
+    for batch in batched(csv.reader(io.StringIO(text)), 5000):
+        store.append_rows(batch)
+    return store
+
+
+def main(count):
+    mib = 1024 * 1024
+    text = csv_text(count)
+    rows, rows_bytes, rows_peak, rows_time = measure(lambda: build_rows(text))
+    del rows
+    store, store_bytes, store_peak, store_time = measure(lambda: build_store(text))
+
+    print(f"WellLog, {count:,} rows")
+    print(f"  {'':<28}{'retained (MiB)':>16}{'peak (MiB)':>12}{'bytes/cell':>12}{'build (s)':>11}")
+    cells = count * len(WELL_LOG_COLUMNS)
+    print(f"  {'list of str rows (before)':<28}{rows_bytes / mib:>16.1f}{rows_peak / mib:>12.1f}"
+          f"{rows_bytes / cells:>12.1f}{rows_time:>11.2f}")
+    print(f"  {'typed ColumnStore (after)':<28}{store_bytes / mib:>16.1f}{store_peak / mib:>12.1f}"
+          f"{store_bytes / cells:>12.1f}{store_time:>11.2f}")
+    print(f"  reduction: {rows_bytes / max(store_bytes, 1):.1f}x")
+    for col, spec in enumerate(store.schema):
+        values = store.values(col)
+        size = len(values) * getattr(values, "itemsize", 8)
+        print(f"    {spec.name:<18}{spec.kind:<10}{size / mib:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    main(parser.parse_args().rows)
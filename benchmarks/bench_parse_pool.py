@@ -0,0 +1,120 @@
+"""Benchmark parse file import trên nhiều process (gui.parse_pool).
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_parse_pool [--files 64] [--rows 50000] [--processes 1 2 4 8 16]
+
+Sinh --files file CSV WellLog (--rows dòng mỗi file) trong --dir và dùng lại ở
+lần chạy sau. Đo thời gian parse + kiểm tra cả bộ file trên N thread (GIL:
+không nhanh hơn một core) rồi trên ParsePool với từng số process (mặc định
+1, 2, 4... đến số CPU); các process được tạo trước khi đo. Bảng kết quả là
+đường scaling: file/s, dòng/s, tăng tốc so với số process nhỏ nhất và hiệu
+suất trên mỗi process (1.00: tăng tuyến tính). Kết quả của pool
+được so với parse trên thread. Cuối cùng so kích thước ColumnBatch gói qua
+shared memory với list dòng pickle và thời gian đưa vào ColumnStore +
+SearchIndex của hai dạng.
+"""
+import argparse
+import csv
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic import WELL_LOG_COLUMNS, iter_well_log_rows
+from gui.column_store import ColumnStore
+from gui.parse_pool import ParsePool, RecordValidator, pack, parse_file, unpack
+from gui.schema import build_schema
+from gui.search_index import SearchIndex
+
+
+def ensure_files(directory, count, rows):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"welllog-{rows}-{i:04d}.csv")
+        if not os.path.exists(path):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(WELL_LOG_COLUMNS)
+                writer.writerows(iter_well_log_rows(rows, seed=i))
+        paths.append(path)
+    return paths
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def parse_threads(paths, validator, threads):
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(lambda path: parse_file(path, WELL_LOG_COLUMNS, validator), paths))
+
+
+def parse_processes(pool, paths, validator):
+    # Như ImportPipeline: mỗi file một thread chờ kết quả của một process
+    with ThreadPoolExecutor(pool.processes) as executor:
+        return list(executor.map(lambda path: pool.result(pool.submit(path, WELL_LOG_COLUMNS, validator)), paths))
+
+
+def bench_append(batch):
+    """Thời gian đưa một file vào ColumnStore + SearchIndex: list dòng so với ColumnBatch"""
+    rows = batch.rows()
+    schema = build_schema(WELL_LOG_COLUMNS)
+
+    def append(add_rows):
+        store, index = ColumnStore(schema), SearchIndex()
+        add_rows(store, index)
+        return store
+
+    by_rows, rows_time = timed(lambda: append(lambda store, index: (store.append_rows(rows), index.add_rows(rows))))
+    by_batch, batch_time = timed(lambda: append(lambda store, index: (store.append_batch(batch),
+                                                                      index.add_batch(batch))))
+    assert [by_rows.row(row) for row in range(0, len(rows), 997)] == \
+        [by_batch.row(row) for row in range(0, len(rows), 997)]
+    pickled = pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+    _, loads_time = timed(lambda: pickle.loads(pickled))
+    _, unpack_time = timed(lambda: unpack(pack(batch)))
+    print(f"\nMột file ({len(rows):,} dòng): list dòng pickle {len(pickled) / 1e6:.1f} MB "
+          f"(unpickle {loads_time * 1000:.0f} ms), ColumnBatch gói {batch.nbytes / 1e6:.1f} MB "
+          f"(gói + chép ra {unpack_time * 1000:.0f} ms)")
+    print(f"  đưa vào ColumnStore + SearchIndex: list dòng {rows_time * 1000:.0f} ms, "
+          f"ColumnBatch {batch_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=sorted({1 << i for i in range(cpus.bit_length())} | {cpus}))
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "parse-bench"))
+    args = parser.parse_args()
+    args.processes = sorted(set(args.processes))
+
+    os.makedirs(args.dir, exist_ok=True)
+    paths = ensure_files(args.dir, args.files, args.rows)
+    total_rows = args.files * args.rows
+    size = sum(os.path.getsize(path) for path in paths) / 1e6
+    validator = RecordValidator("WellLog", WELL_LOG_COLUMNS)
+    print(f"{args.files} file CSV x {args.rows:,} dòng ({size:.0f} MB), {cpus} CPU")
+
+    expected, base_time = timed(lambda: parse_threads(paths, validator, args.threads))
+    print(f"  {args.threads} thread        {base_time:8.2f}s  {args.files / base_time:8.1f} file/s  "
+          f"{total_rows / base_time:12,.0f} dòng/s")
+    base = args.processes[0]
+    print(f"\nScaling ParsePool (so với {base} process):")
+    single = None
+    for processes in args.processes:
+        pool = ParsePool(processes)
+        parse_processes(pool, paths[:processes], validator)  # tạo sẵn các process
+        batches, elapsed = timed(lambda: parse_processes(pool, paths, validator))
+        pool.shutdown()
+        assert all(got.rows() == want.rows() for got, want in zip(batches[:2], expected[:2]))
+        single = single or elapsed
+        speedup = single / elapsed
+        print(f"  {processes:<3} process     {elapsed:8.2f}s  {args.files / elapsed:8.1f} file/s  "
+              f"{total_rows / elapsed:12,.0f} dòng/s  x{speedup:5.2f}  hiệu suất {speedup * base / processes:4.2f}")
+    bench_append(expected[0])
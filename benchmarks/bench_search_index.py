@@ -0,0 +1,43 @@
+"""So sánh SearchIndex với cách quét tuyến tính cũ của apply_filter.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_search_index [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import well_log_rows
+from gui.search_index import SearchIndex
+
+KEYWORDS = ["ht-242x", "run#3", "halliburton", "-7-", "zzz-not-found"]
+
+
+def linear_scan(rows, keyword):
+    return [row for row in rows if any(keyword in str(cell).lower() for cell in row)]
+
+
+def run(size):
+    rows = well_log_rows(size)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_rows(rows)
+    build = time.perf_counter() - start
+    print(f"\n{size:>9,} rows  build index: {build:8.3f}s")
+    print(f"  {'keyword':<16}{'matches':>10}{'linear (s)':>14}{'index (s)':>14}{'speedup':>10}")
+    for keyword in KEYWORDS:
+        start = time.perf_counter()
+        expected = linear_scan(rows, keyword)
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = index.search(keyword)
+        indexed = time.perf_counter() - start
+
+        assert len(found) == len(expected), keyword
+        print(f"  {keyword:<16}{len(found):>10,}{linear:>14.4f}{indexed:>14.4f}{linear / max(indexed, 1e-9):>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    for size in parser.parse_args().sizes:
+        run(size)
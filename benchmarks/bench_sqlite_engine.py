@@ -0,0 +1,83 @@
+"""Benchmark engine SQLite: thời gian lật trang ở đầu/giữa/cuối kết quả và bộ nhớ theo số dòng.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_sqlite_engine [--rows 100000 400000] [--dir /tmp/sqlite-bench]
+
+Mỗi kích thước dùng một file SQLite riêng trong --dir (ghi lại mỗi lần chạy).
+Bộ nhớ là RSS của process (không có trên Windows), đo sau khi load và sau khi
+lật qua các trang.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import WELL_LOG_COLUMNS, iter_well_log_rows
+from gui.loaders.base import batched
+from gui.query_filter import compile_query
+from gui.schema import build_schema
+from gui.sqlite_engine import SqliteEngine
+
+FILTERS = [
+    ("", ""),
+    ("ht-12", ""),
+    ("", "Log Class = Petrophysics and Start Depth between 1000 and 2000"),
+    ("rwd", "not Date >= 2020-01-01"),
+]
+PAGE = 50
+TURNS = 20
+
+
+def rss_mib():
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def turn_pages(result, first_page):
+    """Thời gian trung bình (ms) mỗi lần sang trang kế tiếp, bắt đầu từ first_page"""
+    result[first_page * PAGE]  # trang đầu tiên: nhảy bằng OFFSET
+    start = time.perf_counter()
+    for page in range(first_page, first_page + TURNS):
+        for position in range(page * PAGE, min((page + 1) * PAGE, len(result))):
+            result.table.display(result[position], 0)
+    return (time.perf_counter() - start) * 1000 / TURNS
+
+
+def main(rows, directory):
+    path = os.path.join(directory, f"catalog-{rows}.sqlite3")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    schema = build_schema(WELL_LOG_COLUMNS)
+    table = SqliteEngine(path).table("WellLog", schema)
+    start = time.perf_counter()
+    for batch in batched(iter_well_log_rows(rows), 5000):
+        table.append_rows(batch)
+    load_time = time.perf_counter() - start
+    print(f"\nWellLog, {rows:,} rows: load {load_time:.1f}s, file {os.path.getsize(path) / 2**20:.0f} MiB, "
+          f"RSS {rss_mib():.0f} MiB")
+    print(f"  {'keyword':<8}{'biểu thức':<62}{'dòng':>9}{'lọc (ms)':>10}"
+          f"{'trang đầu':>11}{'giữa':>8}{'cuối':>8}  (ms/lần sang trang)")
+    for keyword, text in FILTERS:
+        query = compile_query(text, schema) if text else None
+        start = time.perf_counter()
+        result = table.select(keyword, query)
+        select_time = (time.perf_counter() - start) * 1000
+        pages = max(1, len(result) // PAGE - TURNS)
+        timings = [turn_pages(result, page) for page in (0, pages // 2, pages - 1)]
+        print(f"  {keyword!r:<8}{text!r:<62}{len(result):>9}{select_time:>10.1f}"
+              + "".join(f"{timing:>{width}.2f}" for timing, width in zip(timings, (11, 8, 8))))
+    print(f"  RSS sau khi lật trang: {rss_mib():.0f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000])
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "sqlite-bench"))
+    args = parser.parse_args()
+    os.makedirs(args.dir, exist_ok=True)
+    for count in args.rows:
+        main(count, args.dir)
@@ -0,0 +1,101 @@
+"""Benchmark khởi động app (cold start): thời gian import, dựng cửa sổ và tới lần vẽ đầu tiên.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_startup [--runs 5] [--target 1500]
+
+Mỗi lần đo là một process mới (Qt offscreen, cache trên đĩa tắt). Các mốc:
+import (PyQt5 + main), dựng OSDUApp, từ show() tới khi cửa sổ vẽ xong lần đầu,
+tổng từ lúc chạy process tới lần vẽ đầu, và thời gian mở tab Import lần đầu
+(phần được dựng trễ). --target (ms): trả về mã lỗi 1 nếu median của tổng vượt
+mức này. Cũng in các module nặng đã bị import lúc khởi động (lẽ ra chỉ import
+khi dùng).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Các module chỉ nên được import khi dùng lần đầu, không phải lúc khởi động
+DEFERRED_MODULES = ["yaml", "asyncio", "urllib.request", "gui.data_loader", "gui.loaders.file_loaders",
+                    "gui.export_engine", "gui.dialogs.import_dialog.data_import_dialog"]
+MEASURES = ["import", "window", "first_paint", "process", "import_tab"]
+
+
+def startup():
+    """Chạy trong process con: mở app, trả về các mốc thời gian (ms) và module nạp sớm"""
+    started = time.perf_counter()
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["OSDU_CACHE_MAX_MB"] = "0"
+    from PyQt5.QtCore import QEvent, QObject
+    from PyQt5.QtWidgets import QApplication
+    import main
+    imported = time.perf_counter()
+    loaded_early = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    app = QApplication(sys.argv[:1])
+    window = main.OSDUApp()
+    built = time.perf_counter()
+
+    class PaintWatcher(QObject):
+        painted = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and self.painted is None:
+                self.painted = time.perf_counter()
+            return False
+
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    window.show()
+    while watcher.painted is None:
+        app.processEvents()
+    app.processEvents()  # các widget con vẽ trong cùng vòng sự kiện
+    painted = time.perf_counter()
+    painted_at = time.time()
+    app.removeEventFilter(watcher)
+
+    window.tabs.setCurrentIndex(1)
+    app.processEvents()
+    import_tab = time.perf_counter()
+    return {
+        "import": (imported - started) * 1000,
+        "window": (built - imported) * 1000,
+        "first_paint": (painted - built) * 1000,
+        "painted_at": painted_at,
+        "import_tab": (import_tab - painted) * 1000,
+        "loaded_early": loaded_early,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, help="mức tối đa (ms) của median tổng thời gian tới lần vẽ đầu")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(startup()))
+        sys.exit()
+
+    samples = {name: [] for name in MEASURES}
+    print(f"  {'lần':<6}{'import':>10}{'dựng cửa sổ':>13}{'vẽ đầu':>10}{'tổng':>10}{'tab Import':>12}  (ms)")
+    for run in range(1, args.runs + 1):
+        launched = time.time()
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["process"] = (result["painted_at"] - launched) * 1000
+        for name in MEASURES:
+            samples[name].append(result[name])
+        print(f"  {run:<6}{result['import']:>10.0f}{result['window']:>13.0f}{result['first_paint']:>10.0f}"
+              f"{result['process']:>10.0f}{result['import_tab']:>12.0f}")
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    print(f"  {'median':<6}{medians['import']:>10.0f}{medians['window']:>13.0f}{medians['first_paint']:>10.0f}"
+          f"{medians['process']:>10.0f}{medians['import_tab']:>12.0f}")
+    if result["loaded_early"]:
+        print("  module bị import lúc khởi động: " + ", ".join(result["loaded_early"]))
+    if args.target is not None and medians["process"] > args.target:
+        print(f"  vượt mức {args.target:.0f} ms")
+        sys.exit(1)
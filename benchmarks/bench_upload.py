@@ -0,0 +1,125 @@
+"""Benchmark và kiểm tra upload theo phần (gui.upload_client) với server storage giả lập.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_upload [--mb 256] [--part-mb 8] [--delay 0.05]
+
+Trước tiên upload một file nhỏ thành nhiều phần (hơn 10, thứ tự số phần
+không phải thứ tự chuỗi) và kiểm tra file ghép trên server.
+Với mỗi mức concurrency: upload một file --mb MB và kiểm tra file ghép trên
+server giống hệt file gốc. --delay (giây) là độ trễ giả lập của mỗi phần trên
+server (như mạng thật), để thấy hiệu quả của việc gửi song song. Sau đó thử
+hủy giữa chừng rồi upload tiếp (chỉ các phần còn thiếu được gửi) và upload khi
+server lỗi ngẫu nhiên (--fail-rate) để kiểm tra gửi lại.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from gui.upload_client import UploadCancelled, UploadClient
+from tools.mock_storage_server import start_server
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_location(server, location, path):
+    stored = os.path.join(server.directory, *location.split("/")[2:])
+    assert file_sha256(stored) == file_sha256(path), "file trên server khác file gốc"
+
+
+def bench_concurrency(path, args, work):
+    size = os.path.getsize(path)
+    print(f"\nFile {size / 1e6:.0f} MB, phần {args.part_mb} MB, trễ {args.delay * 1000:.0f} ms/phần")
+    for concurrency in args.concurrency:
+        server, url = start_server(os.path.join(work, f"server-{concurrency}"), delay=args.delay)
+        client = UploadClient(url, os.path.join(work, f"state-{concurrency}"),
+                              part_size=args.part_mb * 2**20, concurrency=concurrency)
+        start = time.perf_counter()
+        location = client.upload(path)
+        elapsed = time.perf_counter() - start
+        check_location(server, location, path)
+        print(f"  concurrency {concurrency:<3} {elapsed:7.2f}s  {size / elapsed / 1e6:8.1f} MB/s  "
+              f"{client.pool.opened} kết nối")
+        client.close()
+        server.shutdown()
+
+
+def check_many_parts(work, parts=37, part_size=64 * 1024):
+    """Upload một file thành parts phần (> 10) và kiểm tra server ghép đúng thứ tự"""
+    path = os.path.join(work, "many-parts.bin")
+    with open(path, "wb") as f:
+        f.write(os.urandom(parts * part_size - part_size // 2))  # phần cuối ngắn hơn
+    server, url = start_server(os.path.join(work, "server-parts"))
+    client = UploadClient(url, os.path.join(work, "state-parts"), part_size=part_size, concurrency=4)
+    check_location(server, client.upload(path), path)
+    print(f"Upload {parts} phần: file trên server khớp")
+    client.close()
+    server.shutdown()
+
+
+def check_resume(path, args, work):
+    server, url = start_server(os.path.join(work, "server-resume"), delay=args.delay)
+    state = os.path.join(work, "state-resume")
+    size = os.path.getsize(path)
+    cancelled = threading.Event()
+
+    def stop_halfway(sent, total, resumed):
+        if sent >= total // 2:
+            cancelled.set()
+
+    client = UploadClient(url, state, part_size=args.part_mb * 2**20, concurrency=4)
+    try:
+        client.upload(path, stop_halfway, cancelled)
+        raise AssertionError("upload lẽ ra bị hủy")
+    except UploadCancelled:
+        pass
+    first = server.received_bytes
+    # Client mới (như mở lại app): chỉ gửi các phần server chưa có
+    client = UploadClient(url, state, part_size=args.part_mb * 2**20, concurrency=4)
+    location = client.upload(path)
+    check_location(server, location, path)
+    resent = server.received_bytes - first
+    assert first + resent == size, (first, resent, size)
+    print(f"\nHủy ở {first / size:.0%}, upload tiếp gửi {resent / 1e6:.0f} MB còn lại; file trên server khớp")
+    server.shutdown()
+
+
+def check_retries(path, args, work):
+    server, url = start_server(os.path.join(work, "server-flaky"), fail_rate=args.fail_rate)
+    client = UploadClient(url, os.path.join(work, "state-flaky"), part_size=args.part_mb * 2**20, concurrency=4)
+    location = client.upload(path)
+    check_location(server, location, path)
+    print(f"Server lỗi {args.fail_rate:.0%} request: upload vẫn hoàn tất, file khớp")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=256)
+    parser.add_argument("--part-mb", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="bench-upload-")
+    try:
+        check_many_parts(work)
+        path = os.path.join(work, "payload.bin")
+        with open(path, "wb") as f:
+            block = os.urandom(2**20)
+            for i in range(args.mb):
+                f.write(block[i % 256:] + block[:i % 256])  # mỗi MB khác nhau
+        bench_concurrency(path, args, work)
+        check_resume(path, args, work)
+        check_retries(path, args, work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,116 @@
+"""Benchmark mở app lần sau từ cache trên đĩa: thời gian tới khi trang đầu WellLog hiện ra.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_warm_start [--rows 1000000] [--runs 3] [--rebuild]
+
+Lần đầu dữ liệu giả lập được load như từ nguồn và ghi vào cache trong --dir
+(mặc định thư mục tạm); mỗi lần đo là một process mới (Qt offscreen) mở app,
+chọn WellLog và bấm Filter, không load lại từ nguồn.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import WELL_LOG_COLUMNS, iter_well_log_rows
+from gui.loaders.base import FunctionLoader
+
+
+class SyntheticWellLogLoader(FunctionLoader):
+    def __init__(self, rows, **kwargs):
+        super().__init__(lambda: iter_well_log_rows(rows), **kwargs)
+        self.rows = rows
+
+    def source_version(self):
+        return f"benchmarks.synthetic.well_log:{self.rows}"
+
+
+def build_cache(directory, rows):
+    from gui.column_store import ColumnStore
+    from gui.dataset_cache import DatasetCache
+    from gui.schema import build_schema
+    from gui.search_index import SearchIndex
+
+    cache = DatasetCache(directory)
+    cache.discard("WellLog")
+    store = ColumnStore(build_schema(WELL_LOG_COLUMNS))
+    index = SearchIndex()
+    loader = SyntheticWellLogLoader(rows)
+    start = time.perf_counter()
+    for batch in loader.iter_batches():
+        store.append_rows(batch)
+        index.add_rows(batch)
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cache.save("WellLog", loader.source_version(), store, index)
+    save_time = time.perf_counter() - start
+    print(f"load từ nguồn (cold)   {load_time:8.2f}s")
+    print(f"ghi cache              {save_time:8.2f}s  {cache.size() / 2**20:.0f} MiB")
+
+
+def warm_start(directory, rows):
+    """Chạy trong process con: mở app từ cache, trả về các mốc thời gian (ms)"""
+    started = time.perf_counter()
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["OSDU_CACHE_DIR"] = directory
+    from PyQt5.QtCore import QThreadPool
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    import main
+
+    app = QApplication(sys.argv[:1])
+    main.create_loader = lambda data_type, columns: SyntheticWellLogLoader(rows)
+    QMessageBox.warning = staticmethod(lambda *args: None)
+    window = main.OSDUApp()
+    window.show()
+    app.processEvents()
+    ready = time.perf_counter()
+
+    window.data_type_selector.setCurrentText("WellLog")
+    window.apply_filter()
+    window.table.viewport().repaint()
+    app.processEvents()
+    first_page = time.perf_counter()
+    assert window.load_worker is None, "dữ liệu bị load lại từ nguồn"
+    assert len(window.filtered_data) == rows and window.table_model.rowCount() == window.rows_per_page
+
+    window.search_input.setText("ht-12")
+    window.apply_filter()
+    searched = time.perf_counter()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert "WellLog" in window.cached_datasets, "cache bị coi là cũ"
+    return {
+        "startup": (ready - started) * 1000,
+        "first_page": (first_page - ready) * 1000,
+        "first_search": (searched - first_page) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "osdu-warm-start"))
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(warm_start(args.dir, args.rows)))
+        sys.exit()
+
+    print(f"WellLog, {args.rows:,} rows, cache tại {args.dir}")
+    from gui.dataset_cache import DatasetCache
+    from gui.schema import build_schema
+    cached = DatasetCache(args.dir).open("WellLog", build_schema(WELL_LOG_COLUMNS))
+    if args.rebuild or cached is None or cached.source_version != SyntheticWellLogLoader(args.rows).source_version():
+        del cached
+        build_cache(args.dir, args.rows)
+    print(f"  {'lần':<6}{'khởi động app (ms)':>20}{'trang đầu (ms)':>16}{'tìm kiếm đầu (ms)':>19}")
+    for run in range(1, args.runs + 1):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_warm_start", "--child",
+                                 "--dir", args.dir, "--rows", str(args.rows)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {run:<6}{result['startup']:>20.0f}{result['first_page']:>16.1f}{result['first_search']:>19.0f}")
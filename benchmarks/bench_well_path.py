@@ -0,0 +1,89 @@
+"""Benchmark tính quỹ đạo giếng (gui.well_path) và đổi MD -> TVD cho Marker.
+
+Chạy từ thư mục gốc: python -m benchmarks.bench_well_path [--wells 2000] [--stations 5000] [--markers 1000000]
+
+Quỹ đạo giả lập: mỗi giếng khoan thẳng rồi xiên dần với góc phương vị ngẫu
+nhiên, các trạm theo thứ tự giếng/MD như file survey (--shuffle để xáo
+trộn). Trước khi đo, kết quả trên vài giếng được so với cách tính từng trạm
+bằng vòng lặp Python (công thức minimum curvature chuẩn).
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from gui.well_path import COURSE_LENGTH, minimum_curvature
+
+
+def synthetic_survey(wells, stations, seed=0, shuffle=False):
+    """(md, inclination, azimuth, mã giếng) của các giếng, theo thứ tự giếng/MD (shuffle: xáo trộn các dòng)"""
+    rng = np.random.default_rng(seed)
+    md = np.tile(np.arange(1, stations + 1) * 10.0, wells)
+    kickoff = rng.uniform(200, 1500, wells).repeat(stations)
+    build = rng.uniform(0.5, 3.0, wells).repeat(stations) / 30
+    inclination = np.clip((md - kickoff) * build, 0, 90) + rng.normal(0, 0.1, len(md)).clip(0)
+    azimuth = (rng.uniform(0, 360, wells).repeat(stations) + rng.normal(0, 1, len(md))) % 360
+    codes = np.arange(wells).repeat(stations)
+    order = rng.permutation(len(md)) if shuffle else np.arange(len(md))
+    return md[order], inclination[order], azimuth[order], codes[order]
+
+
+def reference(md, inclination, azimuth):
+    """Minimum curvature từng trạm cho một giếng (các trạm đã xếp theo MD)"""
+    tvd = north = east = 0.0
+    previous = (0.0, 0.0, 0.0)
+    result = []
+    for depth, inc, azi in zip(md, np.radians(inclination), np.radians(azimuth)):
+        depth0, inc0, azi0 = previous
+        dogleg = math.acos(min(1.0, math.cos(inc - inc0) - math.sin(inc0) * math.sin(inc)
+                               * (1 - math.cos(azi - azi0))))
+        ratio = 2 / dogleg * math.tan(dogleg / 2) if dogleg > 1e-9 else 1.0
+        course = depth - depth0
+        tvd += course / 2 * (math.cos(inc0) + math.cos(inc)) * ratio
+        north += course / 2 * (math.sin(inc0) * math.cos(azi0) + math.sin(inc) * math.cos(azi)) * ratio
+        east += course / 2 * (math.sin(inc0) * math.sin(azi0) + math.sin(inc) * math.sin(azi)) * ratio
+        dls = math.degrees(dogleg) * COURSE_LENGTH / course if course > 0 else 0.0
+        result.append((tvd, north, east, dls))
+        previous = (depth, inc, azi)
+    return np.array(result)
+
+
+def check(stations):
+    md, inclination, azimuth, codes = synthetic_survey(5, stations, seed=1, shuffle=True)
+    columns, survey = minimum_curvature(md, inclination, azimuth, codes)
+    computed = np.column_stack(columns)
+    for well in range(5):
+        rows = np.flatnonzero(codes == well)
+        rows = rows[np.argsort(md[rows])]
+        expected = reference(md[rows], inclination[rows], azimuth[rows])
+        np.testing.assert_allclose(computed[rows], expected, rtol=1e-7, atol=1e-6)
+        # TVD tại đúng MD của trạm phải bằng TVD của trạm
+        np.testing.assert_allclose(survey.tvd_at(np.full(len(rows), well), md[rows]), expected[:, 0], atol=1e-6)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wells", type=int, default=2000)
+    parser.add_argument("--stations", type=int, default=5000)
+    parser.add_argument("--markers", type=int, default=1_000_000)
+    parser.add_argument("--shuffle", action="store_true", help="xáo trộn thứ tự các trạm")
+    args = parser.parse_args()
+
+    check(min(args.stations, 2000))
+    print("Kết quả khớp cách tính từng trạm")
+    md, inclination, azimuth, codes = synthetic_survey(args.wells, args.stations, shuffle=args.shuffle)
+    start = time.perf_counter()
+    columns, survey = minimum_curvature(md, inclination, azimuth, codes)
+    trajectory_time = time.perf_counter() - start
+    print(f"{args.wells:,} giếng x {args.stations:,} trạm ({len(md):,} dòng): "
+          f"minimum curvature {trajectory_time:.2f}s ({len(md) / trajectory_time / 1e6:.1f} triệu trạm/s)")
+
+    rng = np.random.default_rng(2)
+    marker_wells = rng.integers(-1, args.wells, args.markers)  # -1: giếng không có quỹ đạo
+    marker_md = rng.uniform(-10, args.stations * 10 + 500, args.markers)
+    start = time.perf_counter()
+    tvd = survey.tvd_at(marker_wells, marker_md)
+    marker_time = time.perf_counter() - start
+    print(f"{args.markers:,} marker: MD -> TVD {marker_time * 1000:.0f} ms, "
+          f"{np.count_nonzero(np.isnan(tvd)):,} không có quỹ đạo")
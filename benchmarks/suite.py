@@ -0,0 +1,257 @@
+"""Bộ benchmark headless cho các thao tác chính của tab Query (Qt offscreen).
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.suite [--scales 10000 100000] [--types WellLog Marker ...] [--repeat 5]
+                               [--output kết_quả.json] [--compare baseline.json] [--threshold 1.25]
+
+Mỗi (loại dữ liệu, số dòng) chạy trong một process con mở OSDUApp thật với
+dữ liệu giả lập (benchmarks.synthetic.iter_rows) và đo: load (_load_data_to_memory
+qua apply_filter tới khi load xong), apply_filter với keyword / biểu thức /
+cả hai, lật trang (_update_table + vẽ lại bảng), ẩn/hiện cột, xuất CSV và
+Parquet qua DataExportDialog, và bộ nhớ đỉnh (RSS) của process.
+
+Kết quả ghi ra JSON (mặc định benchmarks/results/<thời gian>-<commit>.json):
+mỗi phép đo có đơn vị, các lần đo, median và min. --compare so median với
+một file kết quả trước và trả về mã lỗi 1 nếu có phép đo chậm hơn --threshold
+lần (bỏ qua chênh lệch nhỏ hơn --min-delta). Biến môi trường OSDU_STORAGE
+được truyền cho process con nên có thể đo cả engine SQLite.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DATA_TYPES = ["WellLog", "Marker", "WellPath", "Seismic 2D", "Seismic 3D", "Seismic Location", "Document"]
+
+# Loại dữ liệu -> (keyword, biểu thức lọc) dùng cho phép đo apply_filter
+FILTERS = {
+    "WellLog": ("ht-12", "Log Class = Petrophysics and Start Depth between 1000 and 2000"),
+    "Marker": ("top", "Depth > 2500 and Confidence Level = High"),
+    "WellPath": ("well 1", "Inclination between 10 and 20"),
+    "Seismic 2D": ("line 1", "Processing Status = Completed and Shot Points > 500"),
+    "Seismic 3D": ("vol_00", "Inline Count > 300 and Processing Status != Failed"),
+    "Seismic Location": ("sp1", "radius(10.5, 106.8, 50)"),
+    "Document": ("report", "Date >= 2020-01-01"),
+}
+PAGE_FLIPS = 20
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def run_child(data_type, rows, repeat, workdir):
+    """Chạy trong process con: mở app, đo các thao tác, trả về dict tên phép đo -> (đơn vị, các lần đo)"""
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["OSDU_CACHE_MAX_MB"] = "0"  # đo load từ nguồn, không từ cache trên đĩa
+    os.environ.setdefault("OSDU_SQLITE_PATH", os.path.join(workdir, "catalog.sqlite3"))
+    from PyQt5.QtCore import QThreadPool
+    from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
+    import main
+    import gui.dialogs.column_selector_dialog as column_selector_dialog
+    from benchmarks.synthetic import iter_rows
+    import gui.loaders.registry as registry
+
+    app = QApplication(sys.argv[:1])
+    registry.BUILTIN_LOADERS[data_type] = lambda: iter_rows(data_type, rows)
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: None))
+    window = main.OSDUApp()
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+    results = {}
+
+    def record(name, unit, sample):
+        results.setdefault(name, (unit, []))[1].append(sample)
+
+    def settle():
+        while window.load_worker is not None:
+            app.processEvents()
+            time.sleep(0.001)
+        QThreadPool.globalInstance().waitForDone()
+        app.processEvents()
+
+    def repaint():
+        window.table.viewport().repaint()
+        app.processEvents()
+
+    def timed(action):
+        start = time.perf_counter()
+        action()
+        repaint()
+        return (time.perf_counter() - start) * 1000
+
+    window.data_type_selector.setCurrentText(data_type)
+
+    # Load: apply_filter trên loại dữ liệu chưa load gọi _load_data_to_memory
+    for _ in range(min(repeat, 3)):
+        window.original_data.pop(data_type, None)
+        window.search_indexes.pop(data_type, None)
+        window.last_filter = None
+        start = time.perf_counter()
+        window.apply_filter()
+        settle()
+        repaint()
+        record("load", "s", time.perf_counter() - start)
+    assert len(window.original_data[data_type]) == rows
+
+    keyword, query = FILTERS[data_type]
+    for name, text, expression in [("filter keyword", keyword, ""), ("filter query", "", query),
+                                   ("filter keyword+query", keyword, query), ("filter none", "", "")]:
+        window.search_input.setText(text)
+        window.query_input.setText(expression)
+        for _ in range(repeat):
+            window.last_filter = None  # không dùng nhánh thu hẹp kết quả trước
+            record(name, "ms", timed(window.apply_filter))
+
+    # Lật trang trên toàn bộ dữ liệu
+    window.set_paginate(True)
+    for _ in range(min(PAGE_FLIPS, max(0, len(window.filtered_data) // window.rows_per_page - 1))):
+        record("page flip", "ms", timed(window.next_page))
+    record("first page", "ms", timed(lambda: window.set_paginate(True)))
+
+    # Ẩn/hiện cột qua open_column_selector (hộp thoại được thay bằng lựa chọn cố định)
+    columns = window.columns_by_type[data_type]
+
+    class ToggleDialog:
+        def __init__(self, parent, column_names, visible):
+            self.selected_columns = {col: not shown if i % 2 else shown
+                                     for i, (col, shown) in enumerate(visible.items())}
+
+        def exec_(self):
+            return True
+
+    column_selector_dialog.ColumnSelectorDialog = ToggleDialog
+    for _ in range(repeat):
+        record("column toggle", "ms", timed(window.open_column_selector))
+    window.visible_columns[data_type] = {col: True for col in columns}
+    window._save_column_visibility(data_type)
+    window._apply_column_visibility()
+
+    # Xuất toàn bộ kết quả qua DataExportDialog (worker nền)
+    for fmt, suffix in [("CSV Files (*.csv)", ".csv"), ("Parquet Files (*.parquet)", ".parquet")]:
+        path = os.path.join(workdir, "export" + suffix)
+        QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (path, fmt))
+        for _ in range(min(repeat, 3)):
+            start = time.perf_counter()
+            window.export_data()
+            settle()
+            record(f"export {suffix[1:]}", "s", time.perf_counter() - start)
+        assert os.path.getsize(path) > 0
+
+    record("peak memory", "MiB", peak_rss_mib())
+    return results
+
+
+def peak_rss_mib():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(unit, samples):
+    samples = [sample for sample in samples if sample is not None]
+    if not samples:
+        return None
+    return {"unit": unit, "samples": samples, "median": statistics.median(samples), "min": min(samples)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(scales, data_types, repeat):
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "storage": os.environ.get("OSDU_STORAGE", "memory") or "memory",
+            "repeat": repeat,
+        },
+        "results": {},
+    }
+    for rows in scales:
+        for data_type in data_types:
+            with tempfile.TemporaryDirectory(prefix="osdu-bench-") as workdir:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.suite", "--child", data_type, "--rows", str(rows),
+                     "--repeat", str(repeat), "--workdir", workdir],
+                    check=True, capture_output=True, text=True,
+                    env=dict(os.environ, XDG_CONFIG_HOME=workdir)).stdout
+            measured = json.loads(output.strip().splitlines()[-1])
+            for name, (unit, samples) in measured.items():
+                summary = summarize(unit, samples)
+                if summary is not None:
+                    report["results"][f"{data_type}/{rows}/{name}"] = summary
+            print_results(report["results"], f"{data_type}/{rows}/")
+    return report
+
+
+def print_results(results, prefix):
+    for key, value in results.items():
+        if key.startswith(prefix):
+            print(f"  {key:<52}{value['median']:>12.3f} {value['unit']:<4}(min {value['min']:.3f})")
+
+
+def compare(report, baseline, threshold, min_delta):
+    """In so sánh median với baseline, trả về danh sách các phép đo chậm đi"""
+    regressions = []
+    print(f"\nSo với {baseline['meta'].get('commit')} ({baseline['meta'].get('date')}):")
+    for key, value in report["results"].items():
+        old = baseline["results"].get(key)
+        if old is None or old["unit"] != value["unit"] or not old["median"]:
+            continue
+        ratio = value["median"] / old["median"]
+        delta = value["median"] - old["median"]
+        # min_delta tính theo ms cho thời gian, theo MiB cho bộ nhớ
+        significant = delta * (1000 if value["unit"] == "s" else 1) > min_delta
+        flag = "CHẬM HƠN" if ratio > threshold and significant else ""
+        if flag:
+            regressions.append(key)
+        print(f"  {key:<52}{old['median']:>10.3f} -> {value['median']:>10.3f} {value['unit']:<4}{ratio:>6.2f}x  {flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--types", nargs="+", default=DATA_TYPES, choices=DATA_TYPES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", help="file kết quả JSON để so sánh")
+    parser.add_argument("--threshold", type=float, default=1.25, help="tỉ lệ median mới/cũ coi là chậm đi")
+    parser.add_argument("--min-delta", type=float, default=2.0, help="bỏ qua chênh lệch nhỏ hơn (ms hoặc MiB)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(run_child(args.child, args.rows, args.repeat, args.workdir)))
+        sys.exit()
+
+    report = run_suite(args.scales, args.types, args.repeat)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
+    print(f"\nĐã ghi kết quả: {output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_delta)
+        if regressions:
+            print(f"\n{len(regressions)} phép đo chậm hơn baseline quá {args.threshold}x")
+            sys.exit(1)
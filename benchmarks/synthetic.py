@@ -0,0 +1,108 @@
+"""Sinh dữ liệu giả lập theo schema của DataLoader để benchmark"""
+import random
+
+import numpy as np
+
+LOG_TYPES = ["Raw", "Interpreted"]
+SERVICES = ["Schlumberger", "Halliburton", "Baker Hughes"]
+FLUID_TYPES = ["Oil Based", "Water Based"]
+LOG_CLASSES = ["Petrophysics", "Formation", "Mudlog"]
+LOGGING_MODES = ["LWD", "MWD", "Wireline"]
+MARKER_NAMES = ["Top Sand", "Base Sand", "Top Shale", "Top Carbonate", "Unconformity"]
+CONFIDENCE_LEVELS = ["High", "Medium", "Low"]
+MARKER_SOURCES = ["Geologist", "Geophysicist", "Petrophysicist"]
+PROCESSING_STATUSES = ["Completed", "Pending", "Processing", "Failed"]
+DOCUMENT_KINDS = ["Well Report", "Completion Report", "Drilling Log", "Core Analysis"]
+DOCUMENT_TYPES = ["PDF", "DOCX", "XLSX", "TXT"]
+WELL_LOG_COLUMNS = ["WellBore Name", "File Name", "Start Depth", "Stop Depth",
+                    "Log Run", "Log Type", "Date", "Logging Service", "Fluid Type",
+                    "Log Class", "Logging Mode"]  # các cột của dòng iter_well_log_rows
+
+
+def well_log_rows(count, seed=0):
+    """Sinh count dòng WellLog (khoảng 20 log cho mỗi giếng, tên file khác nhau)"""
+    return list(iter_well_log_rows(count, seed))
+
+
+def iter_well_log_rows(count, seed=0):
+    """Như well_log_rows nhưng sinh lần lượt từng dòng"""
+    rng = random.Random(seed)
+    for i in range(count):
+        start = rng.randint(0, 3000)
+        yield [
+            f"05-{i // 20 % 97}-HT-{i // 20}X",
+            f"{i}X-RWD.las",
+            str(start),
+            str(start + rng.randint(100, 2000)),
+            f"Run#{rng.randint(1, 5)}",
+            rng.choice(LOG_TYPES),
+            f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2000, 2024)}",
+            rng.choice(SERVICES),
+            rng.choice(FLUID_TYPES),
+            rng.choice(LOG_CLASSES),
+            rng.choice(LOGGING_MODES),
+        ]
+
+
+def iter_rows(data_type, count, seed=0):
+    """Sinh count dòng giả lập cho một loại dữ liệu theo schema của DataLoader"""
+    if data_type == "WellLog":
+        yield from iter_well_log_rows(count, seed)
+        return
+    rng = random.Random(seed)
+    for i in range(count):
+        well = f"Well {i // 50}"
+        if data_type == "Marker":
+            yield [well, rng.choice(MARKER_NAMES), str(rng.randint(0, 5000)),
+                   rng.choice(CONFIDENCE_LEVELS), rng.choice(MARKER_SOURCES)]
+        elif data_type == "WellPath":
+            yield [well, str(i % 50 * 100), f"{rng.uniform(0, 90):.1f}°", f"{rng.uniform(0, 360):.1f}°"]
+        elif data_type == "Seismic 2D":
+            yield [f"Survey {i // 1000}", f"Line {i}", str(rng.randint(100, 2000)), rng.choice(PROCESSING_STATUSES)]
+        elif data_type == "Seismic 3D":
+            yield [f"Survey {i // 1000}", f"Vol_{i:06d}", str(rng.randint(100, 1000)), str(rng.randint(100, 1000)),
+                   rng.choice(PROCESSING_STATUSES)]
+        elif data_type == "Seismic Location":
+            yield [f"SP{i}", f"{rng.uniform(5, 20):.5f}", f"{rng.uniform(100, 115):.5f}"]
+        elif data_type == "Document":
+            date = f"{rng.randint(2000, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            yield [f"{rng.choice(DOCUMENT_KINDS)} {i}", rng.choice(DOCUMENT_TYPES), date, f"Author {i % 200}"]
+        else:
+            raise ValueError(f"Không có dữ liệu giả lập cho {data_type}")
+
+
+LAS_HEADER = """~Version Information
+ VERS.                 2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.                  NO : ONE LINE PER DEPTH STEP
+~Well Information
+ STRT.M          {start:10.4f} : START DEPTH
+ STOP.M          {stop:10.4f} : STOP DEPTH
+ STEP.M              0.1524 : STEP
+ NULL.             -999.25 : NULL VALUE
+ WELL.     {well} : WELL
+ SRVC.     Schlumberger : SERVICE COMPANY
+ DATE.     22/12/2024 : LOG DATE
+~Parameter Information
+ RUN .     1 : RUN NUMBER
+~Curve Information
+{curves}~A  DEPTH
+"""
+
+
+def write_las(path, rows, curves=8, well="05-1-HT-1X", seed=0, block=100_000):
+    """Ghi file LAS 2.0 cột cố định gồm DEPT và curves - 1 đường cong ngẫu nhiên (lặp lại theo block dòng)"""
+    rng = np.random.default_rng(seed)
+    step = 0.1524
+    names = ["DEPT"] + [f"C{i:02d}" for i in range(1, curves)]
+    values = rng.uniform(-100, 3000, size=(min(rows, block), curves - 1))
+    values[rng.random(values.shape) < 0.01] = -999.25
+    line_format = "%10.4f" * (curves - 1) + "\n"
+    value_lines = [line_format % tuple(row) for row in values]
+    with open(path, "w", newline="\n") as f:
+        f.write(LAS_HEADER.format(
+            start=1000.0, stop=1000.0 + (rows - 1) * step, well=well,
+            curves="".join(f" {name}.{'M' if name == 'DEPT' else 'API'}  : {name}\n" for name in names),
+        ))
+        for start in range(0, rows, block):
+            depths = 1000.0 + np.arange(start, min(start + block, rows)) * step
+            f.write("".join(f"{depth:10.4f}" + line for depth, line in zip(depths, value_lines)))
\ No newline at end of file
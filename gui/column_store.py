@@ -0,0 +1,288 @@
+import sys
+import threading
+from array import array
+from .schema import TEXT, NUMBER, CATEGORY, ColumnSpec
+
+NAN = float("nan")
+
+
+class ColumnStore:
+    """Lưu dữ liệu của một loại dữ liệu theo cột thay vì list các dòng.
+
+    Cột số lưu trong array('d'), cột category lưu mã array('I') kèm bảng
+    giá trị, cột text lưu list chuỗi. Chỉ chuyển sang chuỗi khi hiển thị.
+    Store mở từ cache trên đĩa (from_buffers) dùng buffer map từ file và chỉ
+    chép sang array/list khi có dòng mới được thêm vào.
+    """
+
+    def __init__(self, schema):
+        self.schema = [spec if isinstance(spec, ColumnSpec) else ColumnSpec(spec, TEXT, "") for spec in schema]
+        self.columns = [spec.name for spec in self.schema]
+        self.lock = threading.RLock()  # append_rows có thể chạy trên thread load nền
+        self._index = {col: i for i, col in enumerate(self.columns)}
+        self._data = [self._new_column(spec) for spec in self.schema]
+        self._categories = [[] if spec.kind == CATEGORY else None for spec in self.schema]
+        self._category_codes = [{} if spec.kind == CATEGORY else None for spec in self.schema]
+        self._raw = [{} for _ in self.schema]  # giá trị không đọc được thành số: id dòng -> chuỗi gốc
+        self._row_count = 0
+        self.cache = {}  # cấu trúc dẫn xuất (chỉ mục sắp xếp...), xóa khi thêm dòng
+
+    @classmethod
+    def from_buffers(cls, schema, row_count, data, categories, raw):
+        """Store chỉ đọc trên các buffer có sẵn (dạng snapshot trả về)"""
+        store = cls(schema)
+        store._data = list(data)
+        store._categories = [list(values) if values is not None else None for values in categories]
+        store._category_codes = [None for _ in categories]  # dựng lại khi cần thêm dòng
+        store._raw = [dict(values) for values in raw]
+        store._row_count = row_count
+        return store
+
+    @staticmethod
+    def _new_column(spec):
+        if spec.kind == NUMBER:
+            return array('d')
+        if spec.kind == CATEGORY:
+            return array('I')
+        return []
+
+    def __len__(self):
+        return self._row_count
+
+    def column_index(self, name):
+        """Trả về vị trí của cột theo tên"""
+        return self._index[name]
+
+    def append_rows(self, rows):
+        """Thêm các dòng mới, trả về range id của các dòng vừa thêm"""
+        with self.lock:
+            start = self._row_count
+            self.cache.clear()
+            self._materialize()
+            for col_idx, spec in enumerate(self.schema):
+                values = [row[col_idx] for row in rows]
+                if spec.kind == NUMBER:
+                    self._append_numbers(col_idx, values, start)
+                elif spec.kind == CATEGORY:
+                    self._append_categories(col_idx, values)
+                else:
+                    self._data[col_idx].extend(str(value) for value in values)
+            # Cập nhật số dòng sau cùng để thread đọc chỉ thấy các dòng đã ghi đủ cột
+            self._row_count = start + len(rows)
+            return range(start, self._row_count)
+
+    def append_batch(self, batch):
+        """Như append_rows với một ColumnBatch (gui.parse_pool): mỗi giá trị khác nhau chỉ được đọc một lần"""
+        with self.lock:
+            start = self._row_count
+            self.cache.clear()
+            self._materialize()
+            for col_idx, spec in enumerate(self.schema):
+                values = batch.columns[col_idx][1]
+                if spec.kind == NUMBER:
+                    numbers, unreadable = array('d'), {}  # mã giá trị -> chuỗi không đọc được
+                    _parse_numbers(numbers, spec.unit, values, 0, unreadable)
+                    self._data[col_idx].frombytes(batch.take(col_idx, numbers, 'float64'))
+                    if unreadable:
+                        codes = batch.columns[col_idx][0]
+                        for row in batch.where(col_idx, list(unreadable)):
+                            self._raw[col_idx][start + row] = unreadable[int(codes[row])]
+                elif spec.kind == CATEGORY:
+                    codes = array('I')
+                    self._append_categories_to(codes, col_idx, values)
+                    self._data[col_idx].frombytes(batch.take(col_idx, codes, 'uint32'))
+                else:
+                    self._data[col_idx].extend(batch.cells(col_idx))
+            self._row_count = start + len(batch)
+            return range(start, self._row_count)
+
+    def _materialize(self):
+        """Chép các cột số/category đang map từ file cache sang array để thêm dòng được"""
+        for col, spec in enumerate(self.schema):
+            column = self._data[col]
+            if spec.kind != TEXT and not isinstance(column, array):
+                copy = array('d' if spec.kind == NUMBER else 'I')
+                copy.frombytes(memoryview(column).cast('B'))
+                self._data[col] = copy
+            if spec.kind == CATEGORY and self._category_codes[col] is None:
+                self._category_codes[col] = {value: code for code, value in enumerate(self._categories[col])}
+
+    def snapshot(self, rows=None):
+        """(buffer từng cột, bảng category, giá trị gốc không đọc được) của rows dòng đầu.
+
+        Cột số/category trả về bytes, cột text trả về list chuỗi; dùng để ghi cache.
+        """
+        with self.lock:
+            rows = self._row_count if rows is None else rows
+            data = []
+            for col, spec in enumerate(self.schema):
+                column = self._data[col]
+                data.append(column[:rows] if spec.kind == TEXT else memoryview(column)[:rows].tobytes())
+            categories = [list(values) if values is not None else None for values in self._categories]
+            raw = [{row: text for row, text in values.items() if row < rows} for values in self._raw]
+            return data, categories, raw
+
+    def _append_numbers(self, col, values, start):
+        _parse_numbers(self._data[col], self.schema[col].unit, values, start, self._raw[col])
+
+    def _append_categories(self, col, values):
+        self._append_categories_to(self._data[col], col, values)
+
+    def _append_categories_to(self, column, col, values):
+        codes = self._category_codes[col]
+        categories = self._categories[col]
+        for value in values:
+            value = str(value)
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(categories)
+                categories.append(value)
+            column.append(code)
+
+    def values(self, col):
+        """Buffer dữ liệu của cột (array('d') cho cột số, mã array('I') cho category, list cho text)"""
+        return self._data[col]
+
+    def categories(self, col):
+        """Bảng giá trị của cột category (mã -> chuỗi)"""
+        return self._categories[col]
+
+    def value(self, row, col):
+        """Giá trị có kiểu của một ô (float cho cột số, chuỗi cho cột khác)"""
+        kind = self.schema[col].kind
+        if kind == CATEGORY:
+            return self._categories[col][self._data[col][row]]
+        return self._data[col][row]
+
+    def set_number_column(self, col, values):
+        """Thay toàn bộ giá trị của cột số (cột tính toán như TVD); values: mảng float, NaN = trống"""
+        with self.lock:
+            column = array('d')
+            column.frombytes(memoryview(values.astype('float64')).cast('B'))
+            if len(column) != self._row_count:
+                raise ValueError(f"{self.columns[col]}: cần {self._row_count} giá trị, nhận {len(column)}")
+            self._data[col] = column
+            self._raw[col] = {}
+            self.cache.clear()
+
+    def sort_values(self, col):
+        """Dữ liệu để sắp xếp theo cột: (buffer số, None) với cột số (NaN = trống),
+        (mã từng dòng, bảng giá trị) với cột category và text"""
+        with self.lock:
+            spec = self.schema[col]
+            if spec.kind == NUMBER:
+                return self._data[col], None
+            if spec.kind == CATEGORY:
+                return self._data[col], self._categories[col]
+            codes = {}
+            column = array('I', (codes.setdefault(value, len(codes)) for value in self._data[col]))
+            return column, list(codes)
+
+    def display(self, row, col):
+        """Giá trị hiển thị (chuỗi) của một ô"""
+        spec = self.schema[col]
+        if spec.kind == NUMBER:
+            number = self._data[col][row]
+            if number != number:
+                return self._raw[col].get(row, "")
+            return format_number(number) + spec.unit
+        if spec.kind == CATEGORY:
+            return self._categories[col][self._data[col][row]]
+        return self._data[col][row]
+
+    def display_column(self, col, row_ids):
+        """Giá trị hiển thị của một cột cho nhiều dòng (nhanh hơn gọi display từng ô)"""
+        spec = self.schema[col]
+        data = self._data[col]
+        if spec.kind == CATEGORY:
+            categories = self._categories[col]
+            return [categories[data[row]] for row in row_ids]
+        if spec.kind == TEXT:
+            return [data[row] for row in row_ids]
+        raw = self._raw[col]
+        unit = spec.unit
+        return [raw.get(row, "") if data[row] != data[row] else format_number(data[row]) + unit
+                for row in row_ids]
+
+    def row(self, row):
+        """Toàn bộ giá trị hiển thị của một dòng"""
+        return [self.display(row, col) for col in range(len(self.columns))]
+
+    def nbytes(self):
+        """Ước lượng bộ nhớ của store (buffer cột + chuỗi được giữ)"""
+        total = sys.getsizeof(self)
+        for col, spec in enumerate(self.schema):
+            column = self._data[col]
+            if isinstance(column, MappedStrings):
+                total += column.nbytes
+            elif spec.kind == TEXT:
+                total += sys.getsizeof(column) + sum(sys.getsizeof(value) for value in column)
+            else:
+                total += memoryview(column).nbytes
+            if spec.kind == CATEGORY:
+                total += sys.getsizeof(self._category_codes[col]) + sys.getsizeof(self._categories[col])
+                total += sum(sys.getsizeof(value) for value in self._categories[col])
+            total += sum(sys.getsizeof(value) for value in self._raw[col].values())
+        return total
+
+
+class MappedStrings:
+    """Cột text trên buffer utf-8 (file cache map vào bộ nhớ), giải mã từng ô khi đọc.
+
+    Các dòng thêm sau (extend) được giữ trong list riêng, phần đã map không bị chép lại.
+    """
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets  # int64, len = số dòng đã map + 1
+        self._blob = blob
+        self._mapped = len(offsets) - 1
+        self._extra = []
+
+    def __len__(self):
+        return self._mapped + len(self._extra)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if row >= self._mapped:
+            return self._extra[row - self._mapped]
+        return str(self._blob[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def extend(self, values):
+        self._extra.extend(values)
+
+    @property
+    def nbytes(self):
+        return (memoryview(self._offsets).nbytes + len(self._blob)
+                + sys.getsizeof(self._extra) + sum(sys.getsizeof(value) for value in self._extra))
+
+
+def _parse_numbers(column, unit, values, start, raw):
+    """Đọc values thành số vào column; giá trị không đọc được là NaN, chuỗi gốc vào raw[start + i]"""
+    for row_id, value in enumerate(values, start):
+        text = str(value).strip()
+        try:
+            column.append(float(text[:-len(unit)] if unit and text.endswith(unit) else text))
+        except ValueError:
+            column.append(NAN)
+            if text:
+                raw[row_id] = text
+
+
+def format_number(number):
+    """Số nguyên hiển thị không có phần thập phân, số thực dùng dạng ngắn nhất"""
+    if number.is_integer() and abs(number) < 1e15:
+        return str(int(number))
+    return repr(number)
+
+
+def row_id_array(ids):
+    """Chuyển mảng NumPy id dòng sang array('q') (kiểu của filtered_data)"""
+    result = array('q')
+    result.frombytes(ids.astype('int64').tobytes())
+    return result
@@ -0,0 +1,270 @@
+"""Kho đường cong (dữ liệu ~A của file LAS) theo độ sâu, đọc bằng memory-map.
+
+Mỗi file log (khóa WellBore Name + File Name như dòng WellLog) là một thư
+mục gồm depth.f8 (độ sâu tăng dần), curve<i>.f8 cho từng đường cong và các
+tầng tóm tắt (pyramid): tầng L gộp mỗi FACTOR^L mẫu liên tiếp thành một cặp
+(min, max) (curve<i>.L<L>.f8) kèm độ sâu đầu khối (depth.L<L>.f8). Các mẫu
+được ghi và tóm tắt theo từng chunk CHUNK_ROWS dòng.
+
+Khi đọc một khoảng độ sâu, vị trí mẫu được tìm bằng searchsorted trên
+depth.f8 đã map, rồi chọn tầng thấp nhất mà số khối trong khoảng không quá
+max_points: vẽ log 5000 m ở độ phân giải màn hình chỉ đọc vài nghìn giá trị
+thay vì hàng triệu mẫu, các đỉnh/đáy vẫn được giữ nhờ min/max.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .instrumentation import instruments
+
+STORE_FORMAT = 1
+META_FILE = "meta.json"
+FACTOR = 4  # số mẫu (hoặc khối tầng dưới) gộp thành một khối của tầng trên
+CHUNK_ROWS = FACTOR ** 8  # 65536 dòng mỗi lần ghi/tóm tắt (bội số của FACTOR)
+MIN_LEVEL_BLOCKS = 1024  # dừng dựng tầng khi số khối không quá mức này
+DEFAULT_POINTS = 2000
+
+# Kết quả đọc: level 0 là mẫu gốc (low == high), level L là khối FACTOR^L mẫu (depth = đầu khối)
+CurveWindow = namedtuple("CurveWindow", "depth low high level")
+
+
+class CurveStore:
+    """Thư mục chứa các bộ đường cong, mỗi bộ ứng với một file log"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self._opened = {}  # thư mục -> CurveSet đã map
+
+    def path(self, wellbore, file_name):
+        key = hashlib.sha1(f"{wellbore}\n{file_name}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, key)
+
+    def has(self, wellbore, file_name):
+        return os.path.isfile(os.path.join(self.path(wellbore, file_name), META_FILE))
+
+    def open(self, wellbore, file_name):
+        """CurveSet của file log, None nếu chưa có đường cong"""
+        path = self.path(wellbore, file_name)
+        meta = _read_meta(path)
+        if meta is None:
+            return None
+        with self.lock:
+            curve_set = self._opened.get(path)
+            if curve_set is None or curve_set.created != meta["created"]:
+                curve_set = self._opened[path] = CurveSet(path, meta)
+            return curve_set
+
+    def write_las(self, path):
+        """Ghi các đường cong của file LAS (bỏ qua nếu file chưa đổi từ lần ghi trước), trả về thư mục"""
+        from .loaders.las_reader import LasFile
+        stat = os.stat(path)
+        source = {"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        las = LasFile(path)
+        wellbore, file_name = las.value("WELL"), os.path.basename(path)
+        target = self.path(wellbore, file_name)
+        meta = _read_meta(target)
+        if meta is not None and meta.get("source") == source:
+            return target
+        data = las.data()
+        if not las.curves or not len(data):
+            raise ValueError("File LAS không có dữ liệu đường cong (~A)")
+        index, curves = las.curves[0], las.curves[1:]
+        return self.write(wellbore, file_name, data[:, 0], data[:, 1:],
+                          [{"mnemonic": c.mnemonic, "unit": c.unit, "description": c.description} for c in curves],
+                          index={"mnemonic": index.mnemonic, "unit": index.unit}, source=source)
+
+    def write(self, wellbore, file_name, depth, values, curves, index=None, source=None):
+        """Ghi một bộ đường cong: depth (n,), values (n, số đường cong), curves: metadata từng đường cong.
+
+        Dòng không có độ sâu bị bỏ; các dòng được xếp theo độ sâu tăng dần (log đo từ dưới lên).
+        """
+        depth = np.asarray(depth, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(depth), len(curves))
+        keep = ~np.isnan(depth)
+        if not keep.all():
+            depth, values = depth[keep], values[keep]
+        if len(depth) > 1 and not (np.diff(depth) >= 0).all():
+            order = np.arange(len(depth) - 1, -1, -1) if (np.diff(depth) <= 0).all() \
+                else np.argsort(depth, kind="stable")
+            depth, values = depth[order], values[order]
+        if not len(depth):
+            raise ValueError("Không có mẫu nào có độ sâu")
+
+        target = self.path(wellbore, file_name)
+        tmp = f"{target}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            with instruments.stage("curves.write"):
+                levels = _write_levels(tmp, depth, values)
+            meta = {
+                "format": STORE_FORMAT,
+                "wellbore": wellbore,
+                "file_name": file_name,
+                "index": index or {"mnemonic": "DEPT", "unit": ""},
+                "curves": curves,
+                "rows": len(depth),
+                "top": float(depth[0]),
+                "bottom": float(depth[-1]),
+                "factor": FACTOR,
+                "levels": levels,
+                "source": source,
+                "created": time.time(),
+            }
+            # meta.json ghi sau cùng: thư mục chỉ hợp lệ khi đã ghi đủ file
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            with self.lock:
+                self._opened.pop(target, None)
+                shutil.rmtree(target, ignore_errors=True)
+                os.replace(tmp, target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        instruments.count("curve samples written", values.size)
+        return target
+
+
+class CurveSet:
+    """Các đường cong của một file log (file được map khi đọc lần đầu)"""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.wellbore = meta["wellbore"]
+        self.file_name = meta["file_name"]
+        self.rows = meta["rows"]
+        self.top = meta["top"]
+        self.bottom = meta["bottom"]
+        self.factor = meta["factor"]
+        self.levels = meta["levels"]  # số khối của tầng 1, 2...
+        self.created = meta["created"]
+        self.curve_names = [curve["mnemonic"] for curve in meta["curves"]]
+        self._arrays = {}
+
+    def unit(self, curve):
+        return self.meta["curves"][self.curve_names.index(curve)]["unit"]
+
+    def window(self, curve, top=None, bottom=None, max_points=DEFAULT_POINTS):
+        """Các mẫu của đường cong trong khoảng độ sâu [top, bottom], tối đa khoảng max_points điểm.
+
+        Quá nhiều mẫu thì trả về (min, max) của các khối ở tầng đủ thưa; khối ở hai đầu có thể
+        lấn ra ngoài khoảng một phần khối.
+        """
+        column = self.curve_names.index(curve)
+        with instruments.stage("curves.window"):
+            depth = self._array("depth.f8")
+            start = 0 if top is None else int(np.searchsorted(depth, top, side="left"))
+            stop = self.rows if bottom is None else int(np.searchsorted(depth, bottom, side="right"))
+            stop = max(start, stop)
+            max_points = max(int(max_points), 1)
+            level, size = 0, 1
+            while (stop - start + size - 1) // size > max_points and level < len(self.levels):
+                level += 1
+                size *= self.factor
+            if level == 0:
+                samples = np.array(self._array(f"curve{column}.f8")[start:stop])
+                result = CurveWindow(np.array(depth[start:stop]), samples, samples, 0)
+            else:
+                first, last = start // size, -(-stop // size)
+                pairs = np.array(self._array(f"curve{column}.L{level}.f8", 2)[first:last])
+                result = CurveWindow(np.array(self._array(f"depth.L{level}.f8")[first:last]),
+                                     pairs[:, 0], pairs[:, 1], level)
+        instruments.count("curve samples read", len(result.depth))
+        return result
+
+    def _array(self, name, width=1):
+        array = self._arrays.get(name)
+        if array is None:
+            array = np.memmap(os.path.join(self.path, name), dtype=np.float64, mode="r")
+            if width > 1:
+                array = array.reshape(-1, width)
+            self._arrays[name] = array
+        return array
+
+
+def _write_levels(directory, depth, values):
+    """Ghi depth, các đường cong và các tầng min/max; trả về số khối của từng tầng"""
+    ncurves = values.shape[1]
+    # Tầng 1 tính theo từng chunk từ mẫu gốc; các tầng trên (nhỏ hơn FACTOR lần mỗi tầng) tính từ tầng dưới
+    lows = [[] for _ in range(ncurves)]
+    highs = [[] for _ in range(ncurves)]
+    tops = []
+    with _Appender(directory) as append:
+        for start in range(0, len(depth), CHUNK_ROWS):
+            chunk = values[start:start + CHUNK_ROWS]
+            append("depth.f8", depth[start:start + CHUNK_ROWS])
+            tops.append(depth[start:start + CHUNK_ROWS:FACTOR])
+            for col in range(ncurves):
+                samples = np.ascontiguousarray(chunk[:, col])
+                append(f"curve{col}.f8", samples)
+                low, high = _reduce(samples, samples)
+                lows[col].append(low)
+                highs[col].append(high)
+
+    levels = []
+    tops = np.concatenate(tops)
+    lows = [np.concatenate(parts) for parts in lows]
+    highs = [np.concatenate(parts) for parts in highs]
+    count = len(depth)  # số phần tử của tầng dưới
+    while count > MIN_LEVEL_BLOCKS:
+        level = len(levels) + 1
+        if level > 1:
+            tops = tops[::FACTOR]
+            for col in range(ncurves):
+                lows[col], highs[col] = _reduce(lows[col], highs[col])
+        tops.tofile(os.path.join(directory, f"depth.L{level}.f8"))
+        for col in range(ncurves):
+            np.column_stack((lows[col], highs[col])).tofile(os.path.join(directory, f"curve{col}.L{level}.f8"))
+        levels.append(len(tops))
+        count = len(tops)
+    return levels
+
+
+def _reduce(low, high):
+    """(min, max) của từng nhóm FACTOR giá trị liên tiếp, bỏ qua NaN (nhóm toàn NaN thành NaN)"""
+    blocks = -(-len(low) // FACTOR)
+    padded = np.full((2, blocks * FACTOR), np.nan)
+    padded[0, :len(low)] = low
+    padded[1, :len(high)] = high
+    padded = padded.reshape(2, blocks, FACTOR)
+    return np.fmin.reduce(padded[0], axis=1), np.fmax.reduce(padded[1], axis=1)
+
+
+class _Appender:
+    """Ghi nối các mảng vào file trong thư mục (giữ file mở giữa các chunk)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        return False
+
+    def __call__(self, name, array):
+        f = self.files.get(name)
+        if f is None:
+            f = self.files[name] = open(os.path.join(self.directory, name), "wb")
+        f.write(memoryview(np.ascontiguousarray(array, dtype=np.float64)).cast("B"))
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == STORE_FORMAT else None
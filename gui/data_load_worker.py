@@ -0,0 +1,66 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from .instrumentation import instruments
+from .loaders.base import pad_rows
+
+
+class LoadSignals(QObject):
+    chunk_loaded = pyqtSignal(str, int, int)  # loại dữ liệu, id dòng đầu, id dòng cuối (không gồm)
+    progress = pyqtSignal(str, int, int)      # loại dữ liệu, số dòng đã load, tổng (-1 nếu chưa biết)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+
+
+class DataLoadWorker(QRunnable):
+    """Load dữ liệu trên thread nền, đưa từng batch của loader vào ColumnStore và SearchIndex"""
+
+    def __init__(self, data_type, loader, store, index):
+        super().__init__()
+        self.data_type = data_type
+        self.loader = loader
+        self.store = store
+        self.index = index
+        self.signals = LoadSignals()
+        self.source_version = None  # phiên bản nguồn lúc bắt đầu load (khóa cache trên đĩa)
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        with instruments.stage("load"):
+            self._run()
+
+    def _run(self):
+        try:
+            # Lấy phiên bản trước khi đọc: dữ liệu đổi trong lúc load sẽ làm cache bị coi là cũ
+            try:
+                self.source_version = self.loader.source_version()
+            except Exception:
+                self.source_version = None
+            batches = iter(self.loader.iter_batches())
+            while True:
+                with instruments.stage("load.read"):
+                    batch = next(batches, None)
+                if batch is None or self.is_cancelled():
+                    break
+                batch = pad_rows(batch, len(self.store.columns))
+                # Ghi store trước chỉ mục: mọi id trả về từ chỉ mục luôn có trong store
+                with instruments.stage("load.append"):
+                    rows = self.store.append_rows(batch)
+                if self.index is not None:  # None: store tự đánh chỉ mục (engine SQLite)
+                    with instruments.stage("load.index"):
+                        self.index.add_rows(batch)
+                instruments.count("rows loaded", len(batch))
+                if self.is_cancelled():
+                    return
+                self.signals.chunk_loaded.emit(self.data_type, rows.start, rows.stop)
+                self.signals.progress.emit(self.data_type, rows.stop, self.loader.estimated_total())
+            if not self.is_cancelled():
+                self.signals.finished.emit(self.data_type)
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.failed.emit(self.data_type, str(e))
@@ -15,51 +15,34 @@ class DataLoader:
         log_class = "Petrophysics/Formation/Mudlog"
         logging_mode = "LWD/MWD/Wireline"
         
-        data = [
-            [well_bore_name, file_name, start_depth, str(random.randint(0, 5000)), log_run, log_type, date, logging_service, fluid_type, log_class, logging_mode]
-            for _ in range(70)
-        ]
-
-        return data
+        for _ in range(70):
+            yield [well_bore_name, file_name, start_depth, str(random.randint(0, 5000)), log_run, log_type, date, logging_service, fluid_type, log_class, logging_mode]
 
     def load_marker_data():
-        data = [
-            ["Well A", "Top Sand", str(random.randint(0, 5000)), "High", "Geologist"]
-            for _ in range(70)
-        ]
-        return data
+        for _ in range(70):
+            yield ["Well A", "Top Sand", str(random.randint(0, 5000)), "High", "Geologist"]
 
     def load_well_path_data():
-        data = [
-            ["Well A", "1000", "5.2°", "180°"],
-            ["Well B", "1500", "3.1°", "190°"],
-        ] * 60
-        return data
+        for _ in range(60):
+            yield ["Well A", "1000", "5.2°", "180°"]
+            yield ["Well B", "1500", "3.1°", "190°"]
 
     def load_seismic_2d_data():
-        data = [
-            ["Survey X", "Line 101", "500", "Completed"],
-            ["Survey Y", "Line 202", "750", "Pending"],
-        ] * 60
-        return data
+        for _ in range(60):
+            yield ["Survey X", "Line 101", "500", "Completed"]
+            yield ["Survey Y", "Line 202", "750", "Pending"]
 
     def load_seismic_3d_data():
-        data = [
-            ["Survey X", "Vol_001", "300", "400", "Processing"],
-            ["Survey Y", "Vol_002", "350", "450", "Completed"],
-        ] * 60
-        return data
+        for _ in range(60):
+            yield ["Survey X", "Vol_001", "300", "400", "Processing"]
+            yield ["Survey Y", "Vol_002", "350", "450", "Completed"]
 
     def load_seismic_location_data():
-        data = [
-            ["Seismic A", "10.5", "106.8"],
-            ["Seismic B", "11.2", "107.3"],
-        ] * 60
-        return data
+        for _ in range(60):
+            yield ["Seismic A", "10.5", "106.8"]
+            yield ["Seismic B", "11.2", "107.3"]
 
     def load_document_data():
-        data = [
-            ["Well Report", "PDF", "2024-01-15", "John Doe"],
-            ["Seismic Interpretation", "DOCX", "2023-12-10", "Jane Smith"],
-        ] * 60
-        return data
\ No newline at end of file
+        for _ in range(60):
+            yield ["Well Report", "PDF", "2024-01-15", "John Doe"]
+            yield ["Seismic Interpretation", "DOCX", "2023-12-10", "Jane Smith"]
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""Cache dữ liệu đã load trên đĩa để lần mở sau không phải load/parse lại.
+
+Mỗi loại dữ liệu có một thư mục, trong đó mỗi phiên bản nguồn (chuỗi
+source_version của loader) là một thư mục con gồm các file cột thô
+(float64/uint32 cho cột số/category, offset + utf-8 cho cột text), các
+buffer của chỉ mục tìm kiếm và meta.json. Khi mở, các file được map vào bộ
+nhớ (mmap) nên trang đầu hiện ra ngay, dữ liệu chỉ được đọc từ đĩa khi cần.
+Phiên bản nguồn được kiểm tra lại trên thread nền (SourceVersionWorker);
+cache cũ hoặc vượt quá dung lượng cho phép thì bị xóa (LRU theo lần mở gần nhất).
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+from array import array
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from .column_store import ColumnStore, MappedStrings
+from .schema import NUMBER, CATEGORY
+from .search_index import SearchIndex, NGRAM_SIZE
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 2 * 2**30
+META_FILE = "meta.json"
+TMP_MAX_AGE = 3600  # thư mục đang ghi dở quá thời gian này (giây) được coi là bỏ dở
+
+
+class CachedDataset:
+    def __init__(self, data_type, source_version, store, index, path):
+        self.data_type = data_type
+        self.source_version = source_version
+        self.store = store
+        self.index = index
+        self.path = path
+        self.rows = len(store)  # số dòng lấy từ cache (các dòng sau là bản ghi import thêm)
+
+
+class DatasetCache:
+    """Cache các ColumnStore + SearchIndex theo (loại dữ liệu, phiên bản nguồn) trong một thư mục"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._opened = set()  # thư mục cache đang được map trong process này
+
+    def _type_dir(self, data_type):
+        slug = "".join(ch if ch.isalnum() else "_" for ch in data_type)
+        return os.path.join(self.directory, slug)
+
+    def open(self, data_type, schema):
+        """Mở cache mới nhất của loại dữ liệu, None nếu chưa có hoặc không dùng được"""
+        type_dir = self._type_dir(data_type)
+        columns = [spec.name for spec in schema]
+        entries = []
+        for name in _listdir(type_dir):
+            path = os.path.join(type_dir, name)
+            meta = _read_meta(path)
+            if meta and meta["data_type"] == data_type and meta["columns"] == columns:
+                entries.append((meta["created"], path, meta))
+        for _, path, meta in sorted(entries, reverse=True):
+            try:
+                dataset = self._map(path, meta, schema)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            self._opened.add(path)
+            os.utime(os.path.join(path, META_FILE))  # thời điểm dùng gần nhất cho LRU
+            return dataset
+        return None
+
+    def save(self, data_type, source_version, store, index, rows=None):
+        """Ghi rows dòng đầu của store và chỉ mục; thay các phiên bản cũ của loại dữ liệu"""
+        data, categories, raw = store.snapshot(rows)
+        index_rows, values, value_columns, grams, cells = index.snapshot(rows)
+        rows = index_rows
+        joined_values = "\0".join(values)
+        if joined_values.count("\0") != max(len(values) - 1, 0):
+            raise ValueError("giá trị chứa ký tự NUL, không ghi cache được")
+
+        type_dir = self._type_dir(data_type)
+        key = hashlib.sha1(source_version.encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(type_dir, key)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            for col, spec in enumerate(store.schema):
+                if spec.kind == NUMBER:
+                    _write(tmp, f"col{col}.f8", data[col])
+                elif spec.kind == CATEGORY:
+                    _write(tmp, f"col{col}.u4", data[col])
+                else:
+                    _write_strings(tmp, f"col{col}", data[col])
+            _write(tmp, "index.values.txt", joined_values.encode("utf-8"))
+            _write(tmp, "index.columns.u8", value_columns)
+            offsets = [0]
+            for posting in grams.values():
+                offsets.append(offsets[-1] + len(posting) // 4)
+            _write(tmp, "index.grams.txt", "".join(grams).encode("utf-8"))
+            _write(tmp, "index.grams.off", memoryview(array('q', offsets)).tobytes())
+            _write(tmp, "index.grams.u4", b"".join(grams.values()))
+            for col, buffer in enumerate(cells):
+                _write(tmp, f"index.cells{col}.u4", buffer)
+            meta = {
+                "format": CACHE_FORMAT,
+                "data_type": data_type,
+                "source_version": source_version,
+                "columns": store.columns,
+                "rows": rows,
+                "values": len(values),
+                "grams": len(grams),
+                "categories": categories,
+                "raw": [{str(row): text for row, text in texts.items()} for texts in raw],
+                "created": time.time(),
+            }
+            # meta.json ghi sau cùng: thư mục chỉ hợp lệ khi đã ghi đủ file
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        for name in _listdir(type_dir):
+            other = os.path.join(type_dir, name)
+            if other != path and not name.startswith(f"{key}.tmp"):
+                self._remove(other)
+        self.evict(keep=(path,))
+        return path
+
+    def discard(self, data_type):
+        """Xóa mọi cache của loại dữ liệu (khi phát hiện cache đã cũ)"""
+        type_dir = self._type_dir(data_type)
+        for name in _listdir(type_dir):
+            self._remove(os.path.join(type_dir, name))
+
+    def size(self):
+        """Tổng dung lượng (byte) của thư mục cache"""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self, keep=()):
+        """Xóa các cache dùng lâu nhất cho tới khi tổng dung lượng không vượt max_bytes"""
+        now = time.time()
+        entries = []
+        for used, path, size in self._entries():
+            if ".tmp-" in os.path.basename(path):
+                if now - used > TMP_MAX_AGE:
+                    self._remove(path)
+                continue
+            entries.append((used, path, size))
+        total = sum(size for _, _, size in entries)
+        for used, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            self._remove(path)
+            total -= size
+
+    def _entries(self):
+        """(thời điểm dùng gần nhất, thư mục, dung lượng) của từng cache"""
+        for type_name in _listdir(self.directory):
+            type_dir = os.path.join(self.directory, type_name)
+            for name in _listdir(type_dir):
+                path = os.path.join(type_dir, name)
+                used, size = 0, 0
+                try:
+                    for entry in os.scandir(path):
+                        stat = entry.stat()
+                        size += stat.st_size
+                        if entry.name == META_FILE:
+                            used = stat.st_mtime
+                    yield used or os.stat(path).st_mtime, path, size
+                except OSError:
+                    continue  # bị xóa trong lúc duyệt
+
+    def _remove(self, path):
+        # File đang map trong process này không xóa được trên Windows: để lần sau
+        if path not in self._opened or os.name != "nt":
+            shutil.rmtree(path, ignore_errors=True)
+            self._opened.discard(path)
+
+    def _map(self, path, meta, schema):
+        rows = meta["rows"]
+        data = []
+        for col, spec in enumerate(schema):
+            if spec.kind == NUMBER:
+                data.append(_map_array(path, f"col{col}.f8", "d", rows))
+            elif spec.kind == CATEGORY:
+                data.append(_map_array(path, f"col{col}.u4", "I", rows))
+            else:
+                data.append(MappedStrings(_map_array(path, f"col{col}.off", "q", rows + 1),
+                                          _map(path, f"col{col}.txt")))
+        raw = [{int(row): text for row, text in texts.items()} for texts in meta["raw"]]
+        store = ColumnStore.from_buffers(schema, rows, data, meta["categories"], raw)
+
+        # Kiểm tra kích thước các file chỉ mục ngay, phần giải mã chạy trên thread nền
+        value_blob = _map(path, "index.values.txt")
+        value_columns = _map_array(path, "index.columns.u8", "Q", meta["values"])
+        gram_blob = _map(path, "index.grams.txt")
+        offsets = _map_array(path, "index.grams.off", "q", meta["grams"] + 1)
+        postings = _map_array(path, "index.grams.u4", "I", offsets[-1])
+        cells = [_map_array(path, f"index.cells{col}.u4", "I", rows) for col in range(len(schema))]
+
+        def load_index():
+            values = str(value_blob, "utf-8").split("\0") if meta["values"] else []
+            if len(values) != meta["values"]:
+                raise ValueError("index.values.txt không khớp meta.json")
+            gram_text = str(gram_blob, "utf-8")
+            grams = {gram_text[i * NGRAM_SIZE:(i + 1) * NGRAM_SIZE]: postings[offsets[i]:offsets[i + 1]]
+                     for i in range(meta["grams"])}
+            return values, value_columns, grams, cells
+
+        index = SearchIndex.from_buffers(rows, load_index)
+        return CachedDataset(meta["data_type"], meta["source_version"], store, index, path)
+
+
+def _listdir(path):
+    try:
+        return os.listdir(path)
+    except FileNotFoundError:
+        return []
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == CACHE_FORMAT else None
+
+
+def _write(directory, name, buffer):
+    with open(os.path.join(directory, name), "wb") as f:
+        f.write(buffer)
+
+
+def _write_strings(directory, name, strings):
+    """Cột text: offset int64 (số dòng + 1) và các chuỗi utf-8 nối liền"""
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = [0] * (len(encoded) + 1)
+    position = 0
+    for i, blob in enumerate(encoded, 1):
+        position += len(blob)
+        offsets[i] = position
+    _write(directory, f"{name}.off", memoryview(array('q', offsets)).tobytes())
+    _write(directory, f"{name}.txt", b"".join(encoded))
+
+
+def _map(directory, name):
+    """Map file chỉ đọc vào bộ nhớ (file rỗng trả về b"")"""
+    with open(os.path.join(directory, name), "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_array(directory, name, typecode, count):
+    """memoryview kiểu typecode trên file, kiểm tra đúng count phần tử"""
+    view = memoryview(_map(directory, name)).cast(typecode)
+    if len(view) != count:
+        raise ValueError(f"{name}: {len(view)} phần tử, cần {count}")
+    return view
+
+
+class CacheSignals(QObject):
+    saved = pyqtSignal(str, str)             # loại dữ liệu, thư mục cache
+    failed = pyqtSignal(str, str)            # loại dữ liệu, thông báo lỗi
+    version_checked = pyqtSignal(str, object)  # loại dữ liệu, phiên bản nguồn (None nếu không xác định được)
+
+
+class CacheWriteWorker(QRunnable):
+    """Ghi cache của một loại dữ liệu vừa load xong trên thread nền"""
+
+    def __init__(self, cache, data_type, source_version, store, index, rows):
+        super().__init__()
+        self.cache = cache
+        self.data_type = data_type
+        self.source_version = source_version
+        self.store = store
+        self.index = index
+        self.rows = rows
+        self.signals = CacheSignals()
+
+    def run(self):
+        try:
+            path = self.cache.save(self.data_type, self.source_version, self.store, self.index, self.rows)
+        except Exception as e:
+            self.signals.failed.emit(self.data_type, str(e) or type(e).__name__)
+        else:
+            self.signals.saved.emit(self.data_type, path)
+
+
+class SourceVersionWorker(QRunnable):
+    """Hỏi phiên bản hiện tại của nguồn dữ liệu trên thread nền (có thể cần gọi mạng)"""
+
+    def __init__(self, data_type, loader):
+        super().__init__()
+        self.data_type = data_type
+        self.loader = loader
+        self.signals = CacheSignals()
+
+    def run(self):
+        try:
+            version = self.loader.source_version()
+        except Exception:
+            version = None
+        self.signals.version_checked.emit(self.data_type, version)
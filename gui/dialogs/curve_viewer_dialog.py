@@ -0,0 +1,160 @@
+# curve_viewer_dialog.py
+import math
+
+import numpy as np
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QLabel, QDoubleSpinBox, QPushButton, QWidget, QSplitter
+)
+from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
+from PyQt5.QtGui import QPainter, QPainterPath, QPen, QColor
+
+
+class CurveTrack(QWidget):
+    """Track vẽ một đường cong theo độ sâu (trục dọc), mỗi dòng pixel đọc khoảng một điểm từ kho đường cong"""
+
+    MARGIN = 24
+    window_loaded = pyqtSignal(object)  # CurveWindow vừa đọc (None nếu không có đường cong)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(240, 300)
+        self.curve_set = None
+        self.curve = None
+        self.top = self.bottom = 0.0
+        self.window = None  # CurveWindow đang vẽ
+
+    def show_curve(self, curve_set, curve, top, bottom):
+        self.curve_set, self.curve, self.top, self.bottom = curve_set, curve, top, bottom
+        self._load()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size().height() != event.oldSize().height():
+            self._load()
+
+    def _load(self):
+        self.window = None
+        if self.curve_set is not None and self.curve is not None and self.bottom > self.top:
+            self.window = self.curve_set.window(self.curve, self.top, self.bottom, max_points=self._plot_height())
+        self.window_loaded.emit(self.window)
+        self.update()
+
+    def _plot_height(self):
+        return max(self.height() - 2 * self.MARGIN, 1)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        window = self.window
+        if window is None:
+            return
+        margin = self.MARGIN
+        height = self._plot_height()
+        width = max(self.width() - 2 * margin, 1)
+        painter.setPen(QColor(180, 180, 180))
+        painter.drawRect(margin, margin, width, height)
+        painter.setPen(Qt.black)
+        painter.drawText(2, margin - 6, f"{self.top:g}")
+        painter.drawText(2, margin + height + 16, f"{self.bottom:g}")
+        known = ~(np.isnan(window.low) | np.isnan(window.high))
+        if not known.any():
+            return
+        low, high = float(np.min(window.low[known])), float(np.max(window.high[known]))
+        span = high - low or 1.0
+        painter.drawText(QRectF(margin, 0, width, margin - 4), Qt.AlignRight | Qt.AlignBottom, f"{low:g} - {high:g}")
+
+        scale_y = height / (self.bottom - self.top)
+        ys = margin + (np.clip(window.depth, self.top, self.bottom) - self.top) * scale_y
+        xs_low = margin + (window.low - low) / span * width
+        xs_high = margin + (window.high - low) / span * width
+        # Mỗi điểm/khối: đoạn ngang từ min tới max, nối sang điểm kế tiếp; NaN làm đứt đường
+        path = QPainterPath()
+        pen_up = True
+        for y, x0, x1, ok in zip(ys.tolist(), xs_low.tolist(), xs_high.tolist(), known.tolist()):
+            if not ok:
+                pen_up = True
+                continue
+            if pen_up:
+                path.moveTo(QPointF(x0, y))
+                pen_up = False
+            else:
+                path.lineTo(QPointF(x0, y))
+            if x1 != x0:
+                path.lineTo(QPointF(x1, y))
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(0, 90, 200), 1))
+        painter.drawPath(path)
+
+
+class CurveViewerDialog(QDialog):
+    """Xem các đường cong của một file log (WellLog) trong một khoảng độ sâu"""
+
+    def __init__(self, parent, curve_set, top=None, bottom=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Curves - {curve_set.wellbore} / {curve_set.file_name}")
+        self.setGeometry(200, 120, 560, 640)
+        self.curve_set = curve_set
+
+        self.curve_list = QListWidget()
+        self.curve_list.addItems(curve_set.curve_names)
+        self.top_edit = self._depth_edit()
+        self.bottom_edit = self._depth_edit()
+        self.full_button = QPushButton("Full Range")
+        self.info_label = QLabel()
+        self.track = CurveTrack()
+
+        depth_bar = QHBoxLayout()
+        depth_bar.addWidget(QLabel("Top"))
+        depth_bar.addWidget(self.top_edit)
+        depth_bar.addWidget(QLabel("Bottom"))
+        depth_bar.addWidget(self.bottom_edit)
+        depth_bar.addWidget(self.full_button)
+
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.curve_list)
+        splitter.addWidget(self.track)
+        splitter.setSizes([120, 440])
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(depth_bar)
+        layout.addWidget(splitter, 1)
+        layout.addWidget(self.info_label)
+
+        self.track.window_loaded.connect(self._show_info)
+        self.set_range(curve_set.top if top is None else top, curve_set.bottom if bottom is None else bottom)
+        self.curve_list.currentRowChanged.connect(self.refresh)
+        self.top_edit.valueChanged.connect(self.refresh)
+        self.bottom_edit.valueChanged.connect(self.refresh)
+        self.full_button.clicked.connect(lambda: self.set_range(curve_set.top, curve_set.bottom))
+        if curve_set.curve_names:
+            self.curve_list.setCurrentRow(0)
+
+    def _depth_edit(self):
+        edit = QDoubleSpinBox()
+        edit.setDecimals(2)
+        edit.setRange(math.floor(self.curve_set.top) - 1e4, math.ceil(self.curve_set.bottom) + 1e4)
+        edit.setKeyboardTracking(False)
+        return edit
+
+    def set_range(self, top, bottom):
+        for edit, value in ((self.top_edit, top), (self.bottom_edit, bottom)):
+            edit.blockSignals(True)
+            edit.setValue(value)
+            edit.blockSignals(False)
+        self.refresh()
+
+    def refresh(self):
+        item = self.curve_list.currentItem()
+        curve = item.text() if item is not None else None
+        self.track.show_curve(self.curve_set, curve, self.top_edit.value(), self.bottom_edit.value())
+
+    def _show_info(self, window):
+        curve = self.track.curve
+        if window is None:
+            self.info_label.setText(f"{self.curve_set.rows:,} mẫu")
+            return
+        unit = self.curve_set.unit(curve)
+        source = ("mẫu gốc" if window.level == 0
+                  else f"tầng {window.level} (min/max mỗi {self.curve_set.factor ** window.level} mẫu)")
+        self.info_label.setText(f"{curve}{f' ({unit})' if unit else ''}: {len(window.depth):,} điểm đọc từ "
+                                f"{source}, tổng {self.curve_set.rows:,} mẫu")
@@ -1,45 +1,58 @@
 # data_export_dialog.py
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
-import csv
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PyQt5.QtCore import QThreadPool
+from gui.export_engine import ExportWorker, EXPORT_FORMATS, EXTENSIONS, format_for_path
 
 class DataExportDialog:
-    def __init__(self, table_widget):
-        self.table = table_widget  # Truyền đối tượng QTableWidget vào class
+    def __init__(self, parent, store, row_ids, columns):
+        self.parent = parent
+        self.store = store          # ColumnStore chứa dữ liệu gốc
+        self.row_ids = row_ids      # id các dòng cần xuất (kết quả lọc hoặc các dòng được chọn)
+        self.columns = columns      # các cột đang hiển thị
+        self.worker = None
+        self.progress = None
 
     def export_data(self):
-        """Xử lý logic xuất dữ liệu từ bảng ra file CSV"""
+        """Chọn file rồi xuất dữ liệu trên thread nền (CSV, CSV gzip, Parquet, Arrow IPC)"""
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getSaveFileName(
-            None,  # Không cần parent nếu dùng dialog độc lập
-            "Save CSV", 
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self.parent,
+            "Export Data", 
             "", 
-            "CSV Files (*.csv);;All Files (*)", 
+            ";;".join(EXPORT_FORMATS) + ";;All Files (*)", 
             options=options
         )
         
         if not file_name:
             return
-        
-        try:
-            with open(file_name, mode='w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                # Lấy headers từ bảng
-                headers = [self.table.horizontalHeaderItem(i).text() 
-                          for i in range(self.table.columnCount())]
-                writer.writerow(headers)
-                
-                # Lấy dữ liệu từ các hàng được chọn
-                selected_ranges = self.table.selectedRanges()
-                for selection in selected_ranges:
-                    for row in range(selection.topRow(), selection.bottomRow() + 1):
-                        row_data = [
-                            self.table.item(row, col).text() 
-                            if self.table.item(row, col) else "" 
-                            for col in range(selection.leftColumn(), selection.rightColumn() + 1)
-                        ]
-                        writer.writerow(row_data)
-            
-            QMessageBox.information(None, "Thành công", "Xuất dữ liệu thành công!")
-        
-        except Exception as e:
-            QMessageBox.critical(None, "Lỗi", f"Không thể xuất file:\n{str(e)}")
\ No newline at end of file
+
+        fmt = EXPORT_FORMATS.get(selected_filter) or format_for_path(file_name)
+        if format_for_path(file_name, None) != fmt:
+            file_name += EXTENSIONS[fmt]
+
+        self.progress = QProgressDialog("Đang xuất dữ liệu...", "Cancel", 0, len(self.row_ids), self.parent)
+        self.progress.setWindowTitle("Export")
+        self.progress.setMinimumDuration(300)
+        self.progress.setAutoClose(False)
+        self.progress.setAutoReset(False)
+
+        self.worker = ExportWorker(self.store, self.row_ids, self.columns, file_name, fmt)
+        self.worker.signals.progress.connect(self._on_progress)
+        self.worker.signals.finished.connect(self._on_finished)
+        self.worker.signals.failed.connect(self._on_failed)
+        self.worker.signals.cancelled.connect(self.progress.close)
+        self.progress.canceled.connect(self.worker.cancel)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def _on_progress(self, written, total):
+        self.progress.setMaximum(total)
+        self.progress.setValue(written)
+
+    def _on_finished(self, path, rows, bytes_written):
+        self.progress.close()
+        QMessageBox.information(self.parent, "Thành công",
+                                f"Xuất dữ liệu thành công!\n{rows} dòng, {bytes_written / 1024:.0f} KB\n{path}")
+
+    def _on_failed(self, message):
+        self.progress.close()
+        QMessageBox.critical(self.parent, "Lỗi", f"Không thể xuất file:\n{message}")
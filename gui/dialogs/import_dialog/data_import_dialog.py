@@ -3,22 +3,53 @@ import os
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QVBoxLayout, QComboBox, QFileDialog, 
-    QDateTimeEdit, QMessageBox, QSplitter, QListWidget 
+    QDateTimeEdit, QMessageBox, QSplitter, QListWidget, QListWidgetItem
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QDateTime
+from PyQt5.QtGui import QColor
 from .drag_drop_handler import enable_drag_drop  # Import enable_drag_drop từ drag_drop_handler
-from .dynamic_form_builder import load_properties, create_form, add_default_fields
+from .dynamic_form_builder import create_form, add_default_fields
+from .schema_registry import schema_registry
+from .file_scanner import FileScanner
 from .valid_extensions import VALID_EXTENSIONS  # Import VALID_EXTENSIONS từ valid_extensions
+from gui.import_pipeline import ImportPipeline
+from gui.upload_client import UploadManager, format_progress
+from gui.instrumentation import instruments
+
+# Loại dữ liệu mặc định theo đuôi file (khi chưa chọn Type Data cho file).
+# File CSV có thể là bất kỳ loại nào nên không có mặc định: phải chọn Type Data.
+EXTENSION_MAPPING = {
+    '.txt': 'WellPath',
+    '.las': 'WellLog',
+    '.xlsx': 'Marker',
+}
+
+# Trạng thái import của từng file trong file_list
+PENDING, RUNNING, IMPORTED, FAILED = "pending", "running", "imported", "failed"
+UPLOADING, UPLOADED, UPLOAD_FAILED = "uploading", "uploaded", "upload_failed"
 
 class DataImportTab(QWidget):
     upload_started = pyqtSignal(str)
+    records_imported = pyqtSignal(str, object)  # loại dữ liệu, list dòng đã kiểm tra
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, columns_by_type=None, curve_store=None, upload_client=None):
         super().__init__(parent)
         self.widgets = {}
         self.form_loaded = False  
         self.file_history = [] 
         self.current_file_index = -1 
+        self.columns_by_type = columns_by_type or {}
+        self.curve_store = curve_store  # nhận dữ liệu đường cong của các file LAS import vào WellLog
+        self.import_pipeline = None  # tạo khi import lần đầu
+        self.upload_client = upload_client  # gui.upload_client.UploadClient (None: không upload file lên storage)
+        self.upload_manager = None  # tạo khi upload lần đầu
+        self.file_scanner = None  # quét file/thư mục được thả, tạo khi thả lần đầu
+        self._show_next_found = False  # hiện thông tin file đầu tiên tìm được của lần thả
+        self._file_items = {}  # đường dẫn -> QListWidgetItem
+        self._file_status = {}  # đường dẫn -> trạng thái import
+        self._file_types = {}  # đường dẫn -> Type Data người dùng chọn cho file (ghi đè EXTENSION_MAPPING)
+        self._forms = {}  # tên schema -> (FormSchema, widget chứa form, widgets): form dựng sẵn dùng lại
+        self.current_form = None  # tên schema của form đang hiện
         self.init_ui()
         enable_drag_drop(self)
         
@@ -32,6 +63,7 @@ class DataImportTab(QWidget):
         self.placeholder_label = QLabel("Kéo thả file vào đây để bắt đầu")
         self.placeholder_label.setAlignment(Qt.AlignCenter)
         self.form_layout.addWidget(self.placeholder_label)
+        self._check_schemas()
 
         """Phần dưới: Danh sách file"""
         self.file_list = QListWidget()
@@ -45,14 +77,40 @@ class DataImportTab(QWidget):
         main_layout.addWidget(self.main_splitter)
         self.setLayout(main_layout)
 
+    def _check_schemas(self):
+        """Đọc trước mọi schema form import; file YAML lỗi được báo ngay trên tab"""
+        _, errors = schema_registry().load_all()
+        if errors:
+            self.placeholder_label.setText(self.placeholder_label.text() + "\n\nLỗi cấu hình form import:\n"
+                                           + "\n".join(str(e) for e in errors))
+            self.placeholder_label.setStyleSheet("color: red")
+
     def _update_file_list(self, file_path):
         """Cập nhật danh sách file vào QListWidget"""
+        if file_path in self._file_items:
+            # File đã có trong danh sách: đánh dấu chờ import lại nếu lần trước lỗi
+            if self._file_status[file_path] == FAILED:
+                self._set_file_status(file_path, PENDING, "chờ import")
+            return
         self.file_history.append(file_path)
-        self.file_list.addItem(file_path)
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, file_path)
+        self.file_list.addItem(item)
+        self._file_items[file_path] = item
+        instruments.count("list items created")
+        self._set_file_status(file_path, PENDING, "chờ import")
+
+    def _set_file_status(self, file_path, status, text, details=""):
+        """Hiển thị trạng thái import của file trên file_list"""
+        item = self._file_items[file_path]
+        self._file_status[file_path] = status
+        item.setText(f"{file_path}    [{text}]")
+        item.setToolTip(details)
+        item.setForeground(QColor("red") if status in (FAILED, UPLOAD_FAILED) else QColor("black"))
 
     def _on_file_selected(self, item):
         """Xử lý khi chọn file từ danh sách"""
-        file_path = item.text()
+        file_path = item.data(Qt.UserRole) or item.text()
         self.current_file_index = self.file_list.row(item)
         self._update_file_info(file_path)  
 
@@ -64,31 +122,74 @@ class DataImportTab(QWidget):
                 self.placeholder_label.deleteLater()
                 self.placeholder_label = None
 
-            config = load_properties("csv")
-            form_grid, self.widgets = create_form(config)
-            form_grid, self.widgets = add_default_fields(form_grid, self.widgets, len(config))
-            
-            self.form_layout.addLayout(form_grid)
-            self._connect_events()
-            self._map_widgets()
-            
-            self._update_file_info(file_path)
+            self._show_form(file_path)
             self.form_loaded = True
+            self._update_file_info(file_path)
 
         except Exception as e:
             QMessageBox.critical(self, "Lỗi", str(e))
 
-    def handle_dropped_file(self, file_path):
-        """Xử lý file được thả vào"""
-        ext = Path(file_path).suffix.lower()
-        if ext in VALID_EXTENSIONS:
+    def _show_form(self, file_path):
+        """Hiện form theo schema của loại file; form của mỗi schema chỉ dựng một lần rồi dùng lại"""
+        schema = schema_registry().for_path(file_path)
+        entry = self._forms.get(schema.name)
+        if entry is not None and entry[0] is not schema:
+            # File YAML đã thay đổi: bỏ form cũ, dựng lại theo schema mới
+            entry[1].deleteLater()
+            entry = None
+            if self.current_form == schema.name:
+                self.current_form = None
+        if entry is None:
+            container = QWidget()
+            form_grid, widgets = create_form(schema)
+            form_grid, widgets = add_default_fields(form_grid, widgets, len(schema.fields))
+            container.setLayout(form_grid)
+            container.hide()
+            self.form_layout.addWidget(container)
+            self._connect_events(widgets)
+            entry = self._forms[schema.name] = (schema, container, widgets)
+        if self.current_form == schema.name:
+            return
+        previous = self._forms.get(self.current_form)
+        if previous is not None:
+            previous[1].hide()
+        self.current_form = schema.name
+        self.widgets = entry[2]
+        self._map_widgets()
+        entry[1].show()
+
+    def handle_dropped_paths(self, paths):
+        """Xếp hàng quét các file/thư mục được thả; file hợp lệ được thêm vào danh sách theo lô"""
+        if not paths:
+            return
+        if self.file_scanner is None:
+            self.file_scanner = FileScanner(self)
+            self.file_scanner.files_found.connect(self._on_files_found)
+            self.file_scanner.finished.connect(self._on_scan_finished)
+        self._show_next_found = True
+        # File lỗi lần trước được thả lại thì chờ import lại (không tính là trùng)
+        known = [path for path, status in self._file_status.items() if status != FAILED]
+        self.file_scanner.scan(paths, known)
+
+    def _on_files_found(self, paths):
+        if self._show_next_found:
+            self._show_next_found = False
             if not self.form_loaded:
-                self.load_form(file_path)
+                self.load_form(paths[0])
             else:
-                self._update_file_info(file_path)
-            self._update_file_list(file_path)
-        else:
-            QMessageBox.warning(self, "Lỗi", "File không hợp lệ. Hãy kiểm tra lại định dạng file.")
+                self._update_file_info(paths[0])
+        # Thêm cả lô với updates tắt: danh sách chỉ vẽ lại một lần
+        self.file_list.setUpdatesEnabled(False)
+        try:
+            for path in paths:
+                self._update_file_list(path)
+        finally:
+            self.file_list.setUpdatesEnabled(True)
+
+    def _on_scan_finished(self, report):
+        """Một thông báo cho các file bị bỏ qua/lỗi của mọi lần thả vừa quét"""
+        if report.has_problems():
+            QMessageBox.warning(self, "Thêm file", report.message())
 
     def open_file_dialog(self):
         """Xử lý mở file"""
@@ -103,26 +204,34 @@ class DataImportTab(QWidget):
             else:
                 QMessageBox.warning(self, "Lỗi", "File không hợp lệ. Hãy kiểm tra lại định dạng file.")
 
+    def _data_type(self, file_path):
+        """Loại dữ liệu import của file: Type Data đã chọn cho file, không có thì theo đuôi file"""
+        return self._file_types.get(file_path) or EXTENSION_MAPPING.get(Path(file_path).suffix.lower())
+
     def _update_file_type(self, file_path):
-        """Cập nhật loại dữ liệu dựa trên đuôi file"""
-        EXTENSION_MAPPING = {
-            '.csv': 'Zone',
-            '.txt': 'WellPath',
-            '.las': 'WellLog',
-            '.xlsx': 'Marker',
-        }
-        
-        file_extension = Path(file_path).suffix.lower()
-        
-        file_type = EXTENSION_MAPPING.get(file_extension, None)
-        
-        if file_type:
-            index = self.combo_type_data.findText(file_type, Qt.MatchFixedString)
-            if index >= 0:
-                self.combo_type_data.setCurrentIndex(index)
+        """Hiện loại dữ liệu của file trên Type Data"""
+        index = self.combo_type_data.findText(self._data_type(file_path) or "Select", Qt.MatchFixedString)
+        self.combo_type_data.setCurrentIndex(max(index, 0))
+
+    def _on_type_selected(self, data_type):
+        """Người dùng chọn Type Data: chỉ áp dụng cho file đang hiện"""
+        file_path = self.file_path_edit.text()
+        if not file_path:
+            return
+        if data_type == "Select":
+            self._file_types.pop(file_path, None)
+        else:
+            self._file_types[file_path] = data_type
 
     def _update_file_info(self, file_path):
         """Cập nhật thông tin file"""
+        if self.form_loaded:
+            try:
+                self._show_form(file_path)
+            except ValueError as e:
+                QMessageBox.critical(self, "Lỗi", str(e))
+                return
+
         if 'file_path' in self.widgets: 
             self.widgets['file_path'].setText(file_path)
         
@@ -141,21 +250,96 @@ class DataImportTab(QWidget):
         self.file_name_edit = self.widgets.get('record_id', QLineEdit())
         self.date_upload_edit = self.widgets.get('date_upload', QDateTimeEdit())
         
-    def _connect_events(self):
+    def _connect_events(self, widgets):
         """Kết nối sự kiện"""
-        if 'btn_open_file' in self.widgets:
-            self.widgets['btn_open_file'].clicked.connect(self.open_file_dialog)
-        if 'btn_upload' in self.widgets:
-            self.widgets['btn_upload'].clicked.connect(self.confirm_import)
-        if 'btn_cancel' in self.widgets:
-            self.widgets['btn_cancel'].clicked.connect(self.cancel_import)
+        if 'schema_type' in widgets:
+            widgets['schema_type'].activated[str].connect(self._on_type_selected)
+        if 'btn_open_file' in widgets:
+            widgets['btn_open_file'].clicked.connect(self.open_file_dialog)
+        if 'btn_upload' in widgets:
+            widgets['btn_upload'].clicked.connect(self.confirm_import)
+        if 'btn_cancel' in widgets:
+            widgets['btn_cancel'].clicked.connect(self.cancel_import)
 
     def confirm_import(self):
-        """Khi nhấn Upload, gửi tín hiệu upload_started."""
+        """Khi nhấn Upload, import các file đang chờ trong danh sách trên thread nền.
+
+        Mỗi file import theo Type Data đã chọn khi file đó được hiện trên form;
+        chưa chọn thì loại dữ liệu lấy theo đuôi file (file CSV chưa chọn thì báo lỗi).
+        """
         file_path = self.file_path_edit.text()
+        if file_path:
+            self._update_file_list(file_path)
+        jobs = []
+        uploads = []  # file đã import nhưng upload lỗi/bị hủy: upload tiếp phần còn lại
+        for path, status in self._file_status.items():
+            if status == PENDING:
+                jobs.append((path, self._data_type(path)))
+                self._set_file_status(path, RUNNING, "đang chờ")
+            elif status == UPLOAD_FAILED and self.upload_client is not None:
+                uploads.append(path)
+        if not jobs and not uploads:
+            QMessageBox.information(self, "Thông báo", "Không có file nào cần import.")
+            return
+        if jobs:
+            self._get_import_pipeline().submit(jobs)
+        if uploads:
+            self._start_upload(uploads)
+
+    def _get_import_pipeline(self):
+        if self.import_pipeline is None:
+            self.import_pipeline = ImportPipeline(self.columns_by_type, self, curve_store=self.curve_store)
+            self.import_pipeline.file_started.connect(self._on_import_started)
+            self.import_pipeline.file_progress.connect(
+                lambda path, rows: self._set_file_status(path, RUNNING, f"đang đọc: {rows} bản ghi"))
+            self.import_pipeline.file_imported.connect(self._on_file_imported)
+            self.import_pipeline.file_failed.connect(self._on_import_failed)
+            self.import_pipeline.records_ready.connect(self.records_imported)
+            self.import_pipeline.finished.connect(self._on_import_finished)
+        return self.import_pipeline
+
+    def _on_file_imported(self, file_path, data_type, rows):
+        self._set_file_status(file_path, IMPORTED, f"{data_type}: {rows} bản ghi")
+        if self.upload_client is not None:
+            self._start_upload([file_path])
+
+    def _start_upload(self, paths):
+        """Upload các file lên storage trên thread nền (tiếp tục từ phần đã gửi nếu lần trước bị ngắt)"""
+        if self.upload_manager is None:
+            self.upload_manager = UploadManager(self.upload_client, self)
+            self.upload_manager.file_progress.connect(
+                lambda path, progress: self._set_file_status(path, UPLOADING, "upload " + format_progress(*progress)))
+            self.upload_manager.file_uploaded.connect(
+                lambda path, location: self._set_file_status(path, UPLOADED, "đã upload", location))
+            self.upload_manager.file_failed.connect(self._on_upload_failed)
+            self.upload_manager.finished.connect(self._on_upload_finished)
+        for path in paths:
+            self._set_file_status(path, UPLOADING, "chờ upload")
+        self.upload_manager.submit(paths)
+
+    def _on_upload_failed(self, file_path, message):
+        self._set_file_status(file_path, UPLOAD_FAILED, f"upload lỗi: {message.splitlines()[0]}", message)
+
+    def _on_upload_finished(self, uploaded, failed):
+        if failed:
+            QMessageBox.warning(self, "Upload", f"Đã upload {uploaded} file, {failed} file lỗi hoặc bị hủy.\n"
+                                                "Bấm Upload để upload tiếp phần còn lại của các file này.")
+
+    def _on_import_started(self, file_path):
+        self._set_file_status(file_path, RUNNING, "đang đọc")
         self.upload_started.emit(file_path)
 
-        print(self.get_import_info())
+    def _on_import_failed(self, file_path, message):
+        self._set_file_status(file_path, FAILED, f"lỗi: {message.splitlines()[0]}", message)
+
+    def _on_import_finished(self, imported, failed, records):
+        """Báo kết quả một lượt import (một thông báo cho cả lượt)"""
+        message = f"Đã import {imported} file ({records} bản ghi)."
+        if failed:
+            message += f"\n{failed} file lỗi, xem chi tiết trên danh sách file."
+            QMessageBox.warning(self, "Import", message)
+        else:
+            QMessageBox.information(self, "Import", message)
     
     def get_import_info(self):
         """Trả về thông tin import dưới dạng dict."""
@@ -167,7 +351,13 @@ class DataImportTab(QWidget):
         }
     
     def cancel_import(self):
-        """Reset các trường về trạng thái ban đầu."""
+        """Hủy lượt import đang chạy và reset các trường về trạng thái ban đầu."""
+        if self.import_pipeline is not None and self.import_pipeline.is_running():
+            self.import_pipeline.cancel()
+        if self.upload_manager is not None and self.upload_manager.is_running():
+            self.upload_manager.cancel()
+        if self.file_scanner is not None and self.file_scanner.is_running():
+            self.file_scanner.cancel()
         self.reset_fields()
     
     def reset_fields(self):
@@ -22,15 +22,13 @@ def enable_drag_drop(widget):
                 widget.placeholder_label = None
 
     def dropEvent(event):
-        """Xử lý sự kiện thả file"""
+        """Xử lý sự kiện thả file/thư mục: chuyển cả danh sách cho widget, không xử lý từng file ở đây"""
         if event.mimeData().hasUrls():
             event.setDropAction(Qt.CopyAction)
             event.accept()
-            # Gọi phương thức xử lý file chính thức của widget
-            for url in event.mimeData().urls():
-                file_path = url.toLocalFile()
-                if hasattr(widget, 'handle_dropped_file'):
-                    widget.handle_dropped_file(file_path)
+            paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+            # Quét trên thread nền (thư mục lớn không làm treo giao diện)
+            widget.handle_dropped_paths(paths)
         else:
             event.ignore()
 
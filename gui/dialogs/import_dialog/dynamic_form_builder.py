@@ -1,54 +1,43 @@
-import os
-import yaml
 from PyQt5.QtWidgets import (
     QGridLayout, QLabel, QComboBox, QLineEdit, QHBoxLayout,
     QDateTimeEdit, QPushButton, QSpacerItem, QSizePolicy
 )
 from PyQt5.QtCore import QDateTime, Qt
-
-def load_properties(file_type, config_path="config\properties"):
-    """Đọc file YAML và trả về cấu hình"""
-    try:
-        config_file = os.path.join(config_path, f"{file_type}.yaml")
-        with open(config_file, 'r', encoding='utf-8') as f:
-            props = yaml.safe_load(f)
-            return props
-    except Exception as e:
-        raise ValueError(f"Lỗi đọc cấu hình: {str(e)}")
+from .schema_registry import FormSchema, compile_schema
 
 def create_form(config):
-    """Tạo form động từ cấu hình YAML"""
+    """Tạo form động từ FormSchema (hoặc dict cấu hình YAML)"""
+    fields = config.fields if isinstance(config, FormSchema) else compile_schema("form", config)
     grid = QGridLayout()
     grid.setSpacing(10)
     grid.setContentsMargins(10, 10, 10, 10)
     widgets = {}
 
     # Thêm các trường từ YAML bắt đầu từ hàng 2
-    for row, (field, props) in enumerate(config.items(), start=2):
-        label = QLabel(props.get('label', field))
-        widget = _create_widget(props)
+    for row, field in enumerate(fields, start=2):
+        label = QLabel(field.label)
+        widget = _create_widget(field)
         
         grid.addWidget(label, row, 0)
         grid.addWidget(widget, row, 1, 1, 2)
-        widgets[field] = widget
+        widgets[field.name] = widget
 
     return grid, widgets
 
-def _create_widget(props):
-    """Tạo widget từ cấu hình YAML"""
-    widget_type = props.get("type", "QLineEdit")
-    readonly = props.get("readonly", False)  # Lấy giá trị read-only từ config
+def _create_widget(field):
+    """Tạo widget từ một FieldSpec"""
+    readonly = field.readonly  # Lấy giá trị read-only từ config
 
     # Tạo widget
-    if widget_type == "QComboBox":
+    if field.widget_type == "QComboBox":
         widget = QComboBox()
-        widget.addItems(props.get("options", []))
+        widget.addItems(field.options)
         # QComboBox không hỗ trợ setReadOnly, dùng setEnabled để vô hiệu hóa theo trang thai trong YAML
         widget.setEnabled(not readonly)
 
-    elif widget_type == "QDateTimeEdit":
+    elif field.widget_type == "QDateTimeEdit":
         widget = QDateTimeEdit()
-        widget.setDisplayFormat(props.get("format", "yyyy-MM-dd HH:mm:ss"))
+        widget.setDisplayFormat(field.format)
         widget.setCalendarPopup(True)
         widget.setDateTime(QDateTime.currentDateTime())
         widget.setReadOnly(readonly)
@@ -58,8 +47,8 @@ def _create_widget(props):
         widget.setReadOnly(readonly)
     
     # Thiết lập placeholder text nếu có
-    if "placeholder" in props:
-        widget.setPlaceholderText(props["placeholder"])
+    if field.placeholder:
+        widget.setPlaceholderText(field.placeholder)
     
     return widget
 
@@ -0,0 +1,178 @@
+"""Quét file/thư mục được thả vào tab Import trên thread nền.
+
+Các lần thả được xếp hàng và quét lần lượt trên một thread: thư mục được duyệt
+(cả thư mục con) bằng os.scandir, chỉ giữ file có đuôi trong VALID_EXTENSIONS,
+bỏ file đã có trong danh sách hoặc đã gặp trong lượt quét. File tìm được gửi
+về GUI thread theo lô (files_found) để thêm vào danh sách một lần mỗi lô; file
+bị bỏ qua và lỗi được gộp thành một ScanReport khi hàng đợi quét hết.
+"""
+import os
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from gui.instrumentation import instruments
+from .valid_extensions import VALID_EXTENSIONS
+
+BATCH_SIZE = 200  # số file tối đa mỗi lô gửi về GUI thread
+BATCH_INTERVAL = 0.1  # giây: lô chưa đủ cũng được gửi sau khoảng này
+MAX_EXAMPLES = 5  # số đường dẫn ví dụ giữ lại cho mỗi loại lỗi trong báo cáo
+
+
+class ScanReport:
+    """Kết quả gộp của các lượt quét (đến khi hàng đợi quét hết)"""
+
+    def __init__(self):
+        self.added = 0
+        self.duplicates = 0
+        self.unsupported = 0
+        self.unsupported_examples = []
+        self.errors = []  # thông báo lỗi (đường dẫn không tồn tại, không đọc được thư mục...)
+        self.error_count = 0
+
+    def add_error(self, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_EXAMPLES:
+            self.errors.append(message)
+
+    def add_unsupported(self, path):
+        self.unsupported += 1
+        if len(self.unsupported_examples) < MAX_EXAMPLES:
+            self.unsupported_examples.append(os.path.basename(path))
+
+    def has_problems(self):
+        return bool(self.unsupported or self.error_count)
+
+    def message(self):
+        lines = [f"Đã thêm {self.added} file vào danh sách."]
+        if self.duplicates:
+            lines.append(f"{self.duplicates} file đã có trong danh sách.")
+        if self.unsupported:
+            more = ", ..." if self.unsupported > len(self.unsupported_examples) else ""
+            lines.append(f"Bỏ qua {self.unsupported} file không hợp lệ (chỉ nhận {', '.join(VALID_EXTENSIONS)}): "
+                         f"{', '.join(self.unsupported_examples)}{more}")
+        if self.error_count:
+            lines.append(f"{self.error_count} lỗi:")
+            lines.extend(self.errors)
+            if self.error_count > len(self.errors):
+                lines.append("(và các lỗi khác)")
+        return "\n".join(lines)
+
+
+class ScanSignals(QObject):
+    files_found = pyqtSignal(object)  # list đường dẫn file hợp lệ (một lô)
+    done = pyqtSignal()
+
+
+class ScanWorker(QRunnable):
+    """Quét một lần thả: các đường dẫn file/thư mục"""
+
+    def __init__(self, paths, known, seen, report, cancelled):
+        super().__init__()
+        self.paths = paths
+        self.known = known  # frozenset file đã có trong danh sách lúc thả
+        self.seen = seen    # set file đã tìm thấy, dùng chung giữa các lượt quét (chỉ thread quét ghi)
+        self.report = report
+        self.cancelled = cancelled
+        self.signals = ScanSignals()
+        self._batch = []
+        self._sent = time.perf_counter()
+
+    def run(self):
+        try:
+            with instruments.stage("import.scan"):
+                for path in self.paths:
+                    if self.cancelled.is_set():
+                        break
+                    if os.path.isdir(path):
+                        self._walk(path)
+                    elif os.path.isfile(path):
+                        self._add(path)
+                    else:
+                        self.report.add_error(f"{path}: không tồn tại")
+            self._flush()
+        finally:
+            self.signals.done.emit()
+
+    def _walk(self, root):
+        stack = [root]
+        while stack and not self.cancelled.is_set():
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                self.report.add_error(f"{directory}: {e.strerror or e}")
+                continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        self._add(entry.path)
+                except OSError as e:
+                    self.report.add_error(f"{entry.path}: {e.strerror or e}")
+            stack.extend(reversed(subdirs))  # duyệt thư mục con theo thứ tự tên
+
+    def _add(self, path):
+        instruments.count("files scanned")
+        path = os.path.normpath(path)
+        if os.path.splitext(path)[1].lower() not in VALID_EXTENSIONS:
+            self.report.add_unsupported(path)
+            return
+        if path in self.known or path in self.seen:
+            self.report.duplicates += 1
+            return
+        self.seen.add(path)
+        self._batch.append(path)
+        if len(self._batch) >= BATCH_SIZE or time.perf_counter() - self._sent >= BATCH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.report.added += len(batch)
+            self.signals.files_found.emit(batch)
+        self._sent = time.perf_counter()
+
+
+class FileScanner(QObject):
+    """Hàng đợi quét các lần thả file/thư mục, một thread nền quét lần lượt"""
+
+    files_found = pyqtSignal(object)  # list đường dẫn (một lô)
+    finished = pyqtSignal(object)     # ScanReport khi mọi lần thả đã quét xong
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)  # quét lần lượt, giữ thứ tự các lần thả
+        self._pending = 0
+        self._seen = set()
+        self._report = ScanReport()
+        self._cancelled = threading.Event()
+
+    def is_running(self):
+        return self._pending > 0
+
+    def scan(self, paths, known=()):
+        """Xếp hàng quét các đường dẫn; known: các file đã có trong danh sách (bỏ qua)"""
+        if not self.is_running():
+            self._seen = set()
+            self._report = ScanReport()
+            self._cancelled = threading.Event()
+        known = frozenset(os.path.normpath(path) for path in known)
+        worker = ScanWorker(list(paths), known, self._seen, self._report, self._cancelled)
+        worker.signals.files_found.connect(self.files_found)
+        worker.signals.done.connect(self._on_done)
+        self._pending += 1
+        self.pool.start(worker)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _on_done(self):
+        self._pending -= 1
+        if not self._pending:
+            self.finished.emit(self._report)
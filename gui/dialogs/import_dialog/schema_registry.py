@@ -0,0 +1,127 @@
+"""Registry các schema của form import (config/properties/<loại file>.yaml).
+
+Mỗi file YAML được đọc một lần (dùng CSafeLoader của LibYAML nếu có), kiểm
+tra hợp lệ và biên dịch thành FormSchema; lần gọi sau chỉ stat file và dùng
+lại bản đã biên dịch nếu mtime/kích thước không đổi. File có đuôi không có
+schema riêng dùng schema DEFAULT_SCHEMA.
+"""
+import os
+from collections import namedtuple
+
+PROPERTIES_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "config", "properties"))
+DEFAULT_SCHEMA = "csv"
+WIDGET_TYPES = ("QLineEdit", "QComboBox", "QDateTimeEdit")
+
+# Một trường của form đã kiểm tra (giá trị mặc định điền sẵn)
+FieldSpec = namedtuple("FieldSpec", "name label widget_type options readonly placeholder format")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class FormSchema:
+    """Schema đã biên dịch của một file properties"""
+
+    def __init__(self, name, path, version, properties, fields):
+        self.name = name
+        self.path = path
+        self.version = version        # (mtime_ns, kích thước) của file lúc đọc
+        self.properties = properties  # dict gốc từ YAML
+        self.fields = fields          # tuple FieldSpec theo thứ tự trong file
+
+
+def compile_schema(name, properties):
+    """Kiểm tra cấu hình đọc từ YAML và trả về tuple FieldSpec"""
+    if not isinstance(properties, dict) or not properties:
+        raise SchemaError(f"{name}: cấu hình phải là danh sách trường (mapping) không rỗng")
+    fields = []
+    for field, props in properties.items():
+        if not isinstance(props, dict):
+            raise SchemaError(f"{name}.{field}: cấu hình trường phải là mapping")
+        widget_type = props.get("type", "QLineEdit")
+        if widget_type not in WIDGET_TYPES:
+            raise SchemaError(f"{name}.{field}: type '{widget_type}' không hỗ trợ ({', '.join(WIDGET_TYPES)})")
+        options = props.get("options") or []
+        if not isinstance(options, list):
+            raise SchemaError(f"{name}.{field}: options phải là danh sách")
+        if widget_type == "QComboBox" and not options:
+            raise SchemaError(f"{name}.{field}: QComboBox cần options")
+        readonly = props.get("readonly", False)
+        if not isinstance(readonly, bool):
+            raise SchemaError(f"{name}.{field}: readonly phải là true/false")
+        fields.append(FieldSpec(str(field), str(props.get("label", field)), widget_type,
+                                tuple(str(option) for option in options), readonly,
+                                props.get("placeholder"), props.get("format", "yyyy-MM-dd HH:mm:ss")))
+    return tuple(fields)
+
+
+class SchemaRegistry:
+    def __init__(self, directory=PROPERTIES_DIR):
+        self.directory = directory
+        self._schemas = {}  # tên -> FormSchema
+
+    def names(self):
+        """Tên các schema có trong thư mục (tên file bỏ đuôi .yaml)"""
+        try:
+            return sorted(entry.name[:-5] for entry in os.scandir(self.directory)
+                          if entry.is_file() and entry.name.endswith(".yaml"))
+        except OSError:
+            return []
+
+    def load_all(self):
+        """Đọc và kiểm tra mọi schema trong thư mục.
+
+        Trả về (dict tên -> FormSchema, list SchemaError của các file lỗi): một
+        file lỗi không làm hỏng các schema khác.
+        """
+        schemas, errors = {}, []
+        for name in self.names():
+            try:
+                schemas[name] = self.get(name)
+            except SchemaError as e:
+                errors.append(e)
+        return schemas, errors
+
+    def get(self, name):
+        """FormSchema theo tên, đọc lại file chỉ khi file đã thay đổi"""
+        path = os.path.join(self.directory, f"{name}.yaml")
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            self._schemas.pop(name, None)
+            raise SchemaError(f"Lỗi đọc cấu hình: {e}") from e
+        version = (stat.st_mtime_ns, stat.st_size)
+        schema = self._schemas.get(name)
+        if schema is None or schema.version != version:
+            properties = self._parse(path)
+            schema = self._schemas[name] = FormSchema(name, path, version, properties,
+                                                      compile_schema(name, properties))
+        return schema
+
+    def for_path(self, file_path):
+        """FormSchema cho file import theo đuôi file (không có thì dùng DEFAULT_SCHEMA)"""
+        name = os.path.splitext(file_path)[1].lower().lstrip(".")
+        if not name or not os.path.isfile(os.path.join(self.directory, f"{name}.yaml")):
+            name = DEFAULT_SCHEMA
+        return self.get(name)
+
+    def _parse(self, path):
+        import yaml  # PyYAML chỉ cần khi mở form import lần đầu
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return yaml.load(f, Loader=loader)
+        except (OSError, yaml.YAMLError) as e:
+            raise SchemaError(f"Lỗi đọc cấu hình {os.path.basename(path)}: {e}") from e
+
+
+_registries = {}
+
+
+def schema_registry(directory=PROPERTIES_DIR):
+    """SchemaRegistry dùng chung cho một thư mục properties"""
+    registry = _registries.get(directory)
+    if registry is None:
+        registry = _registries[directory] = SchemaRegistry(directory)
+    return registry
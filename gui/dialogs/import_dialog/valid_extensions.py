@@ -1,2 +1,2 @@
 # Khai báo danh sách các đuôi file hợp lệ tại Import Tab
-VALID_EXTENSIONS = ['.csv', '.txt', '.json']
\ No newline at end of file
+VALID_EXTENSIONS = ['.csv', '.txt', '.json', '.las']
\ No newline at end of file
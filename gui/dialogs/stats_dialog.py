@@ -0,0 +1,75 @@
+# stats_dialog.py
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel
+from PyQt5.QtCore import QTimer
+from gui.column_store import format_number
+
+STAGE_HEADERS = ["Stage", "Calls", "Total ms", "Mean ms", "Max ms", "Last ms"]
+
+
+class StatsDialog(QDialog):
+    """Bảng số liệu đo (gui.instrumentation) cập nhật liên tục, không chặn cửa sổ chính"""
+
+    def __init__(self, parent, instruments, interval_ms=500):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setGeometry(150, 150, 560, 480)
+        self.instruments = instruments
+
+        self.status_label = QLabel()
+        self.stage_table = QTableWidget(0, len(STAGE_HEADERS))
+        self.stage_table.setHorizontalHeaderLabels(STAGE_HEADERS)
+        self.counter_table = QTableWidget(0, 2)
+        self.counter_table.setHorizontalHeaderLabels(["Counter", "Value"])
+        for table in (self.stage_table, self.counter_table):
+            table.verticalHeader().hide()
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.status_label)
+        buttons.addStretch()
+        buttons.addWidget(self.reset_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.stage_table, 3)
+        layout.addWidget(self.counter_table, 2)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        self.instruments.reset()
+        self.refresh()
+
+    def refresh(self):
+        stages, counters = self.instruments.snapshot()
+        status = "đang bật" if self.instruments.enabled else "đang tắt"
+        self.status_label.setText(f"Đo: {status}" + (" (đang capture)" if self.instruments.capturing else ""))
+        rows = [[name, str(calls), f"{total * 1000:.1f}", f"{total * 1000 / calls:.2f}",
+                 f"{peak * 1000:.2f}", f"{last * 1000:.2f}"]
+                for name, (calls, total, peak, last) in sorted(stages.items())]
+        _fill(self.stage_table, rows)
+        _fill(self.counter_table, [[name, format_number(float(value))] for name, value in sorted(counters.items())])
+
+
+def _fill(table, rows):
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for col, value in enumerate(values):
+            item = table.item(row, col)
+            if item is None:
+                table.setItem(row, col, QTableWidgetItem(value))
+            elif item.text() != value:
+                item.setText(value)
@@ -0,0 +1,188 @@
+import csv
+import io
+import os
+import queue
+import threading
+import zlib
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from .column_store import ColumnStore
+from .instrumentation import instruments
+from .schema import NUMBER, CATEGORY
+
+# Bộ lọc của QFileDialog -> định dạng xuất
+EXPORT_FORMATS = {
+    "CSV Files (*.csv)": "csv",
+    "Gzip CSV Files (*.csv.gz)": "csv.gz",
+    "Parquet Files (*.parquet)": "parquet",
+    "Arrow IPC Files (*.arrow)": "arrow",
+}
+EXTENSIONS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def format_for_path(path, default="csv"):
+    """Đoán định dạng xuất từ đuôi file"""
+    path = path.lower()
+    for fmt, ext in sorted(EXTENSIONS.items(), key=lambda item: -len(item[1])):
+        if path.endswith(ext):
+            return fmt
+    return default
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(int, int)        # số dòng đã ghi, tổng số dòng
+    finished = pyqtSignal(str, int, int)   # đường dẫn, số dòng, số byte đã ghi
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ExportWorker(QRunnable):
+    """Xuất dữ liệu đã lọc trực tiếp từ ColumnStore theo từng chunk lớn trên thread nền"""
+
+    def __init__(self, store, row_ids, columns, path, fmt, chunk_rows=50000):
+        super().__init__()
+        self.store = store
+        self.row_ids = row_ids[:]  # bản chụp: bảng có thể lọc lại trong lúc xuất
+        self.col_indexes = [store.column_index(col) for col in columns]
+        self.columns = list(columns)
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.signals = ExportSignals()
+        self._cancelled = threading.Event()
+        self.bytes_written = 0
+        self._write_error = None
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            with instruments.stage(f"export.{self.fmt}"):
+                if self.fmt in ("parquet", "arrow"):
+                    self._write_arrow()
+                else:
+                    self._write_csv(compress=self.fmt == "csv.gz")
+            instruments.count("rows exported", len(self.row_ids))
+            instruments.count("bytes written", self.bytes_written)
+        except ExportCancelled:
+            self._remove_partial_file()
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self._remove_partial_file()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.path, len(self.row_ids), self.bytes_written)
+
+    def _remove_partial_file(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _chunks(self):
+        total = len(self.row_ids)
+        for start in range(0, total, self.chunk_rows):
+            if self._cancelled.is_set():
+                raise ExportCancelled()
+            yield self.row_ids[start:start + self.chunk_rows]
+            self.signals.progress.emit(min(start + self.chunk_rows, total), total)
+
+    def _write_csv(self, compress):
+        # Thread ghi riêng: nén zlib và ghi file nhả GIL nên chạy song song với việc định dạng chunk
+        chunks = queue.Queue(maxsize=4)
+        writer_thread = threading.Thread(target=self._file_writer, args=(chunks, compress), daemon=True)
+        writer_thread.start()
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(self.columns)
+            display_column = self.store.display_column
+            cols = self.col_indexes
+            for chunk in self._chunks():
+                writer.writerows(zip(*(display_column(col, chunk) for col in cols)))
+                chunks.put(buffer.getvalue().encode("utf-8"))
+                buffer.seek(0)
+                buffer.truncate()
+                if self._write_error:
+                    break
+            chunks.put(buffer.getvalue().encode("utf-8"))
+        finally:
+            chunks.put(None)
+            writer_thread.join()
+        if self._write_error:
+            raise self._write_error
+
+    def _file_writer(self, chunks, compress):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits=31: định dạng gzip
+        try:
+            with open(self.path, "wb", buffering=1 << 20) as f:
+                while True:
+                    data = chunks.get()
+                    if data is None:
+                        break
+                    if compressor is not None:
+                        data = compressor.compress(data)
+                    f.write(data)
+                    self.bytes_written += len(data)
+                if compressor is not None:
+                    tail = compressor.flush()
+                    f.write(tail)
+                    self.bytes_written += len(tail)
+        except Exception as e:
+            self._write_error = e
+            # Tiếp tục lấy dữ liệu để thread định dạng không bị chặn ở queue
+            while chunks.get() is not None:
+                pass
+
+    def _write_arrow(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Cần cài đặt pyarrow để xuất Parquet/Arrow")
+
+        specs = [self.store.schema[col] for col in self.col_indexes]
+        schema = pa.schema([
+            pa.field(spec.name, pa.float64() if spec.kind == NUMBER
+                     else pa.dictionary(pa.int32(), pa.string()) if spec.kind == CATEGORY
+                     else pa.string())
+            for spec in specs
+        ])
+        if self.fmt == "parquet":
+            writer = pq.ParquetWriter(self.path, schema)
+        else:
+            sink = pa.OSFile(self.path, "wb")
+            writer = pa.ipc.new_file(sink, schema)
+        try:
+            for chunk in self._chunks():
+                ids = np.array(chunk, dtype=np.int64)
+                arrays = [self._arrow_column(pa, col, spec, ids) for col, spec in zip(self.col_indexes, specs)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        finally:
+            writer.close()
+            if self.fmt != "parquet":
+                sink.close()
+        self.bytes_written = os.path.getsize(self.path)
+
+    def _arrow_column(self, pa, col, spec, ids):
+        store = self.store
+        if not isinstance(store, ColumnStore):
+            # Store không có buffer cột (engine SQLite): đọc giá trị theo lô id
+            if spec.kind == NUMBER:
+                values = np.array(store.number_column(col, ids.tolist()), dtype=np.float64)
+                return pa.array(values, mask=np.isnan(values))
+            strings = pa.array(store.display_column(col, ids.tolist()), pa.string())
+            return strings.dictionary_encode() if spec.kind == CATEGORY else strings
+        with store.lock:  # view NumPy trên buffer cột chỉ tồn tại khi giữ lock
+            if spec.kind == NUMBER:
+                values = np.frombuffer(store.values(col), dtype=np.float64)[ids]
+                return pa.array(values, mask=np.isnan(values))
+            if spec.kind == CATEGORY:
+                codes = np.frombuffer(store.values(col), dtype=np.uint32)[ids].astype(np.int32)
+                return pa.DictionaryArray.from_arrays(codes, pa.array(store.categories(col), pa.string()))
+        return pa.array(store.display_column(col, ids.tolist()), pa.string())
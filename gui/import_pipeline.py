@@ -0,0 +1,185 @@
+"""Pipeline import nhiều file cho tab Import.
+
+Mỗi file được đọc bằng loader theo đuôi file, kiểm tra theo schema cột của
+loại dữ liệu (cột số phải đọc được thành số) rồi mới đưa vào dữ liệu (một
+file lỗi thì không import dòng nào của file đó).
+Việc parse chạy trên các process của gui.parse_pool (mỗi file một process,
+kết quả về qua shared memory dạng ColumnBatch); các thread của QThreadPool
+riêng chỉ chờ kết quả. Với OSDU_PARSE_PROCESSES=0 file được parse ngay trên
+thread; các process được dừng khi pipeline rảnh IDLE_SHUTDOWN_MS hoặc khi đóng
+app. Số file đang xử lý được giới hạn để các bản ghi chờ đưa vào store
+không chiếm quá nhiều bộ nhớ khi thả cả thư mục hàng trăm file.
+"""
+import os
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .instrumentation import instruments
+from .parse_pool import ImportCancelled, ParsePool, RecordValidator, default_processes, parse_file
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+MAX_IN_FLIGHT = 2 * MAX_WORKERS  # số file đã đọc/đang đọc chưa được đưa vào store
+IDLE_SHUTDOWN_MS = 60_000  # dừng các process parse sau khoảng rảnh này (tạo lại khi import tiếp)
+
+
+class ImportFileSignals(QObject):
+    started = pyqtSignal(str)                # đường dẫn
+    progress = pyqtSignal(str, int)          # đường dẫn, số bản ghi đã đọc
+    finished = pyqtSignal(str, str, object)  # đường dẫn, loại dữ liệu, ColumnBatch đã kiểm tra
+    failed = pyqtSignal(str, str)            # đường dẫn, thông báo lỗi
+
+
+class ImportFileWorker(QRunnable):
+    """Đọc và kiểm tra một file import trên thread nền (hoặc chờ process của parse_pool)"""
+
+    def __init__(self, path, data_type, columns, validator, cancelled, curve_store=None, parse_pool=None):
+        super().__init__()
+        self.path = path
+        self.data_type = data_type
+        self.columns = columns
+        self.validator = validator
+        self.cancelled = cancelled  # threading.Event dùng chung của cả lượt import
+        self.curve_store = curve_store  # gui.curve_store.CurveStore nhận đường cong của file LAS
+        self.parse_pool = parse_pool    # gui.parse_pool.ParsePool, None: parse trên thread này
+        self.signals = ImportFileSignals()
+
+    def run(self):
+        try:
+            if self.cancelled.is_set():
+                raise ImportCancelled()
+            self.signals.started.emit(self.path)
+            with instruments.stage("import.read"):
+                rows = self._read()
+            instruments.count("import rows read", len(rows))
+        except ImportCancelled:
+            self.signals.failed.emit(self.path, "Đã hủy")
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e) or type(e).__name__)
+        else:
+            self.signals.finished.emit(self.path, self.data_type, rows)
+
+    def _read(self):
+        if self.parse_pool is not None:
+            curve_dir = self.curve_store.directory if self.curve_store is not None else None
+            future = self.parse_pool.submit(self.path, self.columns, self.validator, curve_dir)
+            return self.parse_pool.result(future, self.cancelled)
+        return parse_file(self.path, self.columns, self.validator, self.curve_store, self.cancelled,
+                          lambda rows: self.signals.progress.emit(self.path, rows))
+
+
+class ImportPipeline(QObject):
+    """Điều phối import một danh sách file: giới hạn số thread và số file đang xử lý,
+    báo trạng thái từng file và chuyển bản ghi hợp lệ qua records_ready (trên GUI thread)."""
+
+    file_started = pyqtSignal(str)
+    file_progress = pyqtSignal(str, int)
+    file_imported = pyqtSignal(str, str, int)  # đường dẫn, loại dữ liệu, số bản ghi
+    file_failed = pyqtSignal(str, str)
+    records_ready = pyqtSignal(str, object)    # loại dữ liệu, ColumnBatch
+    finished = pyqtSignal(int, int, int)       # số file thành công, số file lỗi, tổng số bản ghi
+
+    def __init__(self, columns_by_type, parent=None, max_workers=MAX_WORKERS, curve_store=None, processes=None):
+        super().__init__(parent)
+        self.columns_by_type = columns_by_type
+        self.curve_store = curve_store
+        processes = default_processes() if processes is None else processes
+        self.parse_pool = ParsePool(processes) if processes else None
+        if self.parse_pool is not None:
+            max_workers = processes  # mỗi thread chỉ chờ một process
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.max_in_flight = max(max_workers, MAX_IN_FLIGHT)
+        self._queue = deque()
+        self._workers = {}  # đường dẫn -> ImportFileWorker đang chạy
+        self._validators = {}
+        self._cancelled = threading.Event()
+        self._stats = [0, 0, 0]
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(IDLE_SHUTDOWN_MS)
+        self._idle_timer.timeout.connect(self._shutdown_parse_pool)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def is_running(self):
+        return bool(self._queue or self._workers)
+
+    def submit(self, jobs):
+        """Thêm các file cần import: list (đường dẫn, loại dữ liệu)"""
+        self._idle_timer.stop()
+        if not self.is_running():
+            self._cancelled = threading.Event()
+            self._validators = {}
+            self._stats = [0, 0, 0]
+        for path, data_type in jobs:
+            if path in self._workers or any(path == queued for queued, _ in self._queue):
+                continue
+            self._queue.append((path, data_type))
+        self._start_next()
+
+    def cancel(self):
+        """Hủy các file đang chờ và dừng các file đang đọc"""
+        self._cancelled.set()
+        while self._queue:
+            path, _ = self._queue.popleft()
+            self._on_failed(path, "Đã hủy", start_next=False)
+        self._finish_if_done()
+
+    def _start_next(self):
+        while self._queue and len(self._workers) < self.max_in_flight:
+            path, data_type = self._queue.popleft()
+            columns = self.columns_by_type.get(data_type) if data_type else None
+            if not columns:
+                reason = (f"Chưa chọn Type Data (file {os.path.splitext(path)[1] or 'này'} không có loại mặc định)"
+                          if not data_type else f"Loại dữ liệu {data_type} chưa được hỗ trợ")
+                self._on_failed(path, reason, start_next=False)
+                continue
+            validator = self._validators.get(data_type)
+            if validator is None:
+                validator = self._validators[data_type] = RecordValidator(data_type, columns)
+            worker = ImportFileWorker(path, data_type, columns, validator, self._cancelled,
+                                      self.curve_store, self.parse_pool)
+            worker.signals.started.connect(self.file_started)
+            worker.signals.progress.connect(self.file_progress)
+            worker.signals.finished.connect(self._on_finished)
+            worker.signals.failed.connect(self._on_failed)
+            self._workers[path] = worker
+            self.pool.start(worker)
+        self._finish_if_done()
+
+    def _on_finished(self, path, data_type, rows):
+        self._workers.pop(path, None)
+        if self._cancelled.is_set():
+            self._on_failed(path, "Đã hủy")
+            return
+        self._stats[0] += 1
+        self._stats[2] += len(rows)
+        self.records_ready.emit(data_type, rows)
+        self.file_imported.emit(path, data_type, len(rows))
+        self._start_next()
+
+    def _on_failed(self, path, message, start_next=True):
+        self._workers.pop(path, None)
+        self._stats[1] += 1
+        self.file_failed.emit(path, message)
+        if start_next:
+            self._start_next()
+
+    def shutdown(self):
+        """Hủy import đang chạy và dừng các process parse (khi đóng app)"""
+        self.cancel()
+        self._shutdown_parse_pool()
+
+    def _shutdown_parse_pool(self):
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+
+    def _finish_if_done(self):
+        if not self.is_running() and self.parse_pool is not None:
+            self._idle_timer.start()
+        if not self.is_running() and any(self._stats):
+            stats, self._stats = self._stats, [0, 0, 0]
+            self.finished.emit(*stats)
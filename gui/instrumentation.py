@@ -0,0 +1,139 @@
+"""Đo thời gian và đếm số liệu của các bước chính (tùy chọn, mặc định tắt).
+
+Bật bằng biến môi trường OSDU_PROFILE=1 hoặc menu Menu > Diagnostics (menu
+ẩn, hiện khi đặt OSDU_PROFILE hoặc bấm Ctrl+Shift+D). Khi tắt, stage() trả
+về context rỗng và count() không làm gì nên gần như không tốn chi phí.
+
+    with instruments.stage("filter.rows"):
+        ...
+    instruments.count("rows scanned", n)
+
+Mỗi stage lưu số lần gọi, tổng/lớn nhất/lần cuối (giây); counter là tổng cộng
+dồn. Trong lúc capture, mọi stage và counter (kể cả trên thread nền) được ghi
+thành sự kiện Chrome trace (mở bằng chrome://tracing hoặc Perfetto) và GUI
+thread được chạy dưới cProfile.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+
+
+class Instrumentation:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stages = {}    # tên -> [số lần, tổng, lớn nhất, lần cuối] (giây)
+        self.counters = {}  # tên -> giá trị cộng dồn
+        self._origin = time.perf_counter()
+        self._trace = None  # sự kiện Chrome trace khi đang capture
+        self._threads = {}  # id thread -> tên (metadata của trace)
+        self._profile = None
+
+    @property
+    def capturing(self):
+        return self._trace is not None
+
+    def stage(self, name):
+        """Context đo thời gian của một bước"""
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def count(self, name, value=1):
+        """Cộng value vào counter name"""
+        if not self.enabled:
+            return
+        with self.lock:
+            total = self.counters[name] = self.counters.get(name, 0) + value
+            if self._trace is not None:
+                self._trace.append({"name": name, "ph": "C", "ts": self._micros(time.perf_counter()),
+                                    "pid": os.getpid(), "tid": self._thread_id(), "args": {name: total}})
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.counters = {}
+
+    def snapshot(self):
+        """(bản sao stages, bản sao counters) để hiển thị"""
+        with self.lock:
+            return {name: list(values) for name, values in self.stages.items()}, dict(self.counters)
+
+    def start_capture(self):
+        """Bắt đầu ghi trace và chạy cProfile trên thread hiện tại (GUI thread)"""
+        if self.capturing:
+            return
+        self.enabled = True
+        with self.lock:
+            self._trace = []
+            self._threads = {}
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop_capture(self, path):
+        """Dừng capture, ghi Chrome trace ra path (.json) và cProfile ra cùng tên đuôi .prof.
+
+        Trả về danh sách file đã ghi.
+        """
+        if not self.capturing:
+            return []
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        with self.lock:
+            events, self._trace = self._trace, None
+            threads = self._threads
+        pid = os.getpid()
+        metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                    for tid, name in threads.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        profile_path = os.path.splitext(path)[0] + ".prof"
+        profile.dump_stats(profile_path)
+        return [path, profile_path]
+
+    def _record(self, name, start, stop):
+        elapsed = stop - start
+        with self.lock:
+            values = self.stages.get(name)
+            if values is None:
+                self.stages[name] = [1, elapsed, elapsed, elapsed]
+            else:
+                values[0] += 1
+                values[1] += elapsed
+                values[2] = max(values[2], elapsed)
+                values[3] = elapsed
+            if self._trace is not None:
+                self._trace.append({"name": name, "ph": "X", "ts": self._micros(start), "dur": elapsed * 1e6,
+                                    "pid": os.getpid(), "tid": self._thread_id()})
+
+    def _thread_id(self):
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        return thread.ident
+
+    def _micros(self, moment):
+        return (moment - self._origin) * 1e6
+
+
+class _Stage:
+    __slots__ = ("owner", "name", "start")
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.owner._record(self.name, self.start, time.perf_counter())
+        return False
+
+
+instruments = Instrumentation(enabled=os.environ.get("OSDU_PROFILE", "") not in ("", "0"))
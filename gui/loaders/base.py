@@ -0,0 +1,81 @@
+import zlib
+from itertools import islice
+
+DEFAULT_BATCH_SIZE = 5000
+FIRST_BATCH_SIZE = 500  # batch đầu nhỏ để trang đầu hiện ra ngay
+
+
+def batched(records, size, first_size=None):
+    """Chia một iterable bản ghi thành các list có kích thước cố định"""
+    records = iter(records)
+    size_now = first_size or size
+    while True:
+        batch = list(islice(records, size_now))
+        if not batch:
+            return
+        yield batch
+        size_now = size
+
+
+def pad_rows(rows, width):
+    """Thêm ô trống vào cuối các dòng thiếu cột (cột tính toán như TVD không có trong dữ liệu nguồn)"""
+    if all(len(row) >= width for row in rows):
+        return rows
+    return [row if len(row) >= width else list(row) + [""] * (width - len(row)) for row in rows]
+
+
+class BatchLoader:
+    """Giao thức chung cho các nguồn dữ liệu.
+
+    Loader sinh dữ liệu theo từng batch (list các dòng, mỗi dòng là list
+    giá trị theo thứ tự cột của loại dữ liệu), không giữ toàn bộ trong RAM.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, first_batch_size=FIRST_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.first_batch_size = first_batch_size
+
+    def iter_batches(self):
+        """Generator sinh các batch bản ghi"""
+        raise NotImplementedError
+
+    def estimated_total(self):
+        """Tổng số bản ghi nếu biết trước, -1 nếu không"""
+        return -1
+
+    def source_version(self):
+        """Chuỗi định danh nguồn + phiên bản dữ liệu, đổi khi dữ liệu nguồn thay đổi.
+
+        Dùng làm khóa cache trên đĩa; None nếu không xác định được (không cache).
+        """
+        return None
+
+    async def aiter_batches(self):
+        """Phiên bản async iterator của iter_batches (chạy generator trên executor)"""
+        import asyncio  # chỉ cần khi dùng async, không import lúc khởi động app
+        loop = asyncio.get_running_loop()
+        batches = self.iter_batches()
+        while True:
+            batch = await loop.run_in_executor(None, next, batches, None)
+            if batch is None:
+                return
+            yield batch
+
+
+class FunctionLoader(BatchLoader):
+    """Bọc một hàm DataLoader.load_* (trả về list hoặc generator các dòng)"""
+
+    def __init__(self, load_func, **kwargs):
+        super().__init__(**kwargs)
+        self.load_func = load_func
+
+    def iter_batches(self):
+        return batched(self.load_func(), self.batch_size, self.first_batch_size)
+
+    def source_version(self):
+        # Dữ liệu sinh từ code: phiên bản đổi khi code của hàm load thay đổi
+        code = getattr(self.load_func, "__code__", None)
+        if code is None:
+            return None
+        digest = zlib.crc32(code.co_code + repr(code.co_consts).encode("utf-8"))
+        return f"{self.load_func.__module__}.{self.load_func.__qualname__}:{digest:08x}"
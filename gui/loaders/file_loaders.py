@@ -0,0 +1,102 @@
+import csv
+import json
+import os
+from .base import BatchLoader, batched
+from .las_reader import LasFile
+
+
+def _normalize(name):
+    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+def _column_mapper(columns, source_fields):
+    """Map các trường của file nguồn sang thứ tự cột (so khớp không phân biệt hoa thường)"""
+    positions = {_normalize(field): i for i, field in enumerate(source_fields)}
+    return [positions.get(_normalize(col)) for col in columns]
+
+
+class CsvLoader(BatchLoader):
+    """Đọc file CSV có dòng tiêu đề, cột được map theo tên"""
+
+    def __init__(self, path, columns, encoding="utf-8", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.columns = columns
+        self.encoding = encoding
+
+    def iter_batches(self):
+        with open(self.path, newline="", encoding=self.encoding) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            mapping = _column_mapper(self.columns, header)
+            rows = (
+                [row[i] if i is not None and i < len(row) else "" for i in mapping]
+                for row in reader if row
+            )
+            yield from batched(rows, self.batch_size, self.first_batch_size)
+
+
+class JsonLoader(BatchLoader):
+    """Đọc file JSON (mảng object/mảng giá trị) hoặc JSON Lines (.jsonl, đọc dạng stream)"""
+
+    def __init__(self, path, columns, encoding="utf-8", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.columns = columns
+        self.encoding = encoding
+
+    def iter_batches(self):
+        with open(self.path, encoding=self.encoding) as f:
+            if self.path.lower().endswith(".jsonl"):
+                records = (json.loads(line) for line in f if line.strip())
+            else:
+                data = json.load(f)
+                records = data.get("results", data.get("records", [])) if isinstance(data, dict) else data
+            yield from batched(self._to_rows(records), self.batch_size, self.first_batch_size)
+
+    def _to_rows(self, records):
+        lookup = None
+        for record in records:
+            if isinstance(record, dict):
+                record = record.get("data", record)
+                if lookup is None:
+                    lookup = {_normalize(key): key for key in record}
+                yield [str(record.get(lookup.get(_normalize(col)), "")) for col in self.columns]
+            else:
+                yield [str(value) for value in record][:len(self.columns)]
+
+
+class LasLoader(BatchLoader):
+    """Mỗi file LAS tạo một dòng WellLog từ phần header ~Well/~Parameter (không đọc ~A)"""
+
+    FIELD_MAP = {
+        "WellBore Name": "WELL",
+        "Start Depth": "STRT",
+        "Stop Depth": "STOP",
+        "Log Run": "RUN",
+        "Date": "DATE",
+        "Logging Service": "SRVC",
+    }
+
+    def __init__(self, paths, columns, **kwargs):
+        super().__init__(**kwargs)
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.columns = columns
+
+    def estimated_total(self):
+        return len(self.paths)
+
+    def iter_batches(self):
+        return batched((self.header_row(path) for path in self.paths), self.batch_size, self.first_batch_size)
+
+    def header_row(self, path):
+        las = LasFile(path)
+        row = []
+        for col in self.columns:
+            if col == "File Name":
+                row.append(os.path.basename(path))
+            else:
+                row.append(las.value(self.FIELD_MAP.get(col, "")) if col in self.FIELD_MAP else "")
+        return row
@@ -0,0 +1,289 @@
+"""Đọc file LAS 2.0/3.0.
+
+LasFile chỉ đọc phần header (~Version, ~Well, ~Parameter, ~Curve) khi mở và
+dừng ngay ở đầu section dữ liệu, nên lấy metadata của hàng trăm file rất
+nhanh. Dữ liệu đường cong chỉ được đọc khi gọi data()/curve(): file được
+memory-map và phần ~A được chuyển thành mảng NumPy theo từng chunk.
+
+Dữ liệu LAS thường được ghi theo cột cố định (mọi dòng cùng độ dài, dấu
+chấm thập phân cùng vị trí), nên mỗi chunk được thử giải mã trực tiếp trên
+mảng byte: chữ số của mỗi ô được nhân với trọng số theo vị trí cột (một phép
+nhân ma trận), phần nguyên và phần lẻ tách làm hai để mọi tổng đều là số
+nguyên chính xác, kết quả chia cho 10^số chữ số lẻ nên làm tròn giống hệt
+float(). Chunk không đúng dạng đó (wrap, số mũ, dấu phân cách khác...) được
+đọc bằng np.fromstring, cuối cùng là đọc từng dòng.
+"""
+import mmap
+import os
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+LasParameter = namedtuple("LasParameter", ["mnemonic", "unit", "value", "description"])
+
+DATA_CHUNK_SIZE = 1 << 20
+DEFAULT_NULL = -999.25
+MAX_FIELD_WIDTH = 15  # tối đa 14 chữ số: phần nguyên/phần lẻ mỗi phần < 2^24, tổng < 2^53
+DIGIT_SPLIT = 7
+
+# Tên section LAS 3.0 -> khóa ngắn kiểu LAS 2.0
+SECTION_KEYS = {
+    "VERSION": "V", "WELL": "W", "PARAMETER": "P", "LOG_PARAMETER": "P",
+    "CURVE": "C", "LOG_DEFINITION": "C", "ASCII": "A", "LOG_DATA": "A", "OTHER": "O",
+}
+DELIMITERS = {"COMMA": ",", "TAB": "\t"}
+
+
+class LasFile:
+    """Một file LAS: header đọc khi khởi tạo, dữ liệu ~A chỉ đọc khi cần (và được cache)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = {}  # khóa section ('V', 'W', 'P', 'C'...) -> {mnemonic: LasParameter}
+        self.curves = []    # LasParameter của các đường cong theo thứ tự cột trong ~A
+        self.data_offset = None  # vị trí byte của dòng dữ liệu đầu tiên (None nếu không có ~A)
+        self._data = None
+        self._read_header()
+
+    @property
+    def version(self):
+        return self._param("V", "VERS")
+
+    @property
+    def wrap(self):
+        return self._param("V", "WRAP").upper() == "YES"
+
+    @property
+    def delimiter(self):
+        return DELIMITERS.get(self._param("V", "DLM").upper(), " ")
+
+    @property
+    def well(self):
+        return self.sections.get("W", {})
+
+    @property
+    def null_value(self):
+        try:
+            return float(self._param("W", "NULL"))
+        except ValueError:
+            return DEFAULT_NULL
+
+    @property
+    def curve_names(self):
+        return [curve.mnemonic for curve in self.curves]
+
+    def value(self, mnemonic, default=""):
+        """Giá trị một tham số header, tìm trong ~Well rồi ~Parameter (RUN thường nằm ở ~P)"""
+        for key in ("W", "P"):
+            param = self.sections.get(key, {}).get(mnemonic.upper())
+            if param is not None and param.value:
+                return param.value
+        return default
+
+    def _param(self, section, mnemonic):
+        param = self.sections.get(section, {}).get(mnemonic)
+        return param.value if param is not None else ""
+
+    def _read_header(self):
+        section = None
+        offset = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                offset += len(raw)
+                line = raw.decode("ascii", errors="replace").strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("~"):
+                    section = _section_key(line)
+                    if section == "A":
+                        self.data_offset = offset
+                        break
+                    self.sections.setdefault(section, {})
+                    continue
+                if section is None or "." not in line:
+                    continue
+                param = LasParameter(*parse_las_line(line, description=True))
+                self.sections[section][param.mnemonic] = param
+                if section == "C":
+                    self.curves.append(param)
+
+    def data(self):
+        """Mảng (số dòng, số đường cong) của section ~A, giá trị NULL thành NaN"""
+        if self._data is None:
+            self._data = self._read_data()
+        return self._data
+
+    def curve(self, mnemonic):
+        """Một đường cong theo mnemonic (view trên data())"""
+        return self.data()[:, self.curve_names.index(mnemonic.upper())]
+
+    def _read_data(self):
+        ncurves = len(self.curves)
+        if self.data_offset is None or ncurves == 0 or os.path.getsize(self.path) <= self.data_offset:
+            return np.empty((0, ncurves))
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            if self.version.startswith("3"):
+                # LAS 3.0 có thể có section khác sau ~Log_Data; LAS 2.0 luôn kết thúc bằng ~A
+                end = mm.find(b"\n~", self.data_offset - 1)
+                end = len(mm) if end < 0 else end + 1
+            if self.wrap:
+                values = _parse_tokens(mm[self.data_offset:end], self.delimiter, ncurves).reshape(-1, ncurves)
+                values[values == self.null_value] = np.nan
+                return values
+            # Cấp phát trước theo độ dài dòng đầu để không phải nối các chunk (gấp đôi bộ nhớ)
+            first_line = mm.find(b"\n", self.data_offset, end) + 1 - self.data_offset
+            values = np.empty(((end - self.data_offset) // max(first_line, 1) + 1, ncurves))
+            rows = 0
+            for start, stop in _chunks(mm, self.data_offset, end):
+                block = _parse_block(mm, start, stop, ncurves, self.delimiter)
+                block[block == self.null_value] = np.nan
+                if rows + len(block) > len(values):
+                    grown = np.empty((max(2 * len(values), rows + len(block)), ncurves))
+                    grown[:rows] = values[:rows]
+                    values = grown
+                values[rows:rows + len(block)] = block
+                rows += len(block)
+        return values[:rows] if rows > 0.9 * len(values) else values[:rows].copy()
+
+
+def _section_key(line):
+    name = line[1:].split("|")[0].strip().upper()
+    if name in SECTION_KEYS:
+        return SECTION_KEYS[name]
+    # Section riêng của LAS 3.0 (~Core_Data...) giữ nguyên tên, LAS 2.0 dùng chữ cái đầu
+    return name if "_" in name else name[:1]
+
+
+def _chunks(mm, start, end, size=DATA_CHUNK_SIZE):
+    """Các đoạn [start, stop) khoảng size byte, cắt tại cuối dòng"""
+    while start < end:
+        stop = mm.find(b"\n", min(start + size, end - 1), end)
+        stop = end if stop < 0 else stop + 1
+        yield start, stop
+        start = stop
+
+
+def _parse_block(mm, start, stop, ncurves, delimiter):
+    values = None
+    if delimiter == " ":
+        values = _parse_fixed_width(np.frombuffer(mm, dtype=np.uint8, count=stop - start, offset=start), ncurves)
+    if values is None:
+        values = _parse_tokens(mm[start:stop], delimiter, ncurves).reshape(-1, ncurves)
+    return values
+
+
+def _parse_fixed_width(buf, ncurves):
+    """Giải mã một đoạn dữ liệu cột cố định; None nếu đoạn không đúng dạng này"""
+    width = int(np.argmax(buf == 10)) + 1
+    if width < 2 or len(buf) % width or not (buf[width - 1::width] == 10).all() or buf.max() > 57:
+        return None
+    rows = len(buf) // width
+    grid = buf.reshape(rows, width)
+
+    # Các ô là những đoạn cột không trống ở ít nhất một dòng
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], (grid > 32).any(axis=0), [0])).astype(np.int8)))
+    starts, stops = edges[0::2], edges[1::2]
+    if len(starts) != ncurves:
+        return None
+
+    # Trọng số từng cột theo vị trí dấu chấm của dòng đầu; cột k: phần nguyên, cột ncurves + k: phần lẻ
+    weights = np.zeros((width, 2 * ncurves), dtype=np.float32)
+    scale = np.ones(ncurves)
+    points = []
+    leading = []
+    for k, (start, stop) in enumerate(zip(starts, stops)):
+        dots = np.flatnonzero(grid[0, start:stop] == 46)
+        if len(dots) > 1 or stop - start > MAX_FIELD_WIDTH:
+            return None
+        point = start + dots[0] if len(dots) else stop
+        frac = stop - point - 1 if len(dots) else 0
+        if len(dots):
+            points.append(point)
+        for col in range(start, stop):
+            if col != point:
+                power = point - col - 1 + frac if col < point else frac - (col - point)
+                if power < DIGIT_SPLIT:
+                    weights[col, ncurves + k] = 10.0 ** power
+                else:
+                    weights[col, k] = 10.0 ** (power - DIGIT_SPLIT)
+        scale[k] = 10.0 ** frac
+        leading.append(point - 1)
+
+    # Mọi dòng: dấu chấm cùng vị trí, có chữ số ngay trước dấu chấm, ngoài chữ số chỉ có khoảng trắng và dấu
+    dots = np.count_nonzero(buf == 46)
+    minus = np.count_nonzero(buf == 45)
+    if dots != rows * len(points) or (points and not (grid[:, points] == 46).all()):
+        return None
+    if np.count_nonzero((buf - np.uint8(33)) < 15) != dots + minus + np.count_nonzero(buf == 43):
+        return None
+    if not (grid[:, leading] - np.uint8(48) < 10).all():
+        return None
+
+    digits = grid - np.uint8(48)
+    digits *= digits < 10
+    parts = digits.astype(np.float32) @ weights
+    values = parts[:, :ncurves].astype(np.float64)
+    values *= 10.0 ** DIGIT_SPLIT
+    values += parts[:, ncurves:]
+    values /= scale
+    if minus:
+        # Số dấu trừ trong từng ô (tổng theo cột của ô), cũng bằng một phép nhân ma trận
+        cells = np.zeros((width, ncurves), dtype=np.float32)
+        for k, (start, stop) in enumerate(zip(starts, stops)):
+            cells[start:stop, k] = 1
+        values[((grid == 45).astype(np.float32) @ cells) > 0] *= -1
+    return values
+
+
+def _parse_tokens(data, delimiter, ncurves):
+    """Đọc dãy số phân cách bởi khoảng trắng (hoặc delimiter) bằng np.fromstring"""
+    text = data if delimiter == " " else data.replace(delimiter.encode("ascii"), b" ")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, sep=" ")
+        except (ValueError, DeprecationWarning):
+            values = None
+    if values is None or values.size % ncurves:
+        # Có chú thích, giá trị chữ hoặc ô trống: đọc từng dòng, giá trị không phải số thành NaN
+        values = _parse_lines(data, delimiter)
+    if values.size % ncurves:
+        raise ValueError(f"Số giá trị trong ~A không chia hết cho {ncurves} đường cong")
+    return values
+
+
+def _parse_lines(data, delimiter):
+    values = []
+    for line in data.decode("ascii", errors="replace").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for token in (line.split() if delimiter == " " else line.split(delimiter)):
+            try:
+                values.append(float(token.strip().strip('"')))
+            except ValueError:
+                values.append(float("nan"))
+    return np.array(values, dtype=np.float64)
+
+
+def read_las_well_section(path):
+    """Đọc các tham số của section ~W (dừng trước section dữ liệu ~A)"""
+    return {mnemonic: param.value for mnemonic, param in LasFile(path).well.items()}
+
+
+def parse_las_line(line, description=False):
+    """Tách dòng header LAS 'MNEM.UNIT  VALUE : DESC' thành (mnemonic, unit, value[, description])"""
+    mnemonic, rest = line.split(".", 1)
+    rest = rest.split("|", 1)[0]  # LAS 3.0: '| liên kết' sau phần mô tả
+    rest, _, desc = rest.rpartition(":") if ":" in rest else (rest, "", "")
+    unit = ""
+    if rest[:1] not in (" ", "\t"):
+        # Đơn vị viết liền sau dấu chấm, kết thúc bởi khoảng trắng đầu tiên
+        unit, _, rest = rest.partition(" ")
+    result = (mnemonic.strip().upper(), unit, rest.strip())
+    if description:
+        desc = desc.split("{", 1)[0]  # LAS 3.0: '{định dạng}' cuối phần mô tả
+        return result + (desc.strip(),)
+    return result
@@ -0,0 +1,52 @@
+import os
+from importlib import import_module
+from .base import FunctionLoader
+
+# Loại dữ liệu -> hàm load_* của DataLoader (tên hàm: gui.data_loader chỉ được import khi load lần đầu)
+BUILTIN_LOADERS = {
+    "WellLog": "load_well_log_data",
+    "Marker": "load_marker_data",
+    "WellPath": "load_well_path_data",
+    "Seismic 2D": "load_seismic_2d_data",
+    "Seismic 3D": "load_seismic_3d_data",
+    "Seismic Location": "load_seismic_location_data",
+    "Document": "load_document_data",
+}
+
+# Đuôi file -> loader đọc file import (tên class trong gui.loaders.file_loaders, import khi cần)
+FILE_LOADERS = {
+    ".csv": "CsvLoader",
+    ".txt": "CsvLoader",
+    ".json": "JsonLoader",
+    ".jsonl": "JsonLoader",
+    ".las": "LasLoader",
+}
+
+
+def create_loader(data_type, columns):
+    """Tạo loader cho loại dữ liệu.
+
+    Nếu đặt biến môi trường OSDU_SEARCH_URL thì đọc từ OSDU Search,
+    ngược lại dùng dữ liệu mẫu của DataLoader.
+    """
+    search_url = os.environ.get("OSDU_SEARCH_URL")
+    if search_url:
+        from .osdu_search_loader import OsduSearchLoader
+        return OsduSearchLoader(search_url, data_type, columns, token=os.environ.get("OSDU_TOKEN"))
+    function = BUILTIN_LOADERS.get(data_type)
+    if function is None:
+        return None
+    if isinstance(function, str):
+        from gui.data_loader import DataLoader
+        function = getattr(DataLoader, function)
+    return FunctionLoader(function)
+
+
+def create_file_loader(path, columns):
+    """Tạo loader đọc một file import theo đuôi file, None nếu không hỗ trợ"""
+    loader_class = FILE_LOADERS.get(os.path.splitext(path)[1].lower())
+    if loader_class is None:
+        return None
+    if isinstance(loader_class, str):
+        loader_class = getattr(import_module(".file_loaders", __package__), loader_class)
+    return loader_class(path, columns)
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""Parse file import trên các process riêng (ProcessPoolExecutor).
+
+Đọc CSV/JSON/LAS thành bản ghi và kiểm tra từng ô là việc nặng CPU; chạy trên
+thread thì mọi file chia nhau một core vì GIL. ParsePool chạy parse_file trong
+process con và trả về ColumnBatch: mỗi cột là mã của từng dòng kèm list các
+giá trị khác nhau. Process con gói các cột thành một buffer (mã các cột,
+offset ký tự và chuỗi utf-8 của các giá trị) trong một block
+multiprocessing.shared_memory; process chính chỉ nhận lại mô tả nhỏ của block,
+chép buffer ra rồi xóa block, không phải unpickle một list chuỗi cho từng ô.
+
+Trên Windows block bị xóa ngay khi process con đóng handle, nên buffer được
+gửi kèm kết quả (vẫn là buffer gọn thay vì list dòng).
+"""
+import os
+import threading
+
+import numpy as np
+
+from .instrumentation import instruments
+from .loaders.registry import create_file_loader
+from .schema import NUMBER, build_schema
+
+MAX_ERRORS_PER_FILE = 5
+PROCESSES_ENV = "OSDU_PARSE_PROCESSES"  # số process parse; 0: parse trên thread của pipeline
+USE_SHARED_MEMORY = os.name != "nt"
+WAIT_INTERVAL = 0.1  # giây: chu kỳ kiểm tra hủy khi chờ process con
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class RecordValidator:
+    """Kiểm tra bản ghi import: dòng phải có ít nhất một cột khớp, cột số phải đọc được thành số.
+
+    Các 'options' của form import mô tả file được upload, không phải giá trị
+    của bản ghi, nên không dùng để kiểm tra dòng.
+    """
+
+    def __init__(self, data_type, columns):
+        self.data_type = data_type
+        schema = build_schema(columns)
+        self.columns = columns
+        self.numbers = [(i, spec.unit) for i, spec in enumerate(schema) if spec.kind == NUMBER]
+
+    def errors(self, rows, first=1):
+        """Sinh thông báo lỗi cho các dòng (first là số thứ tự bản ghi của dòng đầu)"""
+        for n, row in enumerate(rows, first):
+            if not any(str(value).strip() for value in row):
+                yield f"Bản ghi {n}: không có cột nào khớp {self.data_type}"
+                continue
+            for col, unit in self.numbers:
+                value = str(row[col]).strip()
+                if not value:
+                    continue
+                try:
+                    float(value[:-len(unit)] if unit and value.endswith(unit) else value)
+                except ValueError:
+                    yield f"Bản ghi {n}: {self.columns[col]} '{value}' không phải số"
+
+
+class ColumnBatch:
+    """Các dòng đã parse của một file, lưu theo cột.
+
+    Mỗi cột là (mảng mã của từng dòng, list giá trị khác nhau theo mã):
+    ColumnStore.append_batch và SearchIndex.add_batch chỉ xử lý mỗi giá trị
+    khác nhau một lần rồi tra mã cho cả cột.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, rows, width):
+        columns = []
+        for col in range(width):
+            index = {}
+            codes = np.fromiter((index.setdefault(row[col], len(index)) for row in rows), np.uint32, len(rows))
+            columns.append((codes, list(index)))
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns[0][0]) if self.columns else 0
+
+    def take(self, col, table, dtype):
+        """Bytes của table[mã] cho từng dòng của cột (table: một giá trị cho mỗi giá trị khác nhau)"""
+        return np.asarray(table, dtype)[self.columns[col][0]].tobytes()
+
+    def where(self, col, value_codes):
+        """Vị trí các dòng có mã thuộc value_codes"""
+        return np.flatnonzero(np.isin(self.columns[col][0], value_codes)).tolist()
+
+    def cells(self, col):
+        """Giá trị của cột theo từng dòng (các ô trùng nhau dùng chung một chuỗi)"""
+        codes, values = self.columns[col]
+        return list(map(values.__getitem__, codes.tolist()))
+
+    def rows(self):
+        """List dòng như loader trả về (cho store không đọc được ColumnBatch)"""
+        return list(map(list, zip(*(self.cells(col) for col in range(len(self.columns))))))
+
+    @property
+    def nbytes(self):
+        """Kích thước buffer khi gói (mã các cột + offset + chuỗi utf-8)"""
+        return _layout(self)[-1]
+
+
+def parse_file(path, columns, validator, curve_store=None, cancelled=None, progress=None):
+    """Đọc và kiểm tra một file import, trả về ColumnBatch.
+
+    Lỗi kiểm tra (tối đa MAX_ERRORS_PER_FILE) được gộp vào một ValueError,
+    file lỗi thì không trả về dòng nào. File LAS của WellLog được ghi thêm
+    vào curve_store (gui.curve_store.CurveStore) nếu có.
+    """
+    loader = create_file_loader(path, columns)
+    if loader is None:
+        raise ValueError(f"Không hỗ trợ định dạng {os.path.splitext(path)[1] or 'này'}")
+    rows = []
+    errors = []
+    for batch in loader.iter_batches():
+        if cancelled is not None and cancelled.is_set():
+            raise ImportCancelled()
+        if len(errors) < MAX_ERRORS_PER_FILE:
+            errors.extend(validator.errors(batch, len(rows) + 1))
+        rows.extend(batch)
+        if progress is not None:
+            progress(len(rows))
+    if errors:
+        more = "\n(và các lỗi khác)" if len(errors) > MAX_ERRORS_PER_FILE else ""
+        raise ValueError("\n".join(errors[:MAX_ERRORS_PER_FILE]) + more)
+    if not rows:
+        raise ValueError("File không có bản ghi nào")
+    if curve_store is not None and validator.data_type == "WellLog" and path.lower().endswith(".las"):
+        # Dữ liệu ~A vào kho đường cong (xem trên tab Query); dòng WellLog chỉ lấy từ header
+        with instruments.stage("import.curves"):
+            curve_store.write_las(path)
+    return ColumnBatch.from_rows(rows, len(columns))
+
+
+def _code_type(count):
+    """Kiểu mã nhỏ nhất đủ cho count giá trị khác nhau"""
+    return np.uint8 if count <= 1 << 8 else np.uint16 if count <= 1 << 16 else np.uint32
+
+
+def _layout(batch):
+    """(chuỗi utf-8 các giá trị, offset ký tự, vị trí mã từng cột, vị trí offset, vị trí chuỗi, tổng kích thước)"""
+    values = [value for _, column in batch.columns for value in column]
+    offsets = np.zeros(len(values) + 1, np.int64)
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    if offsets[-1] < 1 << 32:
+        offsets = offsets.astype(np.uint32)
+    text = "".join(values).encode("utf-8")
+    positions = []
+    at = 0
+    for _, column in batch.columns:
+        positions.append(at)
+        at += -(-len(batch) * np.dtype(_code_type(len(column))).itemsize // 8) * 8  # căn 8 byte
+    return text, offsets, positions, at, at + offsets.nbytes, at + offsets.nbytes + len(text)
+
+
+def pack(batch):
+    """Gói ColumnBatch vào một buffer (shared memory nếu có), trả về mô tả gửi về process chính.
+
+    Mã mỗi cột dùng kiểu nhỏ nhất đủ cho số giá trị khác nhau (uint8/16/32).
+    """
+    text, offsets, positions, offsets_at, text_at, size = _layout(batch)
+    shm = None
+    if USE_SHARED_MEMORY:
+        from multiprocessing.shared_memory import SharedMemory
+        shm = SharedMemory(create=True, size=max(size, 1))
+        buffer = shm.buf
+    else:
+        buffer = bytearray(size)
+    rows = len(batch)
+    for (codes, values), at in zip(batch.columns, positions):
+        np.ndarray(rows, _code_type(len(values)), buffer, at)[:] = codes
+    np.ndarray(len(offsets), offsets.dtype, buffer, offsets_at)[:] = offsets
+    buffer[text_at:size] = text
+    descriptor = {"rows": rows, "counts": [len(values) for _, values in batch.columns], "positions": positions,
+                  "offsets": (offsets_at, offsets.dtype.str), "text_at": text_at, "size": size}
+    if shm is None:
+        descriptor["data"] = bytes(buffer)
+    else:
+        del buffer  # nhả view trước khi đóng block; block còn đến khi process chính unlink
+        descriptor["name"] = shm.name
+        shm.close()
+    return descriptor
+
+
+def unpack(descriptor):
+    """Chép ColumnBatch ra khỏi buffer của pack và xóa block shared memory"""
+    if "data" in descriptor:
+        return _unpack(descriptor, descriptor["data"])
+    from multiprocessing.shared_memory import SharedMemory
+    shm = SharedMemory(descriptor["name"])
+    try:
+        return _unpack(descriptor, shm.buf)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _unpack(descriptor, buffer):
+    rows, counts = descriptor["rows"], descriptor["counts"]
+    offsets_at, offsets_type = descriptor["offsets"]
+    offsets = np.ndarray(sum(counts) + 1, offsets_type, buffer, offsets_at).tolist()
+    text = str(bytes(buffer[descriptor["text_at"]:descriptor["size"]]), "utf-8")
+    columns = []
+    start = 0
+    for count, at in zip(counts, descriptor["positions"]):
+        codes = np.ndarray(rows, _code_type(count), buffer, at).copy()
+        ends = offsets[start:start + count + 1]
+        columns.append((codes, [text[a:b] for a, b in zip(ends, ends[1:])]))
+        start += count
+    return ColumnBatch(columns)
+
+
+def release(future):
+    """Callback cho kết quả không dùng đến (file bị hủy): xóa block shared memory"""
+    if not future.cancelled() and future.exception() is None:
+        unpack(future.result())
+
+
+def _parse_packed(path, columns, validator, curve_dir):
+    """Chạy trong process con: parse_file rồi gói kết quả"""
+    from .curve_store import CurveStore
+    curve_store = CurveStore(curve_dir) if curve_dir else None
+    return pack(parse_file(path, columns, validator, curve_store))
+
+
+def default_processes():
+    """Số process parse: biến môi trường OSDU_PARSE_PROCESSES, mặc định số CPU.
+
+    Mỗi process giữ một bản các import của app (xem ParsePool); bộ nhớ đó được
+    trả lại khi ImportPipeline shutdown pool lúc rảnh, máy ít RAM thì đặt biến
+    môi trường để giảm số process.
+    """
+    value = os.environ.get(PROCESSES_ENV, "").strip()
+    if value:
+        try:
+            return max(0, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
+class ParsePool:
+    """ProcessPoolExecutor parse file import; các process được tạo khi có file đầu tiên.
+
+    Process con được tạo bằng spawn (không fork process đang chạy thread Qt); khi
+    chạy app bằng main.py, spawn chạy lại các import ở đầu main.py (PyQt5 và các
+    module gui) trong mỗi process con, nên pool cần được shutdown khi không dùng.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, path, columns, validator, curve_dir=None):
+        with self._lock:
+            if self._executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(self.processes, multiprocessing.get_context("spawn"))
+            return self._executor.submit(_parse_packed, path, columns, validator, curve_dir)
+
+    def result(self, future, cancelled=None):
+        """Chờ kết quả của submit (ColumnBatch); cancelled được set thì bỏ kết quả và raise ImportCancelled"""
+        from concurrent.futures import wait
+        from concurrent.futures.process import BrokenProcessPool
+        while not future.done():
+            if cancelled is not None and cancelled.is_set():
+                future.cancel()
+                future.add_done_callback(release)
+                raise ImportCancelled()
+            wait([future], WAIT_INTERVAL)
+        try:
+            descriptor = future.result()
+        except BrokenProcessPool:
+            # Process con chết đột ngột: pool không dùng được nữa, lần submit sau tạo pool mới
+            with self._lock:
+                self._executor = None
+            raise
+        return unpack(descriptor)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,455 @@
+"""Biểu thức lọc theo cột cho tab Query.
+
+Cú pháp (không phân biệt hoa thường):
+    Start Depth between 2000 and 3500 and Log Class = Petrophysics
+    Depth >= 1500 or not Source contains "geo"
+    [Well Name] in (Well A, Well B)
+
+Toán tử: = != < <= > >= between ... and ..., in (...), contains; kết hợp bằng
+and / or / not và dấu ngoặc. Giá trị có khoảng trắng hoặc chứa and/or thì đặt
+trong nháy. Biểu thức được biên dịch thành phép toán vector NumPy trên buffer
+cột của ColumnStore; điều kiện khoảng trên cột số dùng chỉ mục đã sắp xếp và
+tìm kiếm nhị phân.
+
+Với dữ liệu có cột Latitude/Longitude còn có điều kiện không gian (dùng
+gui.spatial_index):
+    bbox(lat_min, lon_min, lat_max, lon_max)
+    radius(lat, lon, km)
+    nearest(lat, lon, n)
+nearest chọn n dòng gần nhất trong số các dòng thỏa phần còn lại của biểu thức
+(chỉ được nối bằng and ở mức ngoài cùng), kết quả xếp theo khoảng cách.
+"""
+import re
+
+import numpy as np
+
+from .column_store import format_number, row_id_array
+from .schema import NUMBER, CATEGORY, value_key
+from .spatial_index import LATITUDE, LONGITUDE, spatial_index, haversine_km, in_bbox
+
+COMPARISONS = ("!=", "<=", ">=", "=", "<", ">")
+SPATIAL_ARGUMENTS = {"bbox": 4, "radius": 3, "nearest": 3}
+
+
+class QueryError(ValueError):
+    """Lỗi cú pháp hoặc tên cột không hợp lệ trong biểu thức lọc"""
+
+
+class Predicate:
+    def __init__(self, column, op, values):
+        self.column = column
+        self.op = op
+        self.values = values
+        self.numbers = None  # giá trị đã đổi sang số (điều kiện trên cột số)
+
+
+class SpatialPredicate:
+    def __init__(self, op, numbers):
+        self.op = op  # bbox / radius / nearest
+        self.numbers = numbers
+
+
+def compile_query(text, schema):
+    """Phân tích biểu thức và trả về Query dùng được với ColumnStore có schema tương ứng"""
+    tree = _Parser(text, [spec.name for spec in schema]).parse()
+    specs = {spec.name: spec for spec in schema}
+    if _has_spatial(tree) and not (LATITUDE in specs and LONGITUDE in specs):
+        raise QueryError(f"bbox/radius/nearest chỉ dùng được với dữ liệu có cột {LATITUDE} và {LONGITUDE}")
+    tree, nearest = _split_nearest(tree)
+    for predicate in _predicates(tree) if tree is not None else ():
+        spec = specs[predicate.column]
+        if spec.kind == NUMBER and predicate.op != "contains":
+            try:
+                predicate.numbers = [
+                    float(value[:-len(spec.unit)] if spec.unit and value.endswith(spec.unit) else value)
+                    for value in predicate.values
+                ]
+            except ValueError:
+                raise QueryError(f"'{predicate.column}' chỉ so sánh được với số")
+    return Query(tree, schema, nearest)
+
+
+def _split_nearest(tree):
+    """Tách nearest(...) ở mức ngoài cùng khỏi cây: (cây còn lại hoặc None, SpatialPredicate hoặc None)"""
+    nearest = None
+    if tree[0] == "spatial" and tree[1].op == "nearest":
+        nearest, tree = tree[1], None
+    elif tree[0] == "and":
+        found = [child for child in tree[1] if child[0] == "spatial" and child[1].op == "nearest"]
+        if len(found) > 1:
+            raise QueryError("Chỉ dùng được một điều kiện nearest")
+        if found:
+            nearest = found[0][1]
+            rest = [child for child in tree[1] if child is not found[0]]
+            tree = rest[0] if len(rest) == 1 else ("and", rest)
+    if tree is not None and any(node[1].op == "nearest" for node in _spatial_nodes(tree)):
+        raise QueryError("nearest chỉ được nối với phần còn lại của biểu thức bằng and")
+    return tree, nearest
+
+
+def _spatial_nodes(node):
+    if node[0] == "spatial":
+        yield node
+    elif node[0] == "not":
+        yield from _spatial_nodes(node[1])
+    elif node[0] in ("and", "or"):
+        for child in node[1]:
+            yield from _spatial_nodes(child)
+
+
+def _has_spatial(node):
+    return any(True for _ in _spatial_nodes(node))
+
+
+def _predicates(node):
+    if node[0] == "predicate":
+        yield node[1]
+    elif node[0] == "spatial":
+        return
+    elif node[0] == "not":
+        yield from _predicates(node[1])
+    else:
+        for child in node[1]:
+            yield from _predicates(child)
+
+
+class Query:
+    def __init__(self, tree, schema, nearest=None):
+        self.tree = tree  # None: chỉ có điều kiện nearest
+        self.schema = schema
+        self.nearest = nearest  # SpatialPredicate nearest(...) áp dụng sau cùng
+        self.columns = {spec.name: i for i, spec in enumerate(schema)}
+
+    def mask(self, store, start=0, stop=None):
+        """Mảng bool cho các dòng trong [start, stop) thỏa biểu thức (không gồm nearest)"""
+        with store.lock:
+            stop = len(store) if stop is None else stop
+            if self.tree is None:
+                return np.ones(stop - start, dtype=bool)
+            return self._evaluate(self.tree, store, start, stop)
+
+    def filter_ids(self, store, row_ids, start, stop):
+        """Lọc row_ids (array('q') tăng dần trong [start, stop), None = mọi dòng) theo biểu thức"""
+        with store.lock:
+            mask = self.mask(store, start, stop)
+            if row_ids is None:
+                selected = np.flatnonzero(mask) + start
+            else:
+                ids = np.array(row_ids, dtype=np.int64)
+                selected = ids[mask[ids - start]]
+            if self.nearest is not None:
+                selected = self.nearest_ids(store, None if len(selected) == len(store) else selected)
+        return row_id_array(selected)
+
+    def nearest_ids(self, store, candidates=None):
+        """Id các dòng gần điểm của nearest(...) nhất trong candidates (None = mọi dòng), gần trước"""
+        index = spatial_index(store, self.columns[LATITUDE], self.columns[LONGITUDE])
+        allowed = None
+        if candidates is not None:
+            allowed = np.zeros(len(store), dtype=bool)
+            allowed[np.asarray(candidates, dtype=np.int64)] = True
+        lat, lon, count = self.nearest.numbers
+        return index.nearest(lat, lon, int(count), allowed)
+
+    def _evaluate(self, node, store, start, stop):
+        kind = node[0]
+        if kind == "and":
+            mask = self._evaluate(node[1][0], store, start, stop)
+            for child in node[1][1:]:
+                mask &= self._evaluate(child, store, start, stop)
+            return mask
+        if kind == "or":
+            mask = self._evaluate(node[1][0], store, start, stop)
+            for child in node[1][1:]:
+                mask |= self._evaluate(child, store, start, stop)
+            return mask
+        if kind == "not":
+            return ~self._evaluate(node[1], store, start, stop)
+        if kind == "spatial":
+            return self._spatial_mask(node[1], store, start, stop)
+        return self._evaluate_predicate(node[1], store, start, stop)
+
+    def _spatial_mask(self, predicate, store, start, stop):
+        """bbox/radius: dùng chỉ mục không gian khi lọc toàn bộ store, so sánh vector khi lọc một đoạn"""
+        lat_col, lon_col = self.columns[LATITUDE], self.columns[LONGITUDE]
+        if start == 0 and stop == len(store):
+            index = spatial_index(store, lat_col, lon_col)
+            ids = index.bbox(*predicate.numbers) if predicate.op == "bbox" else index.radius(*predicate.numbers)
+            mask = np.zeros(stop, dtype=bool)
+            mask[ids] = True
+            return mask
+        lats = np.frombuffer(store.values(lat_col), dtype=np.float64)[start:stop]
+        lons = np.frombuffer(store.values(lon_col), dtype=np.float64)[start:stop]
+        if predicate.op == "bbox":
+            return in_bbox(lats, lons, *predicate.numbers)
+        lat, lon, km = predicate.numbers
+        return haversine_km(lat, lon, lats, lons) <= km
+
+    def _evaluate_predicate(self, predicate, store, start, stop):
+        col = self.columns[predicate.column]
+        spec = self.schema[col]
+        if spec.kind == NUMBER and predicate.op != "contains":
+            return _number_mask(store, col, predicate, start, stop)
+        if spec.kind == CATEGORY:
+            # Đánh giá một lần cho mỗi giá trị khác nhau rồi tra theo mã của từng dòng
+            test = _value_test(predicate)
+            categories = store.categories(col)
+            matches = np.fromiter((test(value) for value in categories), dtype=bool, count=len(categories))
+            codes = np.frombuffer(store.values(col), dtype=np.uint32)[start:stop]
+            return matches[codes] if len(matches) else np.zeros(stop - start, dtype=bool)
+        test = _value_test(predicate)
+        if spec.kind == NUMBER:
+            return _number_contains(store, col, spec.unit, test, start, stop)
+        # Cột text: như category, đánh giá trên bảng giá trị khác nhau của text_codes
+        codes, values = text_codes(store, col)
+        matches = np.fromiter((test(value) for value in values), dtype=bool, count=len(values))
+        return matches[codes[start:stop]] if len(matches) else np.zeros(stop - start, dtype=bool)
+
+
+def _number_contains(store, col, unit, test, start, stop):
+    """contains trên cột số: kiểm tra chuỗi hiển thị của mỗi số khác nhau một lần"""
+    values = np.frombuffer(store.values(col), dtype=np.float64)[start:stop]
+    valid = ~np.isnan(values)
+    distinct, inverse = np.unique(values[valid], return_inverse=True)
+    matches = np.fromiter((test(format_number(number) + unit) for number in distinct.tolist()),
+                          dtype=bool, count=len(distinct))
+    mask = np.zeros(stop - start, dtype=bool)
+    mask[valid] = matches[inverse]
+    for row in np.flatnonzero(~valid).tolist():  # ô trống hoặc giữ chuỗi gốc không đọc được
+        mask[row] = test(store.display(start + row, col))
+    return mask
+
+
+def _number_mask(store, col, predicate, start, stop):
+    """Điều kiện trên cột số: dùng chỉ mục sắp xếp khi lọc toàn bộ store, so sánh vector khi lọc một đoạn"""
+    numbers = predicate.numbers
+    if start == 0 and stop == len(store):
+        order, sorted_values, valid = sorted_index(store, col)
+        mask = np.zeros(stop, dtype=bool)
+        for lo, hi in _ranges(predicate.op, numbers, sorted_values, valid):
+            mask[order[lo:hi]] = True
+        return mask
+
+    values = np.frombuffer(store.values(col), dtype=np.float64)[start:stop]
+    op = predicate.op
+    if op == "between":
+        return (values >= numbers[0]) & (values <= numbers[1])
+    if op == "in":
+        return np.isin(values, numbers)
+    return {"=": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+            ">": np.greater, ">=": np.greater_equal}[op](values, numbers[0]) & ~np.isnan(values)
+
+
+def _ranges(op, numbers, sorted_values, valid):
+    """Các đoạn [lo, hi) trong chỉ mục sắp xếp thỏa điều kiện (tìm kiếm nhị phân)"""
+    def left(x):
+        return int(np.searchsorted(sorted_values[:valid], x, side="left"))
+
+    def right(x):
+        return int(np.searchsorted(sorted_values[:valid], x, side="right"))
+
+    if op == "between":
+        return [(left(numbers[0]), right(numbers[1]))]
+    if op in ("=", "in"):
+        return [(left(x), right(x)) for x in numbers]
+    if op == "!=":
+        return [(0, left(numbers[0])), (right(numbers[0]), valid)]
+    if op == "<":
+        return [(0, left(numbers[0]))]
+    if op == "<=":
+        return [(0, right(numbers[0]))]
+    if op == ">":
+        return [(right(numbers[0]), valid)]
+    return [(left(numbers[0]), valid)]
+
+
+def sorted_index(store, col):
+    """(thứ tự id dòng theo giá trị tăng dần, giá trị đã sắp xếp, số giá trị hợp lệ) của cột số.
+
+    Kết quả được cache trong store và tính lại khi store có thêm dòng.
+    """
+    with store.lock:
+        key = ("sorted_index", col)
+        cached = store.cache.get(key)
+        if cached is None:
+            values = np.frombuffer(store.values(col), dtype=np.float64)
+            order = np.argsort(values, kind="stable")  # NaN được xếp cuối
+            sorted_values = values[order]
+            valid = len(values) - int(np.count_nonzero(np.isnan(sorted_values)))
+            cached = store.cache[key] = (order, sorted_values, valid)
+        return cached
+
+
+def text_codes(store, col):
+    """(mã uint32 của từng dòng, bảng giá trị) của cột text, cache trong store như sorted_index"""
+    with store.lock:
+        key = ("text_codes", col)
+        cached = store.cache.get(key)
+        if cached is None:
+            codes, values = store.sort_values(col)
+            cached = store.cache[key] = (np.frombuffer(codes, dtype=np.uint32), values)
+        return cached
+
+
+def _value_test(predicate):
+    """Hàm kiểm tra một giá trị chuỗi theo predicate"""
+    op = predicate.op
+    if op == "contains":
+        needle = predicate.values[0].lower()
+        return lambda value: needle in value.lower()
+    if op in ("=", "in"):
+        targets = {value.lower() for value in predicate.values}
+        return lambda value: value.lower() in targets
+    if op == "!=":
+        target = predicate.values[0].lower()
+        return lambda value: value.lower() != target
+    keys = [value_key(value) for value in predicate.values]
+    if op == "between":
+        return lambda value: keys[0] <= value_key(value) <= keys[1]
+    compare = {"<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+               ">": lambda a, b: a > b, ">=": lambda a, b: a >= b}[op]
+    return lambda value: bool(value) and compare(value_key(value), keys[0])
+
+
+class _Parser:
+    _KEYWORD = re.compile(r"\s*(and|or|not|between|in|contains)\b", re.IGNORECASE)
+    _SPATIAL = re.compile(r"\s*(bbox|radius|nearest)\s*\(", re.IGNORECASE)
+    _BARE_VALUE = re.compile(r"\s*(.+?)(?=\s+(?:and|or)\b|\s*\)|\s*,|$)", re.IGNORECASE)
+
+    def __init__(self, text, columns):
+        self.text = text
+        self.pos = 0
+        # Tên cột dài trước để "Depth" không khớp nhầm phần đầu của tên khác
+        self.columns = sorted(columns, key=len, reverse=True)
+
+    def parse(self):
+        tree = self._parse_or()
+        self._skip_space()
+        if self.pos < len(self.text):
+            raise QueryError(f"Không hiểu biểu thức tại: '{self.text[self.pos:]}'")
+        return tree
+
+    def _parse_or(self):
+        children = [self._parse_and()]
+        while self._accept_keyword("or"):
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def _parse_and(self):
+        children = [self._parse_not()]
+        while self._accept_keyword("and"):
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else ("and", children)
+
+    def _parse_not(self):
+        if self._accept_keyword("not"):
+            return ("not", self._parse_not())
+        self._skip_space()
+        if self._accept("("):
+            tree = self._parse_or()
+            if not self._accept(")"):
+                raise QueryError("Thiếu dấu ')'")
+            return tree
+        match = self._SPATIAL.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return ("spatial", self._parse_spatial(match.group(1).lower()))
+        return ("predicate", self._parse_predicate())
+
+    def _parse_spatial(self, op):
+        """Tham số số của bbox(...)/radius(...)/nearest(...) (đã đọc dấu '(')"""
+        values = [self._parse_value()]
+        while self._accept(","):
+            values.append(self._parse_value())
+        if not self._accept(")"):
+            raise QueryError("Thiếu dấu ')'")
+        if len(values) != SPATIAL_ARGUMENTS[op]:
+            raise QueryError(f"{op}(...) cần {SPATIAL_ARGUMENTS[op]} tham số")
+        try:
+            numbers = [float(value.lower().removesuffix("km").strip()) for value in values]
+        except ValueError:
+            raise QueryError(f"Tham số của {op}(...) phải là số")
+        if op == "bbox":
+            lat_a, lon_a, lat_b, lon_b = numbers
+            numbers = [min(lat_a, lat_b), min(lon_a, lon_b), max(lat_a, lat_b), max(lon_a, lon_b)]
+        elif numbers[2] <= 0 or (op == "nearest" and not numbers[2].is_integer()):
+            raise QueryError(f"Tham số cuối của {op}(...) phải là số dương" + (" nguyên" if op == "nearest" else ""))
+        return SpatialPredicate(op, numbers)
+
+    def _parse_predicate(self):
+        column = self._parse_column()
+        if self._accept_keyword("between"):
+            low = self._parse_value()
+            if not self._accept_keyword("and"):
+                raise QueryError(f"'{column} between' cần dạng: between <a> and <b>")
+            return Predicate(column, "between", [low, self._parse_value()])
+        if self._accept_keyword("in"):
+            if not self._accept("("):
+                raise QueryError(f"'{column} in' cần danh sách trong ngoặc")
+            values = [self._parse_value()]
+            while self._accept(","):
+                values.append(self._parse_value())
+            if not self._accept(")"):
+                raise QueryError("Thiếu dấu ')'")
+            return Predicate(column, "in", values)
+        if self._accept_keyword("contains"):
+            return Predicate(column, "contains", [self._parse_value()])
+        self._skip_space()
+        for op in COMPARISONS:
+            if self.text.startswith(op, self.pos):
+                self.pos += len(op)
+                return Predicate(column, op, [self._parse_value()])
+        raise QueryError(f"Thiếu toán tử sau cột '{column}'")
+
+    def _parse_column(self):
+        self._skip_space()
+        if self._accept("["):
+            end = self.text.find("]", self.pos)
+            if end < 0:
+                raise QueryError("Thiếu dấu ']'")
+            name = self.text[self.pos:end].strip()
+            self.pos = end + 1
+            for column in self.columns:
+                if column.lower() == name.lower():
+                    return column
+            raise QueryError(f"Không có cột '{name}'")
+        rest = self.text[self.pos:].lower()
+        for column in self.columns:
+            if rest.startswith(column.lower()) and not rest[len(column):len(column) + 1].isalnum():
+                self.pos += len(column)
+                return column
+        raise QueryError(f"Không có cột tại: '{self.text[self.pos:]}'")
+
+    def _parse_value(self):
+        self._skip_space()
+        quote = self.text[self.pos:self.pos + 1]
+        if quote in ("'", '"'):
+            end = self.text.find(quote, self.pos + 1)
+            if end < 0:
+                raise QueryError("Thiếu dấu nháy đóng")
+            value = self.text[self.pos + 1:end]
+            self.pos = end + 1
+            return value
+        match = self._BARE_VALUE.match(self.text, self.pos)
+        if not match or not match.group(1).strip():
+            raise QueryError("Thiếu giá trị")
+        self.pos = match.end()
+        return match.group(1).strip()
+
+    def _accept_keyword(self, word):
+        match = self._KEYWORD.match(self.text, self.pos)
+        if match and match.group(1).lower() == word:
+            self.pos = match.end()
+            return True
+        return False
+
+    def _accept(self, char):
+        self._skip_space()
+        if self.text.startswith(char, self.pos):
+            self.pos += len(char)
+            return True
+        return False
+
+    def _skip_space(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
@@ -0,0 +1,63 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+
+TEXT = "text"
+NUMBER = "number"
+CATEGORY = "category"
+
+ColumnSpec = namedtuple("ColumnSpec", ["name", "kind", "unit"])
+
+# Các cột số: lưu dạng float trong array, hậu tố đơn vị chỉ thêm lại khi hiển thị
+NUMERIC_COLUMNS = {
+    "Start Depth": "", "Stop Depth": "", "Depth": "", "Measured Depth": "",
+    "Inclination": "°", "Azimuth": "°",
+    "Shot Points": "", "Inline Count": "", "Crossline Count": "",
+    "Latitude": "", "Longitude": "",
+    "TVD": "", "Northing": "", "Easting": "", "DLS": "",  # cột tính từ quỹ đạo giếng (gui.well_path)
+}
+
+# Số chữ số thập phân khi hiển thị trên bảng Query; store, lọc, sắp xếp và export dùng giá trị đầy đủ
+DISPLAY_DECIMALS = {"TVD": 2, "Northing": 2, "Easting": 2, "DLS": 2}
+
+# Các cột có ít giá trị khác nhau: mã hóa từ điển (mỗi ô chỉ là một mã số nguyên)
+CATEGORY_COLUMNS = {
+    "WellBore Name", "Well Name", "Survey Name",
+    "Log Run", "Log Type", "Date", "Logging Service", "Fluid Type", "Log Class", "Logging Mode",
+    "Confidence Level", "Source", "Processing Status", "Type", "Author",
+}
+
+
+def column_spec(name):
+    """Xác định kiểu lưu trữ của một cột theo tên"""
+    if name in NUMERIC_COLUMNS:
+        return ColumnSpec(name, NUMBER, NUMERIC_COLUMNS[name])
+    if name in CATEGORY_COLUMNS:
+        return ColumnSpec(name, CATEGORY, "")
+    return ColumnSpec(name, TEXT, "")
+
+
+def build_schema(columns):
+    """Schema (list ColumnSpec) cho danh sách cột của một loại dữ liệu"""
+    return [column_spec(col) for col in columns]
+
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%b-%Y", "%Y/%m/%d")
+_DATE_LIKE = re.compile(r"\d{1,4}[-/][0-9A-Za-z]{1,3}[-/]\d{1,4}$")  # lọc nhanh trước khi thử strptime
+
+
+def value_key(text):
+    """Khóa so sánh theo kiểu của giá trị: số < ngày < chuỗi (không phân biệt hoa thường)"""
+    text = str(text).strip()
+    try:
+        return (0, float(text.rstrip("°")), "")
+    except ValueError:
+        pass
+    if not _DATE_LIKE.match(text):
+        return (2, 0, text.lower())
+    for fmt in DATE_FORMATS:
+        try:
+            return (1, datetime.strptime(text, fmt).toordinal(), "")
+        except ValueError:
+            continue
+    return (2, 0, text.lower())
@@ -0,0 +1,221 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from .column_store import row_id_array
+
+NGRAM_SIZE = 3
+CACHE_SIZE = 32  # số keyword gần nhất được cache kết quả
+CACHE_MAX_ROWS = 250_000  # kết quả lớn hơn chỉ cache id giá trị, id dòng được tính lại
+
+
+class SearchIndex:
+    """Chỉ mục tìm kiếm chuỗi con cho một loại dữ liệu.
+
+    Mỗi giá trị ô khác nhau được lowercase một lần; mỗi cột giữ id giá trị
+    của từng dòng. Chỉ mục n-gram trỏ từ n-gram tới các giá trị, nên một truy
+    vấn chỉ kiểm tra các giá trị ứng viên thay vì quét toàn bộ dòng × cột, rồi
+    tìm các dòng chứa chúng bằng một phép tra vector trên những cột có chứa
+    các giá trị đó. Kết quả các keyword gần nhất được giữ trong cache LRU;
+    keyword mở rộng từ một keyword đã cache chỉ cần kiểm tra lại các giá trị
+    đã khớp trước đó.
+
+    Chỉ mục mở từ cache trên đĩa (from_buffers) chỉ được nạp khi dùng lần đầu
+    hoặc khi gọi preload, và đọc trực tiếp các buffer map từ file.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()  # add_rows có thể chạy trên thread load nền
+        self.row_count = 0
+        self._value_ids = {}              # text đã lowercase -> id giá trị
+        self._values = []                 # id giá trị -> text đã lowercase
+        self._value_columns = array('Q')  # id giá trị -> bitmask các cột có giá trị này
+        self._grams = {}                  # n-gram -> array id giá trị
+        self._cells = []                  # mỗi cột: array id giá trị của từng dòng
+        self._cache = OrderedDict()       # keyword -> (id giá trị khớp, id dòng khớp hoặc None)
+        self._pending_load = None         # hàm nạp chỉ mục từ cache (from_buffers), chưa chạy
+
+    @classmethod
+    def from_buffers(cls, row_count, load):
+        """Chỉ mục trên các buffer có sẵn, nạp bằng load() khi dùng lần đầu.
+
+        load() trả về (list giá trị, bitmask cột uint64, dict n-gram -> dãy id
+        giá trị, buffer uint32 id giá trị từng cột) như snapshot.
+        """
+        index = cls()
+        index.row_count = row_count
+        index._pending_load = load
+        return index
+
+    def preload(self):
+        """Nạp trước chỉ mục mở từ cache trên thread nền (search gọi trong lúc đó sẽ chờ)"""
+        if self._pending_load is not None:
+            threading.Thread(target=self._preload, daemon=True).start()
+
+    def _preload(self):
+        with self.lock:
+            self._ensure_loaded()
+            self._build_value_ids()
+
+    def _ensure_loaded(self):
+        """Chạy hàm nạp của from_buffers nếu chưa chạy (gọi khi đang giữ lock)"""
+        if self._pending_load is None:
+            return
+        load, self._pending_load = self._pending_load, None
+        try:
+            self._values, self._value_columns, self._grams, cells = load()
+            self._cells = list(cells)
+            self._value_ids = None  # chỉ cần khi thêm dòng, dựng sau
+        except Exception:
+            # Cache hỏng: chỉ mục rỗng, mọi tìm kiếm không khớp dòng nào
+            self._values, self._value_ids, self._value_columns, self._grams = [], {}, array('Q'), {}
+            self._cells = []
+
+    def snapshot(self, rows=None):
+        """(số dòng, list giá trị, bytes bitmask cột, dict n-gram -> bytes id, bytes id giá trị từng cột)"""
+        with self.lock:
+            self._ensure_loaded()
+            rows = self.row_count if rows is None else rows
+            grams = {gram: memoryview(posting).tobytes() for gram, posting in self._grams.items()}
+            return (rows, list(self._values), memoryview(self._value_columns).tobytes(), grams,
+                    [memoryview(cells)[:rows].tobytes() for cells in self._cells])
+
+    def _materialize(self):
+        """Chép các buffer map từ file cache sang array để thêm dòng được"""
+        self._ensure_loaded()
+        self._build_value_ids()
+        if isinstance(self._value_columns, array):
+            return
+        self._value_columns = _to_array('Q', self._value_columns)
+        self._grams = {gram: _to_array('I', posting) for gram, posting in self._grams.items()}
+        self._cells = [_to_array('I', cells) for cells in self._cells]
+
+    def _build_value_ids(self):
+        if self._value_ids is None:
+            self._value_ids = {text: value_id for value_id, text in enumerate(self._values)}
+
+    def add_rows(self, rows):
+        """Thêm dòng mới vào chỉ mục (id dòng nối tiếp các dòng đã có)"""
+        if not rows:
+            return
+        with self.lock:
+            self._cache.clear()
+            self._materialize()
+            while len(self._cells) < len(rows[0]):
+                self._cells.append(array('I', bytes(4 * self.row_count)))
+            value_columns = self._value_columns
+            for col, cells in enumerate(zip(*rows)):
+                ids = self._lookup_values(cells)
+                self._cells[col].extend(ids)
+                bit = 1 << col
+                for value_id in set(ids):
+                    value_columns[value_id] |= bit
+            self.row_count += len(rows)
+
+    def add_batch(self, batch):
+        """Như add_rows với một ColumnBatch (gui.parse_pool): tra id cho các giá trị khác nhau rồi cho cả cột"""
+        if not len(batch):
+            return
+        with self.lock:
+            self._cache.clear()
+            self._materialize()
+            while len(self._cells) < len(batch.columns):
+                self._cells.append(array('I', bytes(4 * self.row_count)))
+            value_columns = self._value_columns
+            for col, (_, values) in enumerate(batch.columns):
+                ids = self._lookup_values(values)
+                self._cells[col].frombytes(batch.take(col, ids, 'uint32'))
+                bit = 1 << col
+                for value_id in set(ids):
+                    value_columns[value_id] |= bit
+            self.row_count += len(batch)
+
+    def _lookup_values(self, cells):
+        """Id giá trị của từng ô; giá trị mới được thêm vào chỉ mục n-gram"""
+        value_ids = self._value_ids
+        values = self._values
+        grams = self._grams
+        ids = []
+        for cell in cells:
+            text = str(cell).lower()
+            value_id = value_ids.get(text)
+            if value_id is None:
+                value_id = value_ids[text] = len(values)
+                values.append(text)
+                self._value_columns.append(0)
+                for gram in _ngrams(text):
+                    posting = grams.get(gram)
+                    if posting is None:
+                        grams[gram] = array('I', (value_id,))
+                    else:
+                        posting.append(value_id)
+            ids.append(value_id)
+        return ids
+
+    def search(self, keyword):
+        """Trả về id các dòng (tăng dần) có ít nhất một ô chứa keyword"""
+        keyword = keyword.lower()
+        with self.lock:
+            self._ensure_loaded()
+            cached = self._cache.get(keyword)
+            if cached is not None:
+                self._cache.move_to_end(keyword)
+                value_ids, row_ids = cached
+                return row_ids if row_ids is not None else self._rows_for(value_ids)
+            value_ids = self._match_values(keyword)
+            row_ids = self._rows_for(value_ids)
+            self._cache[keyword] = (value_ids, row_ids if len(row_ids) <= CACHE_MAX_ROWS else None)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return row_ids
+
+    def _rows_for(self, value_ids):
+        """Id các dòng chứa ít nhất một giá trị trong value_ids, tra vector trên các cột liên quan"""
+        if not value_ids:
+            return array('q')
+        hit = np.zeros(len(self._values), dtype=bool)
+        hit[value_ids] = True
+        columns = 0
+        for value_id in value_ids:
+            columns |= self._value_columns[value_id]
+        mask = np.zeros(self.row_count, dtype=bool)
+        for col, cells in enumerate(self._cells):
+            if columns >> col & 1:
+                # View trên buffer array chỉ tồn tại trong lúc giữ lock
+                mask |= hit[np.frombuffer(cells, dtype=np.uint32)]
+        return row_id_array(np.flatnonzero(mask))
+
+    def _match_values(self, keyword):
+        """Các id giá trị chứa keyword, chỉ kiểm tra ứng viên từ keyword đã cache hoặc chỉ mục n-gram"""
+        values = self._values
+        # Keyword chứa một keyword đã cache: chỉ các giá trị đã khớp trước đó mới có thể khớp
+        previous = max((cached for cached in self._cache if cached in keyword), key=len, default=None)
+        if previous is not None:
+            return [value_id for value_id in self._cache[previous][0] if keyword in values[value_id]]
+
+        grams = _ngrams(keyword)
+        if not grams:
+            # Keyword ngắn hơn n-gram: quét danh sách giá trị khác nhau
+            return [value_id for value_id, text in enumerate(values) if keyword in text]
+
+        postings = sorted((self._grams.get(gram, ()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return sorted(value_id for value_id in candidates if keyword in values[value_id])
+
+
+def _to_array(typecode, buffer):
+    if isinstance(buffer, array):
+        return buffer
+    result = array(typecode)
+    result.frombytes(memoryview(buffer).cast('B'))
+    return result
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
@@ -0,0 +1,58 @@
+"""Sắp xếp kết quả lọc của bảng Query theo một cột.
+
+Thứ tự của toàn bộ store theo mỗi (cột, chiều) là một mảng id dòng, tính một
+lần và cache trong store (xóa khi store có thêm dòng). Sắp xếp một kết quả lọc
+chỉ là giữ lại các id có trong kết quả theo thứ tự đó, nên đổi bộ lọc, lật
+trang hay bấm lại cột không phải sắp xếp lại toàn bộ dữ liệu.
+
+Giá trị được so sánh theo kiểu (schema.value_key): số, ngày (22/12/2024,
+2024-01-15, ...), rồi chuỗi không phân biệt hoa thường. Ô trống (kể cả giá
+trị không đọc được thành số của cột số) luôn ở cuối.
+"""
+from array import array
+
+import numpy as np
+
+from .column_store import row_id_array
+from .schema import value_key
+
+
+def sort_rows(store, row_ids, col, descending=False):
+    """row_ids (array id dòng hoặc SqlRowIds) sắp xếp theo cột col, trả về array('q')"""
+    order = sort_order(store, col, descending)
+    if not isinstance(row_ids, array):
+        row_ids = row_ids[:]  # SqlRowIds: đọc toàn bộ id khớp
+    ids = np.frombuffer(row_ids, dtype=np.int64)
+    if len(ids) == len(order):
+        return row_id_array(order)  # kết quả lọc gồm mọi dòng
+    selected = np.zeros(len(order), dtype=bool)
+    selected[ids] = True
+    return row_id_array(order[selected[order]])
+
+
+def sort_order(store, col, descending=False):
+    """Mảng id mọi dòng của store theo thứ tự của cột col (các dòng bằng nhau giữ thứ tự id)"""
+    with store.lock:
+        key = ("sort_order", col, descending)
+        order = store.cache.get(key)
+        if order is None:
+            keys, blank = _sort_keys(store, col)
+            # lexsort: khóa cuối là khóa chính -> ô trống xếp sau, rồi đến giá trị
+            order = store.cache[key] = np.lexsort((-keys if descending else keys, blank))
+        return order
+
+
+def _sort_keys(store, col):
+    """(khóa số của từng dòng, mặt nạ ô trống) theo dữ liệu store.sort_values"""
+    values, categories = store.sort_values(col)
+    if categories is None:
+        keys = np.frombuffer(values, dtype=np.float64)
+        blank = np.isnan(keys)
+        return np.where(blank, 0.0, keys), blank
+    # Xếp hạng các giá trị khác nhau một lần rồi tra theo mã của từng dòng
+    ranked = sorted(range(len(categories)), key=lambda code: value_key(categories[code]))
+    rank = np.empty(len(categories), dtype=np.float64)
+    rank[ranked] = np.arange(len(categories))
+    empty = np.fromiter((not str(value).strip() for value in categories), dtype=bool, count=len(categories))
+    codes = np.frombuffer(values, dtype=np.uint32)
+    return rank[codes], empty[codes]
@@ -0,0 +1,148 @@
+"""Chỉ mục không gian (lưới đều) trên cột Latitude/Longitude.
+
+Các điểm được chia vào lưới ô chữ nhật theo phạm vi dữ liệu (khoảng
+POINTS_PER_CELL điểm mỗi ô). Id dòng được sắp xếp theo số ô nên mỗi hàng ô
+của một vùng là một đoạn liên tục: truy vấn hình chữ nhật, bán kính và N
+điểm gần nhất chỉ xét các ô giao với vùng cần tìm rồi kiểm tra chính xác
+bằng NumPy. Khoảng cách tính theo công thức haversine (km).
+"""
+import numpy as np
+
+LATITUDE = "Latitude"
+LONGITUDE = "Longitude"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+POINTS_PER_CELL = 16
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Khoảng cách (km) từ điểm (lat, lon) đến các điểm (lats, lons)"""
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def radius_box(lat, lon, km):
+    """Hình chữ nhật (lat_min, lon_min, lat_max, lon_max) chứa hình tròn bán kính km"""
+    dlat = km / KM_PER_DEGREE
+    lat_min, lat_max = lat - dlat, lat + dlat
+    if lat_min <= -90 or lat_max >= 90:
+        return max(lat_min, -90.0), -180.0, min(lat_max, 90.0), 180.0
+    dlon = dlat / np.cos(np.radians(max(abs(lat_min), abs(lat_max))))
+    if dlon >= 180:
+        return lat_min, -180.0, lat_max, 180.0
+    return lat_min, lon - dlon, lat_max, lon + dlon
+
+
+def in_bbox(lats, lons, lat_min, lon_min, lat_max, lon_max):
+    """Mặt nạ các điểm nằm trong hình chữ nhật (NaN là không nằm trong)"""
+    return (lats >= lat_min) & (lats <= lat_max) & (lons >= lon_min) & (lons <= lon_max)
+
+
+class SpatialIndex:
+    def __init__(self, lats, lons):
+        self.lats = np.array(lats, dtype=np.float64)
+        self.lons = np.array(lons, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnan(self.lats) | np.isnan(self.lons)))
+        self.size = len(valid)
+        if not self.size:
+            self.nx = self.ny = 1
+            self.lat0 = self.lon0 = 0.0
+            self.cell_lat = self.cell_lon = 1.0
+            self.order = valid
+            self.offsets = np.zeros(2, dtype=np.int64)
+            return
+        lats, lons = self.lats[valid], self.lons[valid]
+        self.lat0, self.lon0 = float(lats.min()), float(lons.min())
+        height = max(float(lats.max()) - self.lat0, 1e-9)
+        width = max(float(lons.max()) - self.lon0, 1e-9)
+        # Số ô theo tỉ lệ phạm vi dữ liệu, khoảng POINTS_PER_CELL điểm mỗi ô
+        cells = max(1.0, self.size / POINTS_PER_CELL)
+        self.nx = max(1, min(4096, int(round(np.sqrt(cells * width / height)))))
+        self.ny = max(1, min(4096, int(round(cells / self.nx))))
+        self.cell_lat = height / self.ny
+        self.cell_lon = width / self.nx
+        cell_ids = self._cell_y(lats) * self.nx + self._cell_x(lons)
+        sort = np.argsort(cell_ids, kind="stable")
+        self.order = valid[sort]
+        self.offsets = np.searchsorted(cell_ids[sort], np.arange(self.nx * self.ny + 1))
+
+    def _cell_x(self, lons):
+        return np.clip(((lons - self.lon0) / self.cell_lon).astype(np.int64), 0, self.nx - 1)
+
+    def _cell_y(self, lats):
+        return np.clip(((lats - self.lat0) / self.cell_lat).astype(np.int64), 0, self.ny - 1)
+
+    def _candidates(self, lat_min, lon_min, lat_max, lon_max):
+        """Id các điểm trong các ô giao với hình chữ nhật"""
+        if (not self.size or lat_max < self.lat0 or lon_max < self.lon0
+                or lat_min > self.lat0 + self.cell_lat * self.ny or lon_min > self.lon0 + self.cell_lon * self.nx):
+            return np.zeros(0, dtype=np.int64)
+        x0, x1 = self._cell_x(np.array([lon_min, lon_max]))
+        y0, y1 = self._cell_y(np.array([lat_min, lat_max]))
+        rows = np.arange(y0, y1 + 1) * self.nx
+        return np.concatenate([self.order[self.offsets[row + x0]:self.offsets[row + x1 + 1]] for row in rows])
+
+    def bbox(self, lat_min, lon_min, lat_max, lon_max):
+        """Id (tăng dần) các điểm trong hình chữ nhật"""
+        ids = self._candidates(lat_min, lon_min, lat_max, lon_max)
+        ids = ids[in_bbox(self.lats[ids], self.lons[ids], lat_min, lon_min, lat_max, lon_max)]
+        return np.sort(ids)
+
+    def radius(self, lat, lon, km):
+        """Id (tăng dần) các điểm cách (lat, lon) không quá km"""
+        ids = self._candidates(*radius_box(lat, lon, km))
+        ids = ids[haversine_km(lat, lon, self.lats[ids], self.lons[ids]) <= km]
+        return np.sort(ids)
+
+    def nearest(self, lat, lon, count, allowed=None):
+        """Id count điểm gần (lat, lon) nhất, gần trước; allowed: mặt nạ các dòng được chọn"""
+        if not self.size or count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        # Mở rộng vùng tìm đến khi điểm thứ count nằm trong hình tròn chắc chắn đã được xét hết;
+        # bắt đầu từ ô gần nhất của lưới nếu điểm nằm ngoài phạm vi dữ liệu
+        outside_x = max(self.lon0 - lon, lon - self.lon0 - self.cell_lon * self.nx, 0) / self.cell_lon
+        outside_y = max(self.lat0 - lat, lat - self.lat0 - self.cell_lat * self.ny, 0) / self.cell_lat
+        reach = int(np.ceil(max(outside_x, outside_y))) + 1
+        while True:
+            lat_min, lat_max = lat - reach * self.cell_lat, lat + reach * self.cell_lat
+            lon_min, lon_max = lon - reach * self.cell_lon, lon + reach * self.cell_lon
+            covers_all = (lat_min <= self.lat0 and lon_min <= self.lon0
+                          and lat_max >= self.lat0 + self.cell_lat * self.ny
+                          and lon_max >= self.lon0 + self.cell_lon * self.nx)
+            ids = self._candidates(lat_min, lon_min, lat_max, lon_max)
+            if allowed is not None:
+                ids = ids[allowed[ids]]
+            if len(ids) < count and not covers_all:
+                reach *= 2
+                continue
+            distances = haversine_km(lat, lon, self.lats[ids], self.lons[ids])
+            order = _smallest(distances, ids, count)
+            edge_lat = min(max(abs(lat_min), abs(lat_max)), 90.0)
+            safe_km = min(self.cell_lat, self.cell_lon * np.cos(np.radians(edge_lat))) * reach * KM_PER_DEGREE
+            if covers_all or distances[order[-1]] <= safe_km:
+                return ids[order]
+            # Đủ điểm nhưng điểm thứ count có thể xa hơn vùng đã xét: nới vùng tới khoảng cách đó
+            reach = max(reach * 2 if safe_km <= 0 else int(np.ceil(reach * distances[order[-1]] / safe_km)),
+                        reach + 1)
+
+
+def _smallest(distances, ids, count):
+    """Vị trí của count khoảng cách nhỏ nhất, tăng dần (bằng nhau thì id nhỏ trước)"""
+    if len(distances) > count:
+        # Chỉ sắp xếp các ứng viên không xa hơn khoảng cách thứ count (argpartition là O(n))
+        kth = distances[np.argpartition(distances, count - 1)[count - 1]]
+        candidates = np.flatnonzero(distances <= kth)
+        return candidates[np.lexsort((ids[candidates], distances[candidates]))][:count]
+    return np.lexsort((ids, distances))
+
+
+def spatial_index(store, lat_col, lon_col):
+    """SpatialIndex của cột Latitude/Longitude, cache trong store và dựng lại khi store có thêm dòng"""
+    with store.lock:
+        key = ("spatial_index", lat_col, lon_col)
+        index = store.cache.get(key)
+        if index is None:
+            index = store.cache[key] = SpatialIndex(np.frombuffer(store.sort_values(lat_col)[0], dtype=np.float64),
+                                                     np.frombuffer(store.sort_values(lon_col)[0], dtype=np.float64))
+        return index
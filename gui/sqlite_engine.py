@@ -0,0 +1,413 @@
+"""Engine lưu trữ SQLite (tùy chọn) cho bảng Query.
+
+Bật bằng biến môi trường OSDU_STORAGE=sqlite. Mỗi loại dữ liệu là một bảng
+SQLite (cột số kiểu REAL có index) kèm một bảng FTS5 tokenizer trigram chứa
+text hiển thị của cả dòng để tìm keyword theo chuỗi con. Keyword và biểu thức
+lọc của tab Query được dịch sang WHERE; kết quả lọc (SqlRowIds) chỉ giữ số
+dòng và vài trang id gần nhất, mỗi trang đọc bằng keyset (id > id cuối trang
+trước) nên lật trang không phụ thuộc độ lớn dữ liệu và bộ nhớ không tăng theo
+số dòng.
+"""
+import itertools
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+
+from .column_store import NAN, format_number, row_id_array
+from .query_filter import _value_test
+from .schema import TEXT, NUMBER, CATEGORY, ColumnSpec
+from .spatial_index import LATITUDE, LONGITUDE, haversine_km, radius_box
+
+PAGE_ROWS = 200       # số id mỗi lần đọc trang
+CACHED_PAGES = 8      # số trang id giữ lại cho mỗi kết quả lọc
+CACHED_ROWS = 5000    # số dòng (giá trị hiển thị) giữ lại cho mỗi bảng
+IN_CHUNK = 500        # số id mỗi câu "id IN (...)"
+SEPARATOR = "\x1f"    # ngăn cách các ô trong text tìm kiếm: keyword không khớp qua hai ô
+MIN_MATCH_LENGTH = 3  # keyword ngắn hơn trigram thì quét text thay vì dùng MATCH
+MAX_IN_VALUES = 10000  # số giá trị tối đa trong một điều kiện IN (...) trên cột category
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _parse_number(text, unit):
+    """(số, None) nếu đọc được, (None, chuỗi gốc hoặc None) nếu không — như ColumnStore"""
+    text = text.strip()
+    try:
+        return float(text[:-len(unit)] if unit and text.endswith(unit) else text), None
+    except ValueError:
+        return None, text or None
+
+
+class SqliteEngine:
+    """Một file SQLite chứa các bảng của các loại dữ liệu; mỗi thread dùng connection riêng"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._local.connection = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")  # thread GUI đọc trong lúc thread load ghi
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def table(self, data_type, schema):
+        """Tạo (lại) bảng rỗng cho loại dữ liệu"""
+        return SqliteTable(self, data_type, schema)
+
+
+class SqliteTable:
+    """Bảng dữ liệu trên SQLite với giao diện đọc/ghi như ColumnStore (append_rows, display, ...)"""
+
+    def __init__(self, engine, data_type, schema):
+        self.engine = engine
+        self.data_type = data_type
+        self.schema = [spec if isinstance(spec, ColumnSpec) else ColumnSpec(spec, TEXT, "") for spec in schema]
+        self.columns = [spec.name for spec in self.schema]
+        self.lock = threading.RLock()
+        self.name = _quote(data_type)
+        self.fts = _quote(f"{data_type} fts")
+        self._index = {col: i for i, col in enumerate(self.columns)}
+        self._row_count = 0
+        self._rows = OrderedDict()  # id dòng -> giá trị hiển thị (cache LRU)
+        self.cache = {}  # cấu trúc dẫn xuất (thứ tự sắp xếp...), xóa khi thêm dòng
+        self._column_values = {}  # cột -> (giá trị/mã từng dòng, bảng mã) đã đọc cho sort_values
+        # Cột số: c<i> REAL (có index cho điều kiện khoảng) và r<i> chuỗi gốc không đọc
+        # được thành số; cột khác: c<i> TEXT
+        definitions = []
+        for col, spec in enumerate(self.schema):
+            definitions += [f"c{col} REAL", f"r{col} TEXT"] if spec.kind == NUMBER else [f"c{col} TEXT"]
+        self._fields = [definition.split()[0] for definition in definitions]
+        self.select_fields = ", ".join(f"{self.name}.{field}" for field in ["id"] + self._fields)
+        self._create(definitions)
+
+    def _create(self, definitions):
+        conn = self.engine.connection()
+        conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        conn.execute(f"DROP TABLE IF EXISTS {self.fts}")
+        conn.execute(f"CREATE TABLE {self.name} (id INTEGER PRIMARY KEY, {', '.join(definitions)})")
+        for col, spec in enumerate(self.schema):
+            if spec.kind == NUMBER:
+                conn.execute(f"CREATE INDEX {_quote(f'{self.data_type} c{col}')} ON {self.name} (c{col})")
+        conn.execute(f"CREATE VIRTUAL TABLE {self.fts} USING fts5(text, tokenize='trigram')")
+        conn.commit()
+
+    def __len__(self):
+        return self._row_count
+
+    def column_index(self, name):
+        return self._index[name]
+
+    def append_batch(self, batch):
+        """Ghi các dòng của một ColumnBatch (gui.parse_pool)"""
+        return self.append_rows(batch.rows())
+
+    def append_rows(self, rows):
+        """Ghi các dòng mới (một transaction), trả về range id của các dòng vừa thêm"""
+        with self.lock:
+            start = self._row_count
+            self.cache.clear()
+            records = []
+            texts = []
+            for row_id, row in enumerate(rows, start):
+                record = [row_id]
+                shown = []
+                for col, spec in enumerate(self.schema):
+                    text = str(row[col])
+                    if spec.kind == NUMBER:
+                        number, raw = _parse_number(text, spec.unit)
+                        record += [number, raw]
+                        shown.append(raw or "" if number is None else format_number(number) + spec.unit)
+                    else:
+                        record.append(text)
+                        shown.append(text)
+                records.append(record)
+                texts.append((row_id, SEPARATOR.join(shown).lower()))
+            conn = self.engine.connection()
+            placeholders = ", ".join("?" * (len(self._fields) + 1))
+            conn.executemany(f"INSERT INTO {self.name} VALUES ({placeholders})", records)
+            conn.executemany(f"INSERT INTO {self.fts} (rowid, text) VALUES (?, ?)", texts)
+            conn.commit()
+            self._row_count = start + len(rows)
+            return range(start, self._row_count)
+
+    def _display_row(self, record):
+        """Giá trị hiển thị của một bản ghi SQLite (không gồm cột id)"""
+        shown = []
+        values = iter(record)
+        for spec in self.schema:
+            value = next(values)
+            if spec.kind == NUMBER:
+                raw = next(values)
+                shown.append(raw or "" if value is None else format_number(value) + spec.unit)
+            else:
+                shown.append(value)
+        return shown
+
+    def _remember(self, records):
+        rows = self._rows
+        for record in records:
+            rows[record[0]] = self._display_row(record[1:])
+            rows.move_to_end(record[0])
+        while len(rows) > CACHED_ROWS:
+            rows.popitem(last=False)
+
+    def _fetch_rows(self, row_ids):
+        """Đọc các dòng chưa có trong cache; trả về dict id -> giá trị hiển thị"""
+        missing = [row for row in dict.fromkeys(row_ids) if row not in self._rows]
+        found = {}
+        conn = self.engine.connection()
+        for i in range(0, len(missing), IN_CHUNK):
+            chunk = missing[i:i + IN_CHUNK]
+            for record in conn.execute(f"SELECT {self.select_fields} FROM {self.name} WHERE id IN "
+                                       f"({', '.join('?' * len(chunk))})", chunk):
+                found[record[0]] = self._display_row(record[1:])
+        return found
+
+    def display(self, row, col):
+        """Giá trị hiển thị (chuỗi) của một ô"""
+        shown = self._rows.get(row)
+        if shown is None:
+            shown = self._fetch_rows([row])[row]
+        return shown[col]
+
+    def display_column(self, col, row_ids):
+        """Giá trị hiển thị của một cột cho nhiều dòng (đọc theo lô, không qua cache dòng)"""
+        cached = self._rows
+        found = self._fetch_rows(row_ids)
+        return [(cached.get(row) or found[row])[col] for row in row_ids]
+
+    def row(self, row):
+        return list(self._rows.get(row) or self._fetch_rows([row])[row])
+
+    def number_column(self, col, row_ids):
+        """Giá trị số (NaN nếu trống) của cột số cho các dòng, dùng khi xuất Parquet/Arrow"""
+        values = {}
+        conn = self.engine.connection()
+        for i in range(0, len(row_ids), IN_CHUNK):
+            chunk = list(row_ids[i:i + IN_CHUNK])
+            values.update(conn.execute(f"SELECT id, c{col} FROM {self.name} WHERE id IN "
+                                       f"({', '.join('?' * len(chunk))})", chunk))
+        return [float("nan") if values[row] is None else values[row] for row in row_ids]
+
+    def set_number_column(self, col, values):
+        """Thay toàn bộ giá trị của cột số (cột tính toán như TVD); values: mảng float, NaN = trống"""
+        with self.lock:
+            if len(values) != self._row_count:
+                raise ValueError(f"{self.columns[col]}: cần {self._row_count} giá trị, nhận {len(values)}")
+            conn = self.engine.connection()
+            conn.executemany(f"UPDATE {self.name} SET c{col} = ?, r{col} = NULL WHERE id = ?",
+                             ((None if value != value else value, row_id)
+                              for row_id, value in enumerate(values.tolist())))
+            conn.commit()
+            self._rows.clear()
+            self._column_values.pop(col, None)
+            self.cache.clear()
+
+    def sort_values(self, col):
+        """Dữ liệu để sắp xếp/nhóm theo cột, cùng dạng ColumnStore.sort_values.
+
+        Cột được đọc một lần và giữ lại, các lần sau chỉ đọc thêm các dòng mới.
+        """
+        with self.lock:
+            values, codes = self._column_values.get(col) or self._column_values.setdefault(
+                col, (array('d'), None) if self.schema[col].kind == NUMBER else (array('I'), {}))
+            cursor = self.engine.connection().execute(
+                f"SELECT c{col} FROM {self.name} WHERE id >= ? AND id < ? ORDER BY id",
+                (len(values), self._row_count))
+            if codes is None:
+                values.extend(NAN if value is None else value for value, in cursor)
+                return values, None
+            values.extend(codes.setdefault(value, len(codes)) for value, in cursor)
+            return values, list(codes)
+
+    def select(self, keyword, query=None, start=0, stop=None):
+        """Kết quả lọc (SqlRowIds) các dòng có id trong [start, stop) khớp keyword và biểu thức"""
+        stop = self._row_count if stop is None else stop
+        source, key = self.name, f"{self.name}.id"
+        where = []
+        params = []
+        if keyword:
+            # Bảng FTS là bảng chính của truy vấn: khoảng id và thứ tự được đẩy xuống FTS5
+            source = f"{self.fts} CROSS JOIN {self.name} ON {self.name}.id = {self.fts}.rowid"
+            key = f"{self.fts}.rowid"
+            if len(keyword) >= MIN_MATCH_LENGTH:
+                where.append(f"{self.fts} MATCH ?")
+                params.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                where.append(f"instr({self.fts}.text, ?) > 0")
+                params.append(keyword)
+        if query is not None and query.tree is not None:
+            # Hàm Python của biểu thức dùng tên cố định theo vị trí (osdu_test_0, _1...):
+            # create_function ghi đè hàm của biểu thức trước thay vì giữ lại trên kết nối cả phiên
+            sql, query_params = self._compile(query.tree, query.columns, itertools.count())
+            where.append(f"({sql})")
+            params += query_params
+        rows = SqlRowIds(self, _Segment(source, key, " AND ".join(where), params, start, stop))
+        if query is not None and query.nearest is not None:
+            # nearest(...): chọn trên chỉ mục không gian trong bộ nhớ, trả về array id theo khoảng cách
+            candidates = None if len(rows) == len(self) else rows[:]
+            return row_id_array(query.nearest_ids(self, candidates))
+        return rows
+
+    def _compile(self, node, columns, slots):
+        """Dịch cây biểu thức của query_filter sang (WHERE, tham số); slots: số thứ tự hàm Python tiếp theo"""
+        kind = node[0]
+        if kind in ("and", "or"):
+            parts = [self._compile(child, columns, slots) for child in node[1]]
+            return (f" {kind.upper()} ".join(f"({sql})" for sql, _ in parts),
+                    [param for _, params in parts for param in params])
+        if kind == "not":
+            # NULL (ô số trống) tính là không thỏa, như NaN trong bộ lọc NumPy
+            sql, params = self._compile(node[1], columns, slots)
+            return f"NOT coalesce(({sql}), 0)", params
+        if kind == "spatial":
+            return self._compile_spatial(node[1], columns, slots)
+        predicate = node[1]
+        col = columns[predicate.column]
+        spec = self.schema[col]
+        op = predicate.op
+        column = f"{self.name}.c{col}"
+        if spec.kind == NUMBER and op != "contains":
+            numbers = predicate.numbers
+            if op == "between":
+                return f"{column} BETWEEN ? AND ?", numbers[:2]
+            if op == "in":
+                return f"{column} IN ({', '.join('?' * len(numbers))})", list(numbers)
+            return f"{column} {'<>' if op == '!=' else op} ?", numbers[:1]
+        # Điều kiện chuỗi: dùng đúng hàm kiểm tra của bộ lọc NumPy (so sánh ngày, không phân biệt hoa thường)
+        test = _value_test(predicate)
+        conn = self.engine.connection()
+        if spec.kind == CATEGORY:
+            # Kiểm tra một lần cho mỗi giá trị khác nhau rồi lọc bằng IN thay vì gọi Python cho từng dòng
+            values = [value for value, in conn.execute(f"SELECT DISTINCT c{col} FROM {self.name}")]
+            matched = [value for value in values if test(value)]
+            if not matched or len(matched) == len(values):
+                return ("1" if matched else "0"), []
+            if len(matched) <= MAX_IN_VALUES:
+                return f"{column} IN ({', '.join('?' * len(matched))})", matched
+            rest = [value for value in values if not test(value)]
+            if len(rest) <= MAX_IN_VALUES:
+                return f"{column} NOT IN ({', '.join('?' * len(rest))})", rest
+        name = f"osdu_test_{next(slots)}"
+        if spec.kind == NUMBER:
+            unit = spec.unit
+            conn.create_function(
+                name, 2, lambda value, raw: test(raw or "" if value is None else format_number(value) + unit),
+                deterministic=True)
+            return f"{name}({column}, {self.name}.r{col})", []
+        conn.create_function(name, 1, test, deterministic=True)
+        return f"{name}({column})", []
+
+    def _compile_spatial(self, predicate, columns, slots):
+        """bbox/radius: khoảng trên cột Latitude (có index) và Longitude, radius kiểm tra thêm khoảng cách"""
+        lat = f"{self.name}.c{columns[LATITUDE]}"
+        lon = f"{self.name}.c{columns[LONGITUDE]}"
+        if predicate.op == "bbox":
+            lat_min, lon_min, lat_max, lon_max = predicate.numbers
+            return f"{lat} BETWEEN ? AND ? AND {lon} BETWEEN ? AND ?", [lat_min, lat_max, lon_min, lon_max]
+        center_lat, center_lon, km = predicate.numbers
+        lat_min, lon_min, lat_max, lon_max = radius_box(center_lat, center_lon, km)
+        name = f"osdu_test_{next(slots)}"
+        self.engine.connection().create_function(
+            name, 2, lambda a, b: float(haversine_km(center_lat, center_lon, a, b)) <= km, deterministic=True)
+        return (f"{lat} BETWEEN ? AND ? AND {lon} BETWEEN ? AND ? AND {name}({lat}, {lon})",
+                [lat_min, lat_max, lon_min, lon_max])
+
+
+class _Segment:
+    """Một khoảng id [start, stop) của kết quả lọc với câu truy vấn tương ứng"""
+
+    def __init__(self, source, key, where, params, start, stop):
+        self.source = source  # mệnh đề FROM
+        self.key = key        # cột id dùng cho khoảng, thứ tự và keyset
+        self.where = where
+        self.params = params
+        self.start = start
+        self.stop = stop
+        self.count = None
+
+    def query(self, fields, extra=""):
+        return (f"SELECT {fields} FROM {self.source} WHERE {self.where + ' AND ' if self.where else ''}"
+                f"{self.key} >= ? AND {self.key} < ?{extra}")
+
+
+class SqlRowIds:
+    """Kết quả lọc trên SQLite, dùng thay array id dòng (len, truy cập theo vị trí, cắt, extend).
+
+    Chỉ đếm số dòng khớp; id được đọc theo trang PAGE_ROWS khi cần hiển thị.
+    Trang kề một trang đã đọc dùng keyset nên chi phí không phụ thuộc vị trí.
+    """
+
+    def __init__(self, table, segment):
+        self.table = table
+        if not segment.where:
+            segment.count = max(0, segment.stop - segment.start)
+        else:
+            sql = segment.query("count(*)")
+            segment.count = table.engine.connection().execute(
+                sql, segment.params + [segment.start, segment.stop]).fetchone()[0]
+        self._segments = [segment] if segment.count else []
+        self._pages = OrderedDict()  # (đoạn, số trang) -> array id
+
+    def __len__(self):
+        return sum(segment.count for segment in self._segments)
+
+    def extend(self, other):
+        """Nối kết quả của khoảng id tiếp theo (do _filter_rows trả về cho các dòng mới load)"""
+        self._segments.extend(other._segments)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return self._ids()[position]
+        if position < 0:
+            position += len(self)
+        for number, segment in enumerate(self._segments):
+            if 0 <= position < segment.count:
+                page = self._page(number, position // PAGE_ROWS)
+                return page[position % PAGE_ROWS]
+            position -= segment.count
+        raise IndexError("SqlRowIds index out of range")
+
+    def __iter__(self):
+        return iter(self._ids())
+
+    def _page(self, number, page_number):
+        key = (number, page_number)
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            return page
+        segment = self._segments[number]
+        fields = self.table.select_fields
+        params = segment.params + [segment.start, segment.stop]
+        conn = self.table.engine.connection()
+        previous = self._pages.get((number, page_number - 1))
+        following = self._pages.get((number, page_number + 1))
+        if previous is not None:
+            sql = segment.query(fields, f" AND {segment.key} > ? ORDER BY {segment.key} LIMIT ?")
+            records = conn.execute(sql, params + [previous[-1], PAGE_ROWS]).fetchall()
+        elif following is not None:
+            sql = segment.query(fields, f" AND {segment.key} < ? ORDER BY {segment.key} DESC LIMIT ?")
+            records = conn.execute(sql, params + [following[0], PAGE_ROWS]).fetchall()[::-1]
+        else:
+            sql = segment.query(fields, f" ORDER BY {segment.key} LIMIT ? OFFSET ?")
+            records = conn.execute(sql, params + [PAGE_ROWS, page_number * PAGE_ROWS]).fetchall()
+        self.table._remember(records)
+        page = self._pages[key] = array('q', (record[0] for record in records))
+        while len(self._pages) > CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+    def _ids(self):
+        """Toàn bộ id khớp (array('q')), dùng khi xuất dữ liệu"""
+        ids = array('q')
+        conn = self.table.engine.connection()
+        for segment in self._segments:
+            sql = segment.query(segment.key, f" ORDER BY {segment.key}")
+            ids.extend(row_id for row_id, in conn.execute(sql, segment.params + [segment.start, segment.stop]))
+        return ids
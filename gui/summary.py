@@ -0,0 +1,130 @@
+"""Bảng tổng hợp (group-by) trên kết quả lọc của tab Query.
+
+Mỗi loại dữ liệu có một cột nhóm (cột category) và các cột số lấy min/max.
+Số dòng, min và max của từng nhóm được tính bằng NumPy (bincount, fmin.at,
+fmax.at) trên mã category của các dòng trong kết quả lọc. Khi kết quả có thêm
+dòng (batch load, import) chỉ các dòng mới được cộng vào; khi bộ lọc thu hẹp
+kết quả thì trừ các dòng bị loại và chỉ tính lại min/max của các nhóm có giá
+trị biên bị loại.
+"""
+from array import array
+
+import numpy as np
+
+# Loại dữ liệu -> (cột nhóm, các cột số lấy min/max)
+SUMMARIES = {
+    "WellLog": ("WellBore Name", ["Start Depth", "Stop Depth"]),
+    "Marker": ("Well Name", ["Depth"]),
+    "Seismic 2D": ("Processing Status", []),
+    "Seismic 3D": ("Processing Status", []),
+}
+
+
+class GroupSummary:
+    """Số dòng và min/max các cột số theo từng giá trị của cột nhóm"""
+
+    def __init__(self, store, group_column, measure_columns):
+        self.store = store
+        self.group_column = group_column
+        self.measure_columns = list(measure_columns)
+        self._group = store.column_index(group_column)
+        self._measures = [store.column_index(col) for col in measure_columns]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.mins = [np.zeros(0) for _ in self._measures]
+        self.maxs = [np.zeros(0) for _ in self._measures]
+
+    @property
+    def headers(self):
+        headers = [self.group_column, "Count"]
+        for col in self.measure_columns:
+            headers += [f"Min {col}", f"Max {col}"]
+        return headers
+
+    def reset(self, row_ids):
+        """Tính lại từ đầu trên toàn bộ kết quả lọc"""
+        with self.store.lock:
+            ids = _ids(row_ids)
+            self.counts, self.mins, self.maxs = self._aggregate(ids, self._group_count())
+
+    def extend(self, row_ids):
+        """Cộng thêm các dòng mới vào kết quả (id chưa có trong kết quả)"""
+        with self.store.lock:
+            groups = self._group_count()
+            self._resize(groups)
+            counts, mins, maxs = self._aggregate(_ids(row_ids), groups)
+            self.counts += counts
+            for i in range(len(self._measures)):
+                np.fmin(self.mins[i], mins[i], out=self.mins[i])
+                np.fmax(self.maxs[i], maxs[i], out=self.maxs[i])
+
+    def narrow(self, previous_ids, row_ids):
+        """Cập nhật khi kết quả lọc thu hẹp từ previous_ids xuống row_ids (tập con)"""
+        with self.store.lock:
+            kept = _ids(row_ids)
+            removed = np.setdiff1d(_ids(previous_ids), kept, assume_unique=True)
+            groups = self._group_count()
+            if len(kept) <= len(removed) or len(self.counts) != groups:
+                self.counts, self.mins, self.maxs = self._aggregate(kept, groups)
+                return
+            counts, mins, maxs = self._aggregate(removed, groups)
+            self.counts -= counts
+            # Nhóm mất dòng đang giữ min/max: tính lại riêng các nhóm đó trên các dòng còn lại
+            stale = np.zeros(groups, dtype=bool)
+            for i in range(len(self._measures)):
+                stale |= (mins[i] <= self.mins[i]) | (maxs[i] >= self.maxs[i])
+            if not stale.any():
+                return
+            codes = self._codes(kept)
+            selected = stale[codes]
+            _, new_mins, new_maxs = self._aggregate(kept[selected], groups, codes[selected])
+            for i in range(len(self._measures)):
+                self.mins[i][stale] = new_mins[i][stale]
+                self.maxs[i][stale] = new_maxs[i][stale]
+
+    def table(self):
+        """(nhãn nhóm, cột giá trị) của các nhóm có dòng, nhiều dòng trước"""
+        with self.store.lock:
+            categories = self.store.sort_values(self._group)[1]
+            groups = np.flatnonzero(self.counts)
+            groups = groups[np.argsort(-self.counts[groups], kind="stable")]
+            labels = [categories[code] for code in groups]
+        columns = [self.counts[groups]]
+        for i in range(len(self._measures)):
+            columns += [self.mins[i][groups], self.maxs[i][groups]]
+        return labels, columns
+
+    def _group_count(self):
+        return len(self.store.sort_values(self._group)[1])
+
+    def _codes(self, ids):
+        return np.frombuffer(self.store.sort_values(self._group)[0], dtype=np.uint32)[ids]
+
+    def _aggregate(self, ids, groups, codes=None):
+        """(số dòng, min, max) của từng nhóm trên các dòng ids"""
+        codes = self._codes(ids) if codes is None else codes
+        counts = np.bincount(codes, minlength=groups).astype(np.int64)
+        mins, maxs = [], []
+        for col in self._measures:
+            values = np.frombuffer(self.store.sort_values(col)[0], dtype=np.float64)[ids]
+            low = np.full(groups, np.nan)
+            high = np.full(groups, np.nan)
+            np.fmin.at(low, codes, values)  # fmin/fmax bỏ qua NaN (ô trống)
+            np.fmax.at(high, codes, values)
+            mins.append(low)
+            maxs.append(high)
+        return counts, mins, maxs
+
+    def _resize(self, groups):
+        """Nới các mảng khi cột nhóm có thêm giá trị mới"""
+        extra = groups - len(self.counts)
+        if extra > 0:
+            self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int64)])
+            self.mins = [np.concatenate([values, np.full(extra, np.nan)]) for values in self.mins]
+            self.maxs = [np.concatenate([values, np.full(extra, np.nan)]) for values in self.maxs]
+
+
+def _ids(row_ids):
+    """Id dòng dạng mảng NumPy (bản sao) từ array('q') hoặc SqlRowIds"""
+    if not isinstance(row_ids, array):
+        row_ids = row_ids[:]
+    return np.frombuffer(row_ids, dtype=np.int64).copy()
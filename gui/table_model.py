@@ -0,0 +1,122 @@
+from array import array
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from .column_store import format_number
+from .schema import DISPLAY_DECIMALS
+
+
+class DataTableModel(QAbstractTableModel):
+    """Model ảo cho bảng Query: chỉ đọc dữ liệu của các ô đang hiển thị"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.row_ids = array('q')
+        self.column_map = []
+        self.decimals = []  # số chữ số thập phân hiển thị của từng cột (None: như store.display)
+        self.headers = []
+        self.offset = 0
+        self.limit = None
+
+    def set_source(self, store, row_ids, columns):
+        """Gán dữ liệu nguồn, danh sách id dòng đã lọc và các cột (ẩn/hiện cột do view đảm nhận)"""
+        self.beginResetModel()
+        self.store = store
+        self.row_ids = row_ids
+        self.headers = list(columns)
+        self.column_map = [store.column_index(col) for col in columns] if store is not None else []
+        self.decimals = [DISPLAY_DECIMALS.get(col) for col in columns]
+        self.endResetModel()
+
+    def set_window(self, offset, limit):
+        """Chỉ hiển thị một trang (limit=None để cuộn toàn bộ kết quả)"""
+        self.beginResetModel()
+        self.offset = offset
+        self.limit = limit
+        self.endResetModel()
+
+    def append_row_ids(self, row_ids):
+        """Nối thêm id dòng vào cuối kết quả mà không reset view"""
+        first = self.rowCount()
+        remaining = max(0, len(self.row_ids) + len(row_ids) - self.offset)
+        last = (remaining if self.limit is None else min(self.limit, remaining)) - 1
+        if self.store is None or last < first:
+            self.row_ids.extend(row_ids)
+            return
+        self.beginInsertRows(QModelIndex(), first, last)
+        self.row_ids.extend(row_ids)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_source(None, array('q'), [])
+
+    def row_id(self, view_row):
+        """Chuyển chỉ số dòng trên view thành id dòng trong ColumnStore"""
+        return self.row_ids[self.offset + view_row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None:
+            return 0
+        remaining = max(0, len(self.row_ids) - self.offset)
+        return remaining if self.limit is None else min(self.limit, remaining)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.column_map)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        text = self.store.display(self.row_id(index.row()), self.column_map[index.column()])
+        decimals = self.decimals[index.column()]
+        if decimals is None or not text:
+            return text
+        return format_number(round(float(text), decimals))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else QVariant()
+        return str(self.offset + section + 1)
+
+
+class SummaryTableModel(QAbstractTableModel):
+    """Model cho bảng tổng hợp: nhãn nhóm và các cột số (mảng NumPy) của GroupSummary.table"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.labels = []
+        self.columns = []
+
+    def set_table(self, headers, labels, columns):
+        self.beginResetModel()
+        self.headers = list(headers)
+        self.labels = labels
+        self.columns = columns
+        self.endResetModel()
+
+    def clear(self):
+        self.set_table([], [], [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.labels)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        if index.column() == 0:
+            return self.labels[index.row()]
+        number = float(self.columns[index.column() - 1][index.row()])
+        return "" if number != number else format_number(number)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else QVariant()
+        return str(section + 1)
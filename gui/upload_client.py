@@ -0,0 +1,399 @@
+"""Upload file lên storage theo từng phần (multipart): song song, có checksum, tiếp tục được khi bị ngắt.
+
+Giao thức với storage (server giả lập: tools/mock_storage_server.py):
+
+    POST /uploads                 {"name", "size", "part_size"} -> {"upload_id"}
+    GET  /uploads/<id>            -> {"parts": {"<số phần>": "<sha256>"}} các phần đã nhận
+    PUT  /uploads/<id>/parts/<n>  dữ liệu phần n, header X-Checksum-SHA256 (server kiểm tra)
+    POST /uploads/<id>/complete   {"parts": số phần, "sha256": checksum tổng} -> {"location"}
+
+Checksum tổng là sha256 của các sha256 từng phần nối theo thứ tự (không phải
+đọc lại cả file). Mỗi file được chia phần part_size byte, concurrency phần
+được đọc và gửi cùng lúc qua các kết nối HTTP keep-alive dùng chung
+(ConnectionPool); phần lỗi mạng/5xx được gửi lại vài lần. Upload dở được ghi
+vào một file journal (đường dẫn, kích thước, mtime -> upload_id): lần upload
+sau của cùng file hỏi server các phần đã nhận, kiểm tra lại checksum với file
+trên máy và chỉ gửi các phần còn thiếu.
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .instrumentation import instruments
+
+UPLOAD_PATH = "/uploads"
+DEFAULT_PART_SIZE = 8 * 2**20
+DEFAULT_CONCURRENCY = 4
+MAX_RETRIES = 3
+RETRY_DELAY = 0.5  # giây, nhân đôi sau mỗi lần thử lại
+MAX_FILES = 2  # số file upload cùng lúc (mỗi file dùng concurrency kết nối)
+PROGRESS_INTERVAL = 0.2  # giây giữa hai lần báo tiến độ lên GUI
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadCancelled(UploadError):
+    pass
+
+
+class ConnectionPool:
+    """Các kết nối HTTP(S) keep-alive tới một server, dùng lại giữa các request và các thread"""
+
+    def __init__(self, base_url, size=DEFAULT_CONCURRENCY, timeout=60):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"URL storage không hợp lệ: {base_url}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.prefix = url.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self.opened = 0  # số kết nối đã mở (để kiểm tra việc dùng lại)
+
+    def request(self, method, path, body=None, headers=None):
+        """Gửi request, trả về (mã HTTP, nội dung); lỗi mạng thì kết nối bị bỏ và lỗi được ném lại"""
+        conn = self._acquire()
+        try:
+            conn.request(method, self.prefix + path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close or self._idle.qsize() >= self.size:
+            conn.close()
+        else:
+            self._idle.put(conn)
+        return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        import http.client  # chỉ cần khi upload lần đầu
+        connection = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        self.opened += 1
+        return connection(self.host, self.port, timeout=self.timeout)
+
+
+class UploadClient:
+    """Upload file theo phần lên storage base_url; state_dir chứa journal của các upload dở"""
+
+    def __init__(self, base_url, state_dir, token=None, partition="opendes",
+                 part_size=DEFAULT_PART_SIZE, concurrency=DEFAULT_CONCURRENCY, timeout=60):
+        self.base_url = base_url
+        self.state_dir = state_dir
+        self.token = token
+        self.partition = partition
+        self.part_size = max(int(part_size), 1)
+        self.concurrency = max(int(concurrency), 1)
+        self.pool = ConnectionPool(base_url, self.concurrency * MAX_FILES, timeout)
+
+    def upload(self, path, progress=None, cancelled=None):
+        """Upload một file, trả về location trên storage.
+
+        progress(đã gửi, tổng, đã có từ trước) được gọi từ các thread upload sau mỗi phần;
+        cancelled: threading.Event để dừng (journal được giữ để upload tiếp lần sau).
+        """
+        from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+        stat = os.stat(path)
+        size = stat.st_size
+        upload_id, part_size, received = self._resume_or_create(path, stat)
+        count = max(-(-size // part_size), 1)
+        hashes = [None] * count
+        # Phần server đã nhận: đọc lại trên máy để chắc là cùng dữ liệu, khác thì gửi lại
+        for number, digest in received.items():
+            if number < count and self._read_part(path, number, part_size, size)[1] == digest:
+                hashes[number] = digest
+        resumed = sum(min(part_size, size - number * part_size) for number, digest in enumerate(hashes) if digest)
+        remaining = [number for number, digest in enumerate(hashes) if digest is None]
+
+        lock = threading.Lock()
+        sent = [resumed]
+        stop = threading.Event()
+        if progress is not None:
+            progress(resumed, size, resumed)
+
+        def send(number):
+            if stop.is_set() or (cancelled is not None and cancelled.is_set()):
+                raise UploadCancelled("Đã hủy")
+            data, digest = self._read_part(path, number, part_size, size)
+            with instruments.stage("upload.part"):
+                self._put_part(upload_id, number, data, digest)
+            hashes[number] = digest
+            instruments.count("bytes uploaded", len(data))
+            with lock:
+                sent[0] += len(data)
+                done = sent[0]
+            if progress is not None:
+                progress(done, size, resumed)
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(len(remaining), 1))) as executor:
+            futures = [executor.submit(send, number) for number in remaining]
+            finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            errors = [future.exception() for future in finished if future.exception() is not None]
+            if errors:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+        if errors:
+            raise errors[0]
+
+        checksum = hashlib.sha256(b"".join(bytes.fromhex(digest) for digest in hashes)).hexdigest()
+        result = self._json("POST", f"{UPLOAD_PATH}/{upload_id}/complete", {"parts": count, "sha256": checksum})
+        self._forget(path)
+        return result.get("location", "")
+
+    def close(self):
+        self.pool.close()
+
+    def _resume_or_create(self, path, stat):
+        """(upload_id, part_size, {số phần: sha256 server đã nhận}) từ journal hoặc upload mới"""
+        journal = self._load_journal(path)
+        if journal and journal["size"] == stat.st_size and journal["mtime_ns"] == stat.st_mtime_ns:
+            status, data = self._request("GET", f"{UPLOAD_PATH}/{journal['upload_id']}")
+            if status == 200:
+                parts = json.loads(data).get("parts", {})
+                return journal["upload_id"], journal["part_size"], {int(n): digest for n, digest in parts.items()}
+            if status != 404:
+                raise UploadError(f"Storage trả về HTTP {status}: {data[:200].decode('utf-8', 'replace')}")
+        result = self._json("POST", UPLOAD_PATH, {"name": os.path.basename(path), "size": stat.st_size,
+                                                   "part_size": self.part_size})
+        self._save_journal(path, {"upload_id": result["upload_id"], "part_size": self.part_size,
+                                  "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+        return result["upload_id"], self.part_size, {}
+
+    @staticmethod
+    def _read_part(path, number, part_size, size):
+        offset = number * part_size
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(max(min(part_size, size - offset), 0))
+        return data, hashlib.sha256(data).hexdigest()
+
+    def _put_part(self, upload_id, number, data, digest):
+        import http.client
+        headers = {"Content-Type": "application/octet-stream", "X-Checksum-SHA256": digest}
+        delay = RETRY_DELAY
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                status, body = self._request("PUT", f"{UPLOAD_PATH}/{upload_id}/parts/{number}", data, headers)
+            except (OSError, http.client.HTTPException) as e:
+                error = UploadError(f"Phần {number}: {e or type(e).__name__}")
+            else:
+                if status < 300:
+                    return
+                error = UploadError(f"Phần {number}: HTTP {status} {body[:200].decode('utf-8', 'replace')}")
+                if status < 500 and status not in (408, 429):
+                    raise error  # lỗi không gửi lại được (checksum sai, upload không tồn tại...)
+            if attempt < MAX_RETRIES:
+                instruments.count("upload retries")
+                time.sleep(delay)
+                delay *= 2
+        raise error
+
+    def _json(self, method, path, body):
+        status, data = self._request(method, path, json.dumps(body).encode("utf-8"),
+                                     {"Content-Type": "application/json"})
+        if status >= 300:
+            raise UploadError(f"Storage trả về HTTP {status}: {data[:200].decode('utf-8', 'replace')}")
+        return json.loads(data or b"{}")
+
+    def _request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {}, **{"data-partition-id": self.partition})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return self.pool.request(method, path, body, headers)
+
+    def _journal_path(self, path):
+        key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"{key}.json")
+
+    def _load_journal(self, path):
+        try:
+            with open(self._journal_path(path), "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return journal if journal.get("path") == os.path.abspath(path) else None
+
+    def _save_journal(self, path, journal):
+        os.makedirs(self.state_dir, exist_ok=True)
+        journal_path = self._journal_path(path)
+        with open(journal_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(dict(journal, path=os.path.abspath(path)), f)
+        os.replace(journal_path + ".tmp", journal_path)
+
+    def _forget(self, path):
+        try:
+            os.remove(self._journal_path(path))
+        except OSError:
+            pass
+
+
+def create_upload_client(state_dir):
+    """UploadClient theo biến môi trường OSDU_UPLOAD_URL (None nếu không đặt), OSDU_TOKEN,
+    OSDU_UPLOAD_PART_MB và OSDU_UPLOAD_CONCURRENCY"""
+    base_url = os.environ.get("OSDU_UPLOAD_URL")
+    if not base_url:
+        return None
+    return UploadClient(base_url, state_dir, token=os.environ.get("OSDU_TOKEN"),
+                        part_size=float(os.environ.get("OSDU_UPLOAD_PART_MB", DEFAULT_PART_SIZE / 2**20)) * 2**20,
+                        concurrency=int(os.environ.get("OSDU_UPLOAD_CONCURRENCY", DEFAULT_CONCURRENCY)))
+
+
+class TransferMeter:
+    """Tốc độ (byte/giây, trung bình trong window giây gần nhất) và thời gian còn lại của một upload"""
+
+    def __init__(self, window=5.0):
+        self.window = window
+        self._samples = deque()  # (thời điểm, số byte đã gửi trong lượt này)
+
+    def update(self, sent, now=None):
+        now = time.perf_counter() if now is None else now
+        self._samples.append((now, sent))
+        while len(self._samples) > 2 and now - self._samples[1][0] > self.window:
+            self._samples.popleft()
+
+    def rate(self):
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (stop, last) = self._samples[0], self._samples[-1]
+        return (last - first) / (stop - start) if stop > start else 0.0
+
+    def eta(self, remaining):
+        rate = self.rate()
+        return remaining / rate if rate > 0 else None
+
+
+class UploadSignals(QObject):
+    progress = pyqtSignal(str, object)  # đường dẫn, (đã gửi, tổng, byte/giây, giây còn lại hoặc None)
+    finished = pyqtSignal(str, str)     # đường dẫn, location trên storage
+    failed = pyqtSignal(str, str)       # đường dẫn, thông báo lỗi
+
+
+class UploadWorker(QRunnable):
+    """Upload một file trên thread nền, báo tiến độ tối đa vài lần mỗi giây"""
+
+    def __init__(self, client, path, cancelled):
+        super().__init__()
+        self.client = client
+        self.path = path
+        self.cancelled = cancelled
+        self.signals = UploadSignals()
+        self.meter = TransferMeter()
+        self._lock = threading.Lock()
+        self._reported = 0.0
+
+    def run(self):
+        try:
+            with instruments.stage("upload.file"):
+                location = self.client.upload(self.path, self._on_progress, self.cancelled)
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e) or type(e).__name__)
+        else:
+            self.signals.finished.emit(self.path, location)
+
+    def _on_progress(self, sent, total, resumed):
+        now = time.perf_counter()
+        with self._lock:
+            self.meter.update(sent - resumed, now)
+            if now - self._reported < PROGRESS_INTERVAL and sent < total:
+                return
+            self._reported = now
+            rate = self.meter.rate()
+        self.signals.progress.emit(self.path, (sent, total, rate, self.meter.eta(total - sent)))
+
+
+class UploadManager(QObject):
+    """Hàng đợi upload các file của tab Import: tối đa MAX_FILES file cùng lúc"""
+
+    file_progress = pyqtSignal(str, object)
+    file_uploaded = pyqtSignal(str, str)
+    file_failed = pyqtSignal(str, str)
+    finished = pyqtSignal(int, int)  # số file đã upload, số file lỗi
+
+    def __init__(self, client, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(MAX_FILES)
+        self._running = set()
+        self._cancelled = threading.Event()
+        self._stats = [0, 0]
+
+    def is_running(self):
+        return bool(self._running)
+
+    def submit(self, paths):
+        if not self.is_running():
+            self._cancelled = threading.Event()
+            self._stats = [0, 0]
+        for path in paths:
+            if path in self._running:
+                continue
+            worker = UploadWorker(self.client, path, self._cancelled)
+            worker.signals.progress.connect(self.file_progress)
+            worker.signals.finished.connect(self._on_finished)
+            worker.signals.failed.connect(self._on_failed)
+            self._running.add(path)
+            self.pool.start(worker)
+
+    def cancel(self):
+        """Dừng các upload (phần đang gửi chạy nốt); upload tiếp được ở lần sau"""
+        self._cancelled.set()
+
+    def _on_finished(self, path, location):
+        self._running.discard(path)
+        self._stats[0] += 1
+        self.file_uploaded.emit(path, location)
+        self._finish_if_done()
+
+    def _on_failed(self, path, message):
+        self._running.discard(path)
+        self._stats[1] += 1
+        self.file_failed.emit(path, message)
+        self._finish_if_done()
+
+    def _finish_if_done(self):
+        if not self._running:
+            self.finished.emit(*self._stats)
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(count) < 1000 or unit == "TB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1000
+
+
+def format_progress(sent, total, rate, eta):
+    """'42% (1.2 GB/2.9 GB) 35.2 MB/s, còn 0:48' cho danh sách file"""
+    percent = sent * 100 // total if total else 0
+    text = f"{percent}% ({format_bytes(sent)}/{format_bytes(total)})"
+    if rate > 0:
+        text += f" {format_bytes(rate)}/s"
+    if eta is not None:
+        minutes, seconds = divmod(int(eta + 0.5), 60)
+        text += f", còn {minutes // 60}:{minutes % 60:02d}:{seconds:02d}" if minutes >= 60 \
+            else f", còn {minutes}:{seconds:02d}"
+    return text
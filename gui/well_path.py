@@ -0,0 +1,163 @@
+"""Tính quỹ đạo giếng (WellPath) theo phương pháp minimum curvature bằng NumPy.
+
+Các trạm đo của mọi giếng được xếp theo (giếng, Measured Depth) rồi tính một
+lần trên toàn bộ mảng: vector hướng, dogleg, hệ số RF, các gia số TVD/Northing/Easting,
+cộng dồn theo từng giếng (cumsum trừ giá trị đầu giếng). Mỗi giếng bắt đầu từ
+điểm gốc trên mặt đất (MD 0, thẳng đứng). DLS tính theo độ/30 m của đoạn kết
+thúc tại trạm. Trạm thiếu MD/Inclination/Azimuth có kết quả trống.
+
+Survey giữ quỹ đạo đã tính để đổi MD -> TVD cho cả loạt Marker: nội suy tuyến
+tính theo MD giữa hai trạm, ngoại suy theo góc nghiêng của trạm cuối khi sâu
+hơn trạm cuối.
+"""
+import numpy as np
+
+# Các cột tính từ dữ liệu (không có trong dữ liệu nguồn) của từng loại dữ liệu
+DERIVED_COLUMNS = {
+    "WellPath": ["TVD", "Northing", "Easting", "DLS"],
+    "Marker": ["TVD"],
+}
+COURSE_LENGTH = 30.0  # DLS theo độ trên 30 m
+
+
+def minimum_curvature(md, inclination, azimuth, wells):
+    """(tvd, northing, easting, dls) theo thứ tự dòng đầu vào, cùng Survey của các trạm hợp lệ.
+
+    md, inclination, azimuth (độ): mảng float (NaN = trống); wells: mã giếng (số nguyên) của từng dòng.
+    """
+    md = np.asarray(md, dtype=np.float64)
+    inclination = np.asarray(inclination, dtype=np.float64)
+    azimuth = np.asarray(azimuth, dtype=np.float64)
+    wells = np.asarray(wells, dtype=np.int64)
+    rows = np.flatnonzero(~(np.isnan(md) | np.isnan(inclination) | np.isnan(azimuth)))
+    order = rows[np.argsort(_station_keys(wells[rows], md[rows])[0], kind="stable")]  # bằng nhau giữ thứ tự dòng
+    well = wells[order]
+    depth = md[order]
+    inc = np.radians(inclination[order])
+    azi = np.radians(azimuth[order])
+
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = well[1:] != well[:-1]
+    # Vector hướng đơn vị (north, east, xuống) tại từng trạm và tại trạm trước;
+    # trạm đầu giếng nối với điểm gốc (MD 0, thẳng đứng)
+    sin_inc = np.sin(inc)
+    direction = (sin_inc * np.cos(azi), sin_inc * np.sin(azi), np.cos(inc))
+    previous = []
+    for values, surface in zip((depth,) + direction, (0.0, 0.0, 0.0, 1.0)):
+        shifted = np.concatenate(([surface], values[:-1]))
+        shifted[first] = surface
+        previous.append(shifted)
+    depth0 = previous[0]
+
+    # Dogleg từ độ dài dây cung giữa hai vector hướng (chính xác cả với góc rất nhỏ)
+    chord = np.sqrt(sum((values - values0) ** 2 for values, values0 in zip(direction, previous[1:])))
+    dogleg = 2 * np.arcsin(np.minimum(chord / 2, 1.0))
+    course = depth - depth0
+    ratio = np.ones(len(order))
+    bent = dogleg > 1e-9
+    ratio[bent] = 2 / dogleg[bent] * np.tan(dogleg[bent] / 2)
+    half = course / 2 * ratio
+
+    starts = np.flatnonzero(first)
+    segment = np.cumsum(first) - 1
+    results = []
+    north, east, down = direction
+    north0, east0, down0 = previous[1:]
+    for delta in (half * (down0 + down), half * (north0 + north), half * (east0 + east)):
+        total = np.cumsum(delta)
+        results.append(total - (total[starts] - delta[starts])[segment])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results.append(np.where(course > 0, np.degrees(dogleg) * COURSE_LENGTH / course, 0.0))
+
+    columns = []
+    for values in results:
+        column = np.full(len(md), np.nan)
+        column[order] = values
+        columns.append(column)
+    return tuple(columns), Survey(well, depth, results[0], inc)
+
+
+class Survey:
+    """Quỹ đạo đã tính của các giếng, các trạm xếp theo (mã giếng, MD)"""
+
+    def __init__(self, wells, md, tvd, inclination):
+        self.wells = wells
+        self.md = md
+        self.tvd = tvd
+        self.inclination = inclination  # radian
+        self.keys, self.low, self.span = _station_keys(wells, md)  # tăng dần (các trạm đã xếp)
+        self.starts = np.searchsorted(wells, np.arange(int(np.max(wells, initial=-1)) + 2))
+
+    def tvd_at(self, wells, md):
+        """TVD tại các độ sâu md của các giếng wells (mã giếng như lúc tính, -1 = không có quỹ đạo)"""
+        wells = np.asarray(wells, dtype=np.int64)
+        md = np.asarray(md, dtype=np.float64)
+        result = np.full(len(md), np.nan)
+        known = (wells >= 0) & (wells < len(self.starts) - 1) & ~np.isnan(md)
+        known[known] = self.starts[wells[known]] < self.starts[wells[known] + 1]  # giếng có trạm đo
+        wells, depth, selected = wells[known], md[known], np.flatnonzero(known)
+        start, stop = self.starts[wells], self.starts[wells + 1]
+        # Trạm cuối có MD <= độ sâu cần tìm (start - 1 nếu nông hơn trạm đầu)
+        queries = wells * self.span + np.clip(depth - self.low, 0.0, self.span - 1)
+        # searchsorted nhanh hơn nhiều khi các điểm cần tìm đã xếp tăng dần
+        query_order = np.argsort(queries)
+        below = np.empty(len(queries), dtype=np.int64)
+        below[query_order] = np.searchsorted(self.keys, queries[query_order], side="right") - 1
+        below = np.where(depth < self.low, start - 1, below)
+
+        last = stop - 1
+        past_end = below >= last
+        tvd = np.empty(len(depth))
+        # Sâu hơn trạm cuối: đi thẳng theo góc nghiêng của trạm cuối
+        tvd[past_end] = (self.tvd[last[past_end]]
+                         + (depth[past_end] - self.md[last[past_end]]) * np.cos(self.inclination[last[past_end]]))
+        inside = ~past_end
+        upper = below[inside] + 1
+        lower = below[inside]
+        before_first = lower < start[inside]
+        md0 = np.where(before_first, 0.0, self.md[np.maximum(lower, 0)])
+        tvd0 = np.where(before_first, 0.0, self.tvd[np.maximum(lower, 0)])
+        md1, tvd1 = self.md[upper], self.tvd[upper]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(md1 > md0, (depth[inside] - md0) / (md1 - md0), 0.0)
+        tvd[inside] = tvd0 + fraction * (tvd1 - tvd0)
+        result[selected] = tvd
+        return result
+
+
+def _station_keys(wells, md):
+    """(khóa số của từng trạm theo thứ tự (giếng, MD), MD nhỏ nhất, khoảng MD của mỗi giếng trong khóa)
+
+    Một mảng khóa float thay cho lexsort/searchsorted hai khóa (nhanh hơn nhiều lần).
+    """
+    low = float(np.min(md, initial=0.0))
+    span = float(np.max(md, initial=0.0)) - low + 1.0
+    return wells * span + (md - low), low, span
+
+
+def well_codes(store, col):
+    """(mã giếng từng dòng, danh sách tên giếng) của cột tên giếng"""
+    values, names = store.sort_values(col)
+    return np.frombuffer(values, dtype=np.uint32).astype(np.int64), names
+
+
+def update_well_path(store):
+    """Tính TVD/Northing/Easting/DLS cho mọi dòng của store WellPath, trả về (Survey, tên giếng)"""
+    with store.lock:
+        wells, names = well_codes(store, store.column_index("Well Name"))
+        md, inclination, azimuth = (np.frombuffer(store.sort_values(store.column_index(col))[0], dtype=np.float64)
+                                    for col in ("Measured Depth", "Inclination", "Azimuth"))
+        columns, survey = minimum_curvature(md, inclination, azimuth, wells)
+        for col, values in zip(DERIVED_COLUMNS["WellPath"], columns):
+            store.set_number_column(store.column_index(col), values)
+        return survey, names
+
+
+def update_marker_tvd(store, survey, survey_wells):
+    """Đổi Depth (MD) của mọi Marker sang TVD theo quỹ đạo giếng cùng tên (trống nếu không có)"""
+    with store.lock:
+        wells, names = well_codes(store, store.column_index("Well Name"))
+        codes = {name: code for code, name in enumerate(survey_wells)}
+        lookup = np.array([codes.get(name, -1) for name in names] or [-1], dtype=np.int64)
+        depth = np.frombuffer(store.sort_values(store.column_index("Depth"))[0], dtype=np.float64)
+        store.set_number_column(store.column_index("TVD"), survey.tvd_at(lookup[wells], depth))
@@ -1,14 +1,31 @@
+import os
 import sys
+from array import array
+from bisect import bisect_left
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QTableWidget, QAction,
-    QTableWidgetItem, QVBoxLayout, QWidget, QPushButton, QHBoxLayout,
-    QToolBar, QComboBox, QLabel, QLineEdit, QMessageBox, QTabWidget
+    QApplication, QMainWindow, QTableView, QAction, QHeaderView, QCheckBox,
+    QVBoxLayout, QWidget, QPushButton, QHBoxLayout,
+    QToolBar, QComboBox, QLabel, QLineEdit, QMessageBox, QTabWidget, QProgressBar, QSplitter, QFileDialog
 )
+from PyQt5.QtCore import Qt, QThreadPool, QTimer, QStandardPaths, QSettings
 from PyQt5.QtGui import QFont
-from gui.dialogs.column_selector_dialog import ColumnSelectorDialog
-from gui.dialogs.data_export_dialog import DataExportDialog
-from gui.data_loader import DataLoader
-from gui.dialogs.import_dialog.data_import_dialog import DataImportTab
+import numpy as np
+from gui.column_store import ColumnStore, row_id_array
+from gui.schema import build_schema
+from gui.search_index import SearchIndex
+from gui.query_filter import compile_query, QueryError
+from gui.sort_order import sort_rows
+from gui.spatial_index import LATITUDE, LONGITUDE, spatial_index
+from gui.table_model import DataTableModel, SummaryTableModel
+from gui.summary import GroupSummary, SUMMARIES
+from gui.well_path import DERIVED_COLUMNS, update_well_path, update_marker_tvd
+from gui.instrumentation import instruments
+from gui.loaders.registry import create_loader
+from gui.data_load_worker import DataLoadWorker
+from gui.dataset_cache import DatasetCache, CacheWriteWorker, SourceVersionWorker, DEFAULT_MAX_BYTES
+from gui.sqlite_engine import SqliteEngine
+# Các hộp thoại, tab Import (kèm PyYAML, loader file, parse pool, upload) và kho đường cong
+# được import khi dùng lần đầu để khởi động nhanh
 
 class OSDUApp(QMainWindow):
     def __init__(self):
@@ -32,8 +49,9 @@ class OSDUApp(QMainWindow):
             "WellLog": ["WellBore Name", "File Name", "Start Depth", "Stop Depth", 
                       "Log Run", "Log Type", "Date", "Logging Service", "Fluid Type", 
                       "Log Class", "Logging Mode"],
-            "Marker": ["Well Name", "Marker Name", "Depth", "Confidence Level", "Source"],
-            "WellPath": ["Well Name", "Measured Depth", "Inclination", "Azimuth"],
+            "Marker": ["Well Name", "Marker Name", "Depth", "Confidence Level", "Source", "TVD"],
+            "WellPath": ["Well Name", "Measured Depth", "Inclination", "Azimuth",
+                         "TVD", "Northing", "Easting", "DLS"],
             "Seismic 2D": ["Survey Name", "Line Name", "Shot Points", "Processing Status"],
             "Seismic 3D": ["Survey Name", "Volume Name", "Inline Count", "Crossline Count", 
                           "Processing Status"],
@@ -41,14 +59,63 @@ class OSDUApp(QMainWindow):
             "Document": ["Document Name", "Type", "Date", "Author"]
         }
         
-        self.visible_columns = {key: {col: True for col in cols} 
+        self.settings = QSettings("OSDU", "OSDU Desktop App")
+        self.visible_columns = {key: self._load_column_visibility(key, cols)
                                for key, cols in self.columns_by_type.items()}
+        self.schemas = {key: build_schema(cols) for key, cols in self.columns_by_type.items()}
         self.current_data_type = "Select Data Type"
-        self.original_data = {}
-        self.filtered_data = []
-        self.all_data = []
+        self.original_data = {}  # loại dữ liệu -> ColumnStore
+        self.search_indexes = {}  # loại dữ liệu -> SearchIndex
+        self.load_worker = None  # DataLoadWorker đang chạy (nếu có)
+        self.filtered_upto = 0  # số dòng của store đã được lọc vào filtered_data
+        self.active_query = None  # biểu thức lọc theo cột đã biên dịch (gui.query_filter)
+        self.last_filter = None  # (loại dữ liệu, keyword, biểu thức) của lần lọc gần nhất
+        self.sort_orders = {}  # loại dữ liệu -> (cột, giảm dần) đang sắp xếp bảng
+        self.summary = None  # GroupSummary của kết quả lọc hiện tại (khi bảng tổng hợp đang mở)
+        self.well_survey = None  # (Survey, tên giếng) của WellPath đã load, dùng đổi MD -> TVD cho Marker
+        self.pending_imports = {}  # bản ghi import của loại dữ liệu chưa load xong
+        self.sql_engine = self._create_sql_engine()
+        self.dataset_cache = self._create_dataset_cache() if self.sql_engine is None else None
+        self.cached_datasets = {}  # loại dữ liệu -> CachedDataset đang dùng (chờ kiểm tra phiên bản)
+        self.filtered_data = array('q')  # id các dòng khớp bộ lọc
         self.current_page = 0
         self.rows_per_page = 50
+        self.paginate = True  # False: cuộn toàn bộ kết quả trên một bảng
+        self.stats_dialog = None  # bảng số liệu đo (Menu > Diagnostics)
+        self.curve_dialog = None  # cửa sổ xem đường cong (nút Curves)
+        # Đường cong của các file LAS import vào WellLog (xem bằng nút Curves), tạo khi dùng lần đầu
+        self.curve_store = None
+
+    def _load_column_visibility(self, data_type, columns):
+        """Cột hiển thị của loại dữ liệu theo lần chọn trước (lưu các cột bị ẩn, cột mới mặc định hiện)"""
+        hidden = set(self.settings.value(f"columns/{data_type}/hidden", [], type=list))
+        return {col: col not in hidden for col in columns}
+
+    def _save_column_visibility(self, data_type):
+        hidden = [col for col, visible in self.visible_columns[data_type].items() if not visible]
+        self.settings.setValue(f"columns/{data_type}/hidden", hidden)
+
+    def _create_dataset_cache(self):
+        """Cache dữ liệu trên đĩa: thư mục OSDU_CACHE_DIR (mặc định thư mục cache của người dùng),
+        dung lượng tối đa OSDU_CACHE_MAX_MB (0 để tắt cache)"""
+        max_mb = float(os.environ.get("OSDU_CACHE_MAX_MB", DEFAULT_MAX_BYTES / 2**20))
+        if max_mb <= 0:
+            return None
+        return DatasetCache(self._cache_directory(), int(max_mb * 2**20))
+
+    def _create_sql_engine(self):
+        """Engine SQLite khi đặt OSDU_STORAGE=sqlite (file OSDU_SQLITE_PATH, mặc định trong thư mục cache)"""
+        if os.environ.get("OSDU_STORAGE", "").lower() != "sqlite":
+            return None
+        path = os.environ.get("OSDU_SQLITE_PATH")
+        if not path:
+            os.makedirs(self._cache_directory(), exist_ok=True)
+            path = os.path.join(self._cache_directory(), "catalog.sqlite3")
+        return SqliteEngine(path)
+
+    def _cache_directory(self):
+        return os.environ.get("OSDU_CACHE_DIR") or os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "osdu-desktop-app")
 
     # Khởi tạo GUI
     def _init_ui(self):
@@ -66,6 +133,12 @@ class OSDUApp(QMainWindow):
         self._setup_import_tab()
         main_layout.addWidget(self.tabs)
 
+        # Thanh tiến trình load dữ liệu
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+
     def _create_menu_bar(self):
         menubar = self.menuBar()
 
@@ -81,6 +154,57 @@ class OSDUApp(QMainWindow):
         menu_menu = menubar.addMenu("Menu")
         about_action = QAction("About", self)
         menu_menu.addAction(about_action)
+        self._create_diagnostics_menu(menu_menu)
+
+    def _create_diagnostics_menu(self, parent_menu):
+        """Menu đo hiệu năng (ẩn, hiện khi đặt OSDU_PROFILE hoặc bấm Ctrl+Shift+D)"""
+        self.diagnostics_menu = parent_menu.addMenu("Diagnostics")
+        self.diagnostics_menu.menuAction().setVisible(instruments.enabled)
+
+        self.instrument_action = QAction("Enable Instrumentation", self, checkable=True)
+        self.instrument_action.setChecked(instruments.enabled)
+        self.instrument_action.toggled.connect(self.set_instrumentation)
+        stats_action = QAction("Stats Panel", self)
+        stats_action.triggered.connect(self.open_stats_panel)
+        self.capture_action = QAction("Start Capture", self)
+        self.capture_action.triggered.connect(self.toggle_capture)
+        for action in (self.instrument_action, stats_action, self.capture_action):
+            self.diagnostics_menu.addAction(action)
+
+        reveal_action = QAction(self)
+        reveal_action.setShortcut("Ctrl+Shift+D")
+        reveal_action.triggered.connect(lambda: self.diagnostics_menu.menuAction().setVisible(True))
+        self.addAction(reveal_action)
+
+    def set_instrumentation(self, enabled):
+        instruments.enabled = enabled
+
+    def open_stats_panel(self):
+        if self.stats_dialog is None:
+            from gui.dialogs.stats_dialog import StatsDialog
+            self.stats_dialog = StatsDialog(self, instruments)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+
+    def toggle_capture(self):
+        """Bắt đầu capture, hoặc dừng và lưu Chrome trace (.json) kèm cProfile (.prof)"""
+        if not instruments.capturing:
+            instruments.start_capture()
+            self.instrument_action.setChecked(True)
+            self.capture_action.setText("Stop Capture...")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "osdu-trace.json", "Trace Files (*.json)")
+        if not path:
+            return  # tiếp tục capture
+        if not path.lower().endswith(".json"):
+            path += ".json"
+        self.capture_action.setText("Start Capture")
+        try:
+            files = instruments.stop_capture(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Lỗi", f"Không ghi được trace:\n{e}")
+            return
+        self.statusBar().showMessage("Đã lưu: " + ", ".join(files), 5000)
 
     def _setup_query_tab(self):
         """Thiết lập tab Query"""
@@ -99,9 +223,37 @@ class OSDUApp(QMainWindow):
         self.tabs.addTab(query_tab, "Query")
 
     def _setup_import_tab(self):
-        """Thiết lập tab Import"""
-        self.import_tab = DataImportTab()
-        self.tabs.addTab(self.import_tab, "Import")
+        """Thiết lập tab Import: chỉ là khung trống, DataImportTab được dựng khi mở tab lần đầu"""
+        self.import_tab = None
+        self.import_container = QWidget()
+        layout = QVBoxLayout(self.import_container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(self.import_container, "Import")
+
+    def _get_curve_store(self):
+        """Kho đường cong của các file LAS đã import (gui.curve_store.CurveStore)"""
+        if self.curve_store is None:
+            from gui.curve_store import CurveStore
+            self.curve_store = CurveStore(os.path.join(self._cache_directory(), "curves"))
+        return self.curve_store
+
+    def _ensure_import_tab(self):
+        """Dựng tab Import (nếu chưa có) và trả về DataImportTab"""
+        if self.import_tab is None:
+            from gui.dialogs.import_dialog.data_import_dialog import DataImportTab
+            from gui.upload_client import create_upload_client
+            # Upload file import lên storage khi đặt OSDU_UPLOAD_URL (journal upload dở trong thư mục cache)
+            upload_client = create_upload_client(os.path.join(self._cache_directory(), "uploads"))
+            self.import_tab = DataImportTab(columns_by_type=self.columns_by_type, curve_store=self._get_curve_store(),
+                                            upload_client=upload_client)
+            self.import_tab.upload_started.connect(self.handle_file_upload)
+            self.import_tab.records_imported.connect(self.handle_imported_data)
+            self.import_container.layout().addWidget(self.import_tab)
+        return self.import_tab
+
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.import_container:
+            self._ensure_import_tab()
 
     def _create_upper_toolbar(self):
         toolbar = QToolBar("Filter Toolbar")
@@ -116,9 +268,24 @@ class OSDUApp(QMainWindow):
         self.search_input.setPlaceholderText("Search...")
         toolbar.addWidget(self.search_input)
         
+        # Biểu thức lọc theo cột
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Start Depth between 2000 and 3500 and Log Class = Petrophysics")
+        self.query_input.setToolTip(
+            "Lọc theo cột: = != < <= > >= between ... and ..., in (...), contains\n"
+            "Kết hợp bằng and / or / not và dấu ngoặc; tên cột có thể đặt trong [ ]\n"
+            "Seismic Location: bbox(lat1, lon1, lat2, lon2), radius(lat, lon, km), nearest(lat, lon, n)"
+        )
+        toolbar.addWidget(self.query_input)
+        
         # Nút filter
         self.btn_filter = QPushButton("Filter")
         toolbar.addWidget(self.btn_filter)
+
+        # Lọc ngay khi gõ, đợi người dùng ngừng gõ một chút (debounce)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
         
         return toolbar
 
@@ -127,11 +294,31 @@ class OSDUApp(QMainWindow):
         container = QWidget()
         layout = QVBoxLayout(container)
         
-        # Bảng dữ liệu
-        self.table = QTableWidget()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
-        layout.addWidget(self.table)
+        # Bảng dữ liệu (model/view, chỉ render các ô trong viewport)
+        self.table_model = DataTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        # Bấm tiêu đề cột để sắp xếp toàn bộ kết quả lọc (không dùng sort của Qt: chỉ sắp xếp trong trang)
+        self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        # Model luôn có mọi cột; cột bị ẩn chỉ là section ẩn của view (reset model thì đặt lại)
+        self.table_model.modelReset.connect(self._apply_column_visibility)
+
+        # Bảng tổng hợp theo nhóm (ẩn cho đến khi bấm Summary)
+        self.summary_model = SummaryTableModel(self)
+        self.summary_table = QTableView()
+        self.summary_table.setModel(self.summary_model)
+        self.summary_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.summary_table.verticalHeader().setDefaultSectionSize(22)
+        self.summary_table.hide()
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.summary_table)
+        layout.addWidget(splitter)
         
         # Phân trang
         pagination_widget = QWidget()
@@ -139,7 +326,10 @@ class OSDUApp(QMainWindow):
         self.prev_btn = QPushButton("Previous")
         self.next_btn = QPushButton("Next")
         self.page_label = QLabel("Page 1")
+        self.paginate_checkbox = QCheckBox("Paginate")
+        self.paginate_checkbox.setChecked(self.paginate)
         
+        pagination_layout.addWidget(self.paginate_checkbox)
         pagination_layout.addStretch()
         pagination_layout.addWidget(self.prev_btn)
         pagination_layout.addWidget(self.page_label)
@@ -149,7 +339,8 @@ class OSDUApp(QMainWindow):
         layout.addWidget(pagination_widget)
 
         # Kết nối sự kiện khi chọn dữ liệu
-        self.table.itemSelectionChanged.connect(self._update_export_button_state)
+        self.table.selectionModel().selectionChanged.connect(self._update_export_button_state)
+        self.table.selectionModel().selectionChanged.connect(self._update_curves_button_state)
 
         return container
 
@@ -158,10 +349,17 @@ class OSDUApp(QMainWindow):
         toolbar = QToolBar("Actions")
         self.btn_export = QPushButton("Export")
         self.btn_columns = QPushButton("Select Columns")
+        self.btn_summary = QPushButton("Summary")
+        self.btn_summary.setCheckable(True)
+        self.btn_curves = QPushButton("Curves")
+        self.btn_curves.setToolTip("Xem đường cong của file log (WellLog) đang chọn")
         
         self.btn_export.setEnabled(False)
+        self.btn_curves.setEnabled(False)
         toolbar.addWidget(self.btn_export)
         toolbar.addWidget(self.btn_columns)
+        toolbar.addWidget(self.btn_summary)
+        toolbar.addWidget(self.btn_curves)
         
         return toolbar
 
@@ -170,103 +368,325 @@ class OSDUApp(QMainWindow):
         """Kết nối tất cả sự kiện"""
         # Query tab
         self.btn_filter.clicked.connect(self.apply_filter)
+        self.query_input.returnPressed.connect(self.apply_filter)
+        self.search_input.returnPressed.connect(self.apply_filter)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+        self.search_timer.timeout.connect(self.apply_live_filter)
         self.data_type_selector.currentIndexChanged.connect(self.handle_data_type_change)
         self.btn_export.clicked.connect(self.export_data)
         self.btn_columns.clicked.connect(self.open_column_selector)
+        self.btn_summary.toggled.connect(self.toggle_summary)
+        self.btn_curves.clicked.connect(self.open_curves)
         self.prev_btn.clicked.connect(self.prev_page)
         self.next_btn.clicked.connect(self.next_page)
+        self.paginate_checkbox.toggled.connect(self.set_paginate)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.sort_table)
         
-        # Import tab
-        self.import_tab.upload_started.connect(self.handle_file_upload)
+        # Import tab (dựng khi được mở lần đầu)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
     def handle_file_upload(self, file_path):
         """Xử lý upload file từ tab Import"""
-        print(f"Đang xử lý file: {file_path}")
-        # Thêm logic xử lý file thực tế tại đây
-        # Ví dụ: self.handle_imported_data(data)
+        self.statusBar().showMessage(f"Đang import: {file_path}", 3000)
+
+    def handle_imported_data(self, data_type, rows):
+        """Thêm các bản ghi mới (từ tab Import) vào dữ liệu đã load mà không load lại"""
+        from gui.parse_pool import ColumnBatch  # đã được tab Import nạp
+        if data_type not in self.original_data or self._is_loading(data_type):
+            # Chưa load hoặc đang load: không ghi song song với thread load, gộp vào khi load xong
+            self.pending_imports.setdefault(data_type, []).extend(
+                rows.rows() if isinstance(rows, ColumnBatch) else rows)
+            return
+        self._append_records(data_type, rows)
+        self._show_new_rows(data_type)
+        self._update_derived_columns(data_type)
+
+    def _append_records(self, data_type, rows):
+        """Cập nhật ColumnStore và chỉ mục tìm kiếm với các dòng mới"""
+        from gui.parse_pool import ColumnBatch
+        with instruments.stage("import.append"):
+            store = self.original_data[data_type]
+            index = self.search_indexes.get(data_type)
+            if isinstance(rows, ColumnBatch):  # từ tab Import: mỗi giá trị khác nhau chỉ xử lý một lần
+                store.append_batch(rows)
+                if index is not None:
+                    index.add_batch(rows)
+            else:
+                store.append_rows(rows)
+                if index is not None:  # engine SQLite: bảng FTS được cập nhật trong append_rows
+                    index.add_rows(rows)
+        instruments.count("rows imported", len(rows))
 
     # Xử lý dữ liệu
     def handle_data_type_change(self):
+        self._cancel_loading()
         self.current_data_type = self.data_type_selector.currentText()
-        if self.current_data_type == "Select Data Type":
-            self.table.clearContents()
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            return
         # Reset bảng dữ liệu
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
-
-    def apply_filter(self):
+        self.active_query = None
+        self.last_filter = None
+        self.filtered_data = array('q')
+        self.table_model.clear()
+        self.summary = None
+        self.summary_model.clear()
+        self._update_curves_button_state()
+
+    def apply_live_filter(self):
+        """Lọc khi đang gõ: chỉ chạy với dữ liệu đã load, không hiện hộp thoại"""
+        if self.current_data_type in self.original_data:
+            self.apply_filter(live=True)
+
+    def apply_filter(self, live=False):
         """Xử lý logic filter dữ liệu"""
+        with instruments.stage("apply_filter"):
+            self._apply_filter(live)
+
+    def _apply_filter(self, live):
+        self.search_timer.stop()
         # Kiểm tra đã chọn loại dữ liệu chưa
         if self.current_data_type == "Select Data Type":
             QMessageBox.warning(self, "Lỗi", "Vui lòng chọn loại dữ liệu trước!")
             return
 
+        # Biên dịch biểu thức lọc theo cột
+        query_text = self.query_input.text().strip()
+        try:
+            with instruments.stage("apply_filter.compile"):
+                self.active_query = (compile_query(query_text, self.schemas[self.current_data_type])
+                                     if query_text else None)
+        except QueryError as e:
+            if live:
+                self.statusBar().showMessage(f"Biểu thức lọc không hợp lệ: {e}", 5000)
+            else:
+                QMessageBox.warning(self, "Lỗi", f"Biểu thức lọc không hợp lệ:\n{e}")
+            return
+
         # Load dữ liệu nếu chưa có
         if self.current_data_type not in self.original_data:
-            self._load_data_to_memory()
+            with instruments.stage("apply_filter.load"):
+                self._load_data_to_memory()
 
         # Lấy từ khóa tìm kiếm
         keyword = self.search_input.text().strip().lower()
-        raw_data = self.original_data.get(self.current_data_type, [])
+        store = self.original_data.get(self.current_data_type)
+        if store is None:
+            return
 
-        # Lọc dữ liệu
-        if keyword:
-            self.filtered_data = [
-                row for row in raw_data 
-                if any(keyword in str(cell).lower() for cell in row)
-            ]
-        else:
-            self.filtered_data = raw_data.copy()  # Hiển thị toàn bộ nếu không có keyword
+        # Lọc dữ liệu: keyword mở rộng từ keyword trước thì chỉ thu hẹp kết quả trước
+        previous = self.last_filter
+        previous_ids = self.filtered_data
+        self.last_filter = (self.current_data_type, keyword, query_text)
+        refine = (previous and previous[0] == self.current_data_type and previous[2] == query_text
+                  and previous[1] and previous[1] in keyword and self.filtered_upto == self._searchable_rows(self.current_data_type)
+                  and self.sql_engine is None and (self.active_query is None or self.active_query.nearest is None))
+        with instruments.stage("apply_filter.rows"):
+            if refine:
+                instruments.count("rows scanned", len(self.filtered_data))
+                self.filtered_data = self._refine_rows(keyword, self.filtered_data)
+            else:
+                self.filtered_upto = self._searchable_rows(self.current_data_type)
+                instruments.count("rows scanned", self.filtered_upto)
+                self.filtered_data = self._filter_rows(keyword, 0, self.filtered_upto)
+            instruments.count("rows matched", len(self.filtered_data))
+        with instruments.stage("apply_filter.sort"):
+            self.filtered_data = self._sorted_rows(self.filtered_data)
+        with instruments.stage("apply_filter.summary"):
+            self._update_summary(previous_ids if refine else None)
 
         # Cập nhật bảng
-        self.all_data = self.filtered_data
         self.current_page = 0
         self._update_table()
 
-        # Hiển thị thông báo nếu không có kết quả
-        if not self.filtered_data:
-            QMessageBox.warning(self, "Thông báo", "Không tìm thấy dữ liệu phù hợp!")
+        # Hiển thị thông báo nếu không có kết quả (đợi load xong nếu đang load)
+        if not self.filtered_data and not self._is_loading(self.current_data_type):
+            if live:
+                self.statusBar().showMessage("Không tìm thấy dữ liệu phù hợp!", 3000)
+            else:
+                QMessageBox.warning(self, "Thông báo", "Không tìm thấy dữ liệu phù hợp!")
+        elif live:
+            self.statusBar().showMessage(f"{len(self.filtered_data)} rows", 3000)
+
+    def _refine_rows(self, keyword, row_ids):
+        """Giữ lại các id trong kết quả trước (đã thỏa biểu thức lọc) khớp keyword mới"""
+        matches = self.search_indexes[self.current_data_type].search(keyword)
+        if not matches or not row_ids:
+            return array('q')
+        return row_id_array(np.intersect1d(np.array(row_ids, dtype=np.int64),
+                                           np.array(matches, dtype=np.int64), assume_unique=True))
+
+    def _filter_rows(self, keyword, start, stop):
+        """Id các dòng trong [start, stop) khớp keyword và biểu thức lọc theo cột"""
+        if self.sql_engine is not None:
+            # Lọc trong SQLite: kết quả chỉ đọc id theo từng trang khi hiển thị
+            return self.original_data[self.current_data_type].select(keyword, self.active_query, start, stop)
+        row_ids = None
+        if keyword:
+            row_ids = self.search_indexes[self.current_data_type].search(keyword)
+            row_ids = row_ids[bisect_left(row_ids, start):bisect_left(row_ids, stop)]
+        if self.active_query is not None:
+            store = self.original_data[self.current_data_type]
+            return self.active_query.filter_ids(store, row_ids, start, stop)
+        if row_ids is None:
+            return row_id_array(np.arange(start, stop))  # Hiển thị toàn bộ nếu không có điều kiện lọc
+        return row_ids
+
+    def sort_table(self, section, order):
+        """Sắp xếp toàn bộ kết quả lọc theo cột được bấm trên tiêu đề bảng"""
+        if not 0 <= section < len(self.table_model.headers):
+            return
+        self.sort_orders[self.current_data_type] = (self.table_model.headers[section], order == Qt.DescendingOrder)
+        self.filtered_data = self._sorted_rows(self.filtered_data)
+        self.current_page = 0
+        self._update_table()
+
+    def _sorted_rows(self, row_ids):
+        """row_ids theo thứ tự sắp xếp đang chọn của loại dữ liệu hiện tại (giữ nguyên nếu chưa chọn)"""
+        sort = self.sort_orders.get(self.current_data_type)
+        store = self.original_data.get(self.current_data_type)
+        if sort is None or store is None or not row_ids:
+            return row_ids
+        column, descending = sort
+        return sort_rows(store, row_ids, store.column_index(column), descending)
+
+    def toggle_summary(self, checked):
+        """Mở/đóng bảng tổng hợp theo nhóm của kết quả lọc"""
+        self.summary_table.setVisible(checked)
+        self._refresh_summary()
+
+    def _refresh_summary(self):
+        """Tính bảng tổng hợp từ đầu trên kết quả lọc hiện tại (chỉ khi bảng đang mở)"""
+        self.summary = None
+        spec = SUMMARIES.get(self.current_data_type)
+        store = self.original_data.get(self.current_data_type)
+        if not self.btn_summary.isChecked() or spec is None or store is None:
+            self.summary_model.clear()
+            return
+        self.summary = GroupSummary(store, *spec)
+        self.summary.reset(self.filtered_data)
+        self._show_summary()
+
+    def _update_summary(self, previous_ids=None):
+        """Cập nhật bảng tổng hợp sau khi lọc: thu hẹp từ previous_ids nếu có, không thì tính lại"""
+        store = self.original_data.get(self.current_data_type)
+        if previous_ids is None or self.summary is None or self.summary.store is not store:
+            self._refresh_summary()
+            return
+        self.summary.narrow(previous_ids, self.filtered_data)
+        self._show_summary()
+
+    def _show_summary(self):
+        self.summary_model.set_table(self.summary.headers, *self.summary.table())
 
     def _update_table(self):
-        start_idx = self.current_page * self.rows_per_page
-        end_idx = start_idx + self.rows_per_page
-        paginated_data = self.all_data[start_idx:end_idx]
-        
-        # Cập nhật tiêu đề cột
-        visible_cols = [
-            col for col in self.columns_by_type[self.current_data_type]
-            if self.visible_columns[self.current_data_type][col]
-        ]
-        
-        self.table.setRowCount(len(paginated_data))
-        self.table.setColumnCount(len(visible_cols))
-        self.table.setHorizontalHeaderLabels(visible_cols)
-        
-        # Đổ dữ liệu
-        for row_idx, row in enumerate(paginated_data):
-            for col_idx, col in enumerate(visible_cols):
-                data_idx = self.columns_by_type[self.current_data_type].index(col)
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(row[data_idx])))
-        
-        # Cập nhật phân trang
-        total_pages = max(1, (len(self.all_data) + self.rows_per_page - 1) // self.rows_per_page)
+        with instruments.stage("update_table"):
+            store = self.original_data.get(self.current_data_type)
+            if store is None:
+                self.table_model.clear()
+                return
+
+            # Cập nhật tiêu đề cột
+            self.table_model.set_source(store, self.filtered_data, self.columns_by_type[self.current_data_type])
+            self._update_sort_indicator()
+
+            self._update_pagination()
+            instruments.count("table rows shown", self.table_model.rowCount())
+
+    def _update_sort_indicator(self):
+        """Đặt mũi tên sắp xếp trên tiêu đề theo cột đang sắp xếp"""
+        sort = self.sort_orders.get(self.current_data_type)
+        section = self.table_model.headers.index(sort[0]) if sort else -1
+        header = self.table.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(section, Qt.DescendingOrder if sort and sort[1] else Qt.AscendingOrder)
+        header.blockSignals(False)
+
+    def _update_pagination(self):
+        """Cập nhật nhãn trang và trạng thái nút Previous/Next"""
+        self._update_export_button_state()
+        if not self.paginate:
+            if self.table_model.limit is not None:
+                self.table_model.set_window(0, None)
+            self.page_label.setText(f"{len(self.filtered_data)} rows")
+            self.prev_btn.setEnabled(False)
+            self.next_btn.setEnabled(False)
+            return
+
+        total_pages = max(1, (len(self.filtered_data) + self.rows_per_page - 1) // self.rows_per_page)
+        if self.table_model.offset != self.current_page * self.rows_per_page or self.table_model.limit is None:
+            self.table_model.set_window(self.current_page * self.rows_per_page, self.rows_per_page)
         self.page_label.setText(f"Page {self.current_page + 1}/{total_pages}")
         self.prev_btn.setEnabled(self.current_page > 0)
         self.next_btn.setEnabled(self.current_page < total_pages - 1)
 
+    def set_paginate(self, enabled):
+        """Bật/tắt chế độ phân trang theo rows_per_page"""
+        self.paginate = enabled
+        self.current_page = 0
+        self._update_table()
+
+    def _apply_column_visibility(self):
+        """Ẩn/hiện các cột trên view theo visible_columns (không đọc lại dữ liệu các dòng)"""
+        visible = self.visible_columns.get(self.current_data_type, {})
+        for section, col in enumerate(self.table_model.headers):
+            self.table.setColumnHidden(section, not visible.get(col, True))
+
+    def _visible_columns(self):
+        return [
+            col for col in self.columns_by_type[self.current_data_type]
+            if self.visible_columns[self.current_data_type][col]
+        ]
+
     def _update_export_button_state(self):
-        """Enable or disable the export button based on table selection."""
-        self.btn_export.setEnabled(bool(self.table.selectedItems()))
+        """Enable the export button when there is a filtered result or a table selection."""
+        self.btn_export.setEnabled(bool(self.filtered_data) or self.table.selectionModel().hasSelection())
+
+    def _update_curves_button_state(self):
+        self.btn_curves.setEnabled(self.current_data_type == "WellLog" and self.table.selectionModel().hasSelection())
+
+    def _selected_row_ids(self):
+        """Id (trong ColumnStore) của các dòng đang được chọn trên bảng"""
+        rows = set()
+        for selection in self.table.selectionModel().selection():
+            rows.update(range(selection.top(), selection.bottom() + 1))
+        return array('q', (self.table_model.row_id(row) for row in sorted(rows)))
 
     def export_data(self):
-        DataExportDialog(self.table).export_data()
+        """Xuất các dòng được chọn, hoặc toàn bộ kết quả lọc nếu không chọn dòng nào"""
+        store = self.original_data.get(self.current_data_type)
+        if store is None:
+            return
+        row_ids = self._selected_row_ids() or self.filtered_data
+        from gui.dialogs.data_export_dialog import DataExportDialog
+        self.export_dialog = DataExportDialog(self, store, row_ids, self._visible_columns())
+        self.export_dialog.export_data()
+
+    def open_curves(self):
+        """Mở đường cong của dòng WellLog đang chọn (theo WellBore Name + File Name) từ kho đường cong"""
+        store = self.original_data.get("WellLog")
+        row_ids = self._selected_row_ids()
+        if store is None or self.current_data_type != "WellLog" or not row_ids:
+            return
+        row = row_ids[0]
+        wellbore, file_name, start, stop = (store.display(row, store.column_index(col))
+                                            for col in ("WellBore Name", "File Name", "Start Depth", "Stop Depth"))
+        curve_set = self._get_curve_store().open(wellbore, file_name)
+        if curve_set is None:
+            QMessageBox.information(self, "Curves", f"Chưa có dữ liệu đường cong của {wellbore} / {file_name}.\n"
+                                                    "Import file LAS ở tab Import để xem đường cong.")
+            return
+        try:
+            top, bottom = float(start), float(stop)
+        except ValueError:
+            top, bottom = curve_set.top, curve_set.bottom
+        if not top < bottom:
+            top, bottom = curve_set.top, curve_set.bottom
+        from gui.dialogs.curve_viewer_dialog import CurveViewerDialog
+        self.curve_dialog = CurveViewerDialog(self, curve_set, top, bottom)
+        self.curve_dialog.show()
 
     def open_column_selector(self):
         if self.current_data_type == "Select Data Type": return
         
+        from gui.dialogs.column_selector_dialog import ColumnSelectorDialog
         dialog = ColumnSelectorDialog(
             self,
             self.columns_by_type[self.current_data_type],
@@ -274,7 +694,8 @@ class OSDUApp(QMainWindow):
         )
         if dialog.exec_():
             self.visible_columns[self.current_data_type] = dialog.selected_columns
-            self._update_table()
+            self._save_column_visibility(self.current_data_type)
+            self._apply_column_visibility()
 
     def prev_page(self):
         if self.current_page > 0:
@@ -282,22 +703,215 @@ class OSDUApp(QMainWindow):
             self._update_table()
 
     def next_page(self):
-        if (self.current_page + 1) * self.rows_per_page < len(self.all_data):
+        if (self.current_page + 1) * self.rows_per_page < len(self.filtered_data):
             self.current_page += 1
             self._update_table()
 
     def _load_data_to_memory(self):
-        loader_map = {
-            "WellLog": DataLoader.load_well_log_data,
-            "Marker": DataLoader.load_marker_data,
-            "WellPath": DataLoader.load_well_path_data,
-            "Seismic 2D": DataLoader.load_seismic_2d_data,
-            "Seismic 3D": DataLoader.load_seismic_3d_data,
-            "Seismic Location": DataLoader.load_seismic_location_data,
-            "Document": DataLoader.load_document_data
-        }
-        if self.current_data_type in loader_map:
-            self.original_data[self.current_data_type] = loader_map[self.current_data_type]()
+        loader = create_loader(self.current_data_type, self.columns_by_type[self.current_data_type])
+        if loader is not None and not self._open_from_cache(self.current_data_type, loader):
+            if self.sql_engine is not None:
+                store = self.sql_engine.table(self.current_data_type, self.schemas[self.current_data_type])
+                index = None
+            else:
+                store = ColumnStore(self.schemas[self.current_data_type])
+                index = self.search_indexes[self.current_data_type] = SearchIndex()
+            self.original_data[self.current_data_type] = store
+
+            # Load trên thread nền, dữ liệu được đưa vào bảng theo từng batch
+            self.load_worker = DataLoadWorker(self.current_data_type, loader, store, index)
+            self.load_worker.signals.chunk_loaded.connect(self._on_chunk_loaded)
+            self.load_worker.signals.progress.connect(self._on_load_progress)
+            self.load_worker.signals.finished.connect(self._on_load_finished)
+            self.load_worker.signals.failed.connect(self._on_load_failed)
+            self.load_progress.setRange(0, 0)
+            self.load_progress.show()
+            QThreadPool.globalInstance().start(self.load_worker)
+
+    def _open_from_cache(self, data_type, loader):
+        """Dùng dữ liệu trong cache trên đĩa nếu có; phiên bản nguồn được kiểm tra trên thread nền"""
+        cached = self.dataset_cache.open(data_type, self.schemas[data_type]) if self.dataset_cache else None
+        if cached is None:
+            return False
+        self.original_data[data_type] = cached.store
+        self.search_indexes[data_type] = cached.index
+        self.cached_datasets[data_type] = cached
+        worker = SourceVersionWorker(data_type, loader)
+        worker.signals.version_checked.connect(self._on_source_version_checked)
+        QThreadPool.globalInstance().start(worker)
+        # Chỉ mục tìm kiếm được nạp sau khi trang đầu đã hiện (tìm kiếm sớm hơn sẽ tự nạp)
+        QTimer.singleShot(1000, cached.index.preload)
+        QTimer.singleShot(1000, lambda: self._build_spatial_index(data_type))
+        self._update_derived_columns(data_type)
+        self.statusBar().showMessage(f"{data_type}: {len(cached.store)} rows (cache)", 5000)
+        return True
+
+    def _on_source_version_checked(self, data_type, version):
+        """Nguồn đã đổi so với cache: bỏ cache và load lại, giữ các bản ghi đã import thêm"""
+        cached = self.cached_datasets.get(data_type)
+        # version None: không kiểm tra được (mất mạng...), tiếp tục dùng cache
+        if cached is None or version is None or version == cached.source_version:
+            return
+        del self.cached_datasets[data_type]
+        self.dataset_cache.discard(data_type)
+        if self.original_data.get(data_type) is not cached.store:
+            return
+        imported = [cached.store.row(row) for row in range(cached.rows, len(cached.store))]
+        if imported:
+            self.pending_imports.setdefault(data_type, [])[:0] = imported
+        del self.original_data[data_type]
+        del self.search_indexes[data_type]
+        self.statusBar().showMessage(f"{data_type}: dữ liệu nguồn đã thay đổi, đang load lại", 5000)
+        if data_type == self.current_data_type:
+            self.last_filter = None
+            self.apply_filter(live=True)
+
+    def _save_to_cache(self, data_type, source_version):
+        """Ghi dữ liệu vừa load vào cache trên đĩa (trên thread nền, không gồm bản ghi import)"""
+        store = self.original_data[data_type]
+        if self.dataset_cache is None or source_version is None or not len(store):
+            return
+        writer = CacheWriteWorker(self.dataset_cache, data_type, source_version,
+                                  store, self.search_indexes[data_type], len(store))
+        writer.signals.failed.connect(self._on_cache_write_failed)
+        QThreadPool.globalInstance().start(writer)
+
+    def _on_cache_write_failed(self, data_type, message):
+        self.statusBar().showMessage(f"Không ghi được cache {data_type}: {message}", 5000)
+
+    def _is_loading(self, data_type):
+        return self.load_worker is not None and self.load_worker.data_type == data_type
+
+    def _cancel_loading(self):
+        """Hủy load đang chạy và bỏ dữ liệu load dở"""
+        if self.load_worker is None:
+            return
+        self.load_worker.cancel()
+        self.original_data.pop(self.load_worker.data_type, None)
+        self.search_indexes.pop(self.load_worker.data_type, None)
+        self.load_worker = None
+        self.load_progress.hide()
+
+    def _on_chunk_loaded(self, data_type, start, stop):
+        if self._is_loading(data_type):
+            self._show_new_rows(data_type, stop)
+
+    def _searchable_rows(self, data_type):
+        """Số dòng đầu của store đã có trong SearchIndex.
+
+        Khi đang load, worker thêm chunk vào store trước rồi mới vào index: các
+        dòng cuối store có thể chưa tìm được theo keyword.
+        """
+        store = self.original_data[data_type]
+        index = self.search_indexes.get(data_type)
+        return len(store) if index is None else min(len(store), index.row_count)
+
+    def _show_new_rows(self, data_type, upto=None):
+        """Lọc các dòng mới của store (đến dòng upto) và nối vào bảng đang hiển thị"""
+        store = self.original_data[data_type]
+        if data_type != self.current_data_type or self.table_model.store is not store:
+            return
+        keyword = self.search_input.text().strip().lower()
+        upto = min(self._searchable_rows(data_type), len(store) if upto is None else upto)
+        if upto <= self.filtered_upto:
+            return
+        if self.active_query is not None and self.active_query.nearest is not None:
+            # nearest(...) chọn trên toàn bộ dữ liệu: lọc lại từ đầu thay vì nối thêm
+            self.filtered_upto = upto
+            self.filtered_data = self._sorted_rows(self._filter_rows(keyword, 0, upto))
+            self._refresh_summary()
+            self._update_table()
+            return
+        with instruments.stage("filter new rows"):
+            new_ids = self._filter_rows(keyword, self.filtered_upto, upto)
+        instruments.count("rows scanned", upto - self.filtered_upto)
+        instruments.count("rows matched", len(new_ids))
+        self.filtered_upto = upto
+        if not new_ids:
+            return
+        if self.summary is not None:
+            self.summary.extend(new_ids)
+            self._show_summary()
+        if data_type in self.sort_orders and not self._is_loading(data_type):
+            # Bảng đang sắp xếp: xếp lại cả kết quả (trong lúc load thì đợi load xong)
+            self.filtered_data.extend(new_ids)
+            self.filtered_data = self._sorted_rows(self.filtered_data)
+            self._update_table()
+            return
+        self.table_model.append_row_ids(new_ids)
+        self._update_pagination()
+
+    def _on_load_progress(self, data_type, loaded, total):
+        if not self._is_loading(data_type):
+            return
+        if total > 0:
+            self.load_progress.setRange(0, total)
+            self.load_progress.setValue(loaded)
+        self.statusBar().showMessage(f"Loading {data_type}: {loaded} rows")
+
+    def _on_load_finished(self, data_type):
+        if not self._is_loading(data_type):
+            return
+        source_version = self.load_worker.source_version
+        self.load_worker = None
+        self.load_progress.hide()
+        self._update_derived_columns(data_type)
+        self._save_to_cache(data_type, source_version)
+        if data_type == self.current_data_type and data_type in self.sort_orders:
+            # Các dòng load sau khi đã sắp xếp được nối vào cuối, giờ mới xếp lại
+            self.filtered_data = self._sorted_rows(self.filtered_data)
+            self._update_table()
+        if data_type in self.pending_imports:
+            self.handle_imported_data(data_type, self.pending_imports.pop(data_type))
+        self._build_spatial_index(data_type)
+        self.statusBar().showMessage(f"{data_type}: {len(self.original_data[data_type])} rows loaded", 5000)
+        if data_type == self.current_data_type and not self.filtered_data:
+            QMessageBox.warning(self, "Thông báo", "Không tìm thấy dữ liệu phù hợp!")
+
+    def _build_spatial_index(self, data_type):
+        """Dựng sẵn chỉ mục không gian cho loại dữ liệu có cột Latitude/Longitude"""
+        store = self.original_data.get(data_type)
+        columns = self.columns_by_type[data_type]
+        if store is None or self._is_loading(data_type) or LATITUDE not in columns or LONGITUDE not in columns:
+            return
+        spatial_index(store, store.column_index(LATITUDE), store.column_index(LONGITUDE))
+
+    def _update_derived_columns(self, data_type):
+        """Tính lại các cột tính toán (TVD, Northing, ...) của loại dữ liệu và của Marker khi WellPath đổi"""
+        store = self.original_data.get(data_type)
+        if data_type not in DERIVED_COLUMNS or store is None or self._is_loading(data_type):
+            return
+        with instruments.stage("derived columns"):
+            if data_type == "WellPath":
+                self.well_survey = update_well_path(store)
+                changed = [data_type]
+                markers = self.original_data.get("Marker")
+                if markers is not None and not self._is_loading("Marker"):
+                    update_marker_tvd(markers, *self.well_survey)
+                    changed.append("Marker")
+            elif self.well_survey is not None:
+                # Marker: TVD trống cho đến khi WellPath được load
+                update_marker_tvd(store, *self.well_survey)
+                changed = [data_type]
+            else:
+                return
+        if self.current_data_type in changed and self.table_model.store is self.original_data[self.current_data_type]:
+            self._refresh_derived_view()
+
+    def _refresh_derived_view(self):
+        """Cột tính toán vừa đổi: lọc lại nếu có biểu thức lọc (có thể dùng các cột đó), sắp xếp lại bảng"""
+        if self.active_query is not None:
+            self.last_filter = None
+            self.apply_filter(live=True)
+            return
+        self.filtered_data = self._sorted_rows(self.filtered_data)
+        self._update_table()
+
+    def _on_load_failed(self, data_type, message):
+        if not self._is_loading(data_type):
+            return
+        self._cancel_loading()
+        QMessageBox.critical(self, "Lỗi", f"Không thể load dữ liệu {data_type}:\n{message}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
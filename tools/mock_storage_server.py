@@ -0,0 +1,155 @@
+"""Server storage giả lập cho upload theo phần (gui.upload_client) để chạy thử không cần storage thật.
+
+Chạy: python -m tools.mock_storage_server --dir /tmp/mock-storage --port 8090 [--fail-rate 0.05]
+rồi mở app với OSDU_UPLOAD_URL=http://127.0.0.1:8090
+
+Các phần được ghi vào thư mục của từng upload; khi complete, server kiểm tra
+checksum tổng rồi ghép thành file. --fail-rate: tỉ lệ request PUT phần bị trả
+về 503 (thử việc gửi lại), --delay: độ trễ (giây) mỗi phần.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gui.upload_client import UPLOAD_PATH
+
+PART_PATH = re.compile(rf"^{UPLOAD_PATH}/(\w+)/parts/(\d+)$")
+UPLOAD = re.compile(rf"^{UPLOAD_PATH}/(\w+)$")
+COMPLETE = re.compile(rf"^{UPLOAD_PATH}/(\w+)/complete$")
+
+
+class _StorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: client dùng lại kết nối
+
+    def do_POST(self):
+        body = self._body()
+        if self.path == UPLOAD_PATH:
+            request = json.loads(body)
+            upload_id = uuid.uuid4().hex
+            os.makedirs(self._dir(upload_id))
+            with open(os.path.join(self._dir(upload_id), "upload.json"), "w", encoding="utf-8") as f:
+                json.dump({"name": os.path.basename(request["name"]), "size": request["size"], "parts": {}}, f)
+            self._json(201, {"upload_id": upload_id})
+            return
+        match = COMPLETE.match(self.path)
+        if match and os.path.isdir(self._dir(match.group(1))):
+            self._complete(match.group(1), json.loads(body))
+            return
+        self._json(404, {"error": "not found"})
+
+    def do_GET(self):
+        match = UPLOAD.match(self.path)
+        if not match or not os.path.isdir(self._dir(match.group(1))):
+            self._json(404, {"error": "not found"})
+            return
+        self._json(200, {"parts": self._parts(match.group(1))})
+
+    def do_PUT(self):
+        body = self._body()
+        match = PART_PATH.match(self.path)
+        if not match or not os.path.isdir(self._dir(match.group(1))):
+            self._json(404, {"error": "not found"})
+            return
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if random.random() < self.server.fail_rate:
+            self._json(503, {"error": "thử lại sau"})
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        if digest != self.headers.get("X-Checksum-SHA256"):
+            self._json(400, {"error": "checksum không khớp"})
+            return
+        upload_id, number = match.group(1), int(match.group(2))
+        part = os.path.join(self._dir(upload_id), f"part-{number:06d}")
+        with open(part + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(part + ".tmp", part)
+        with open(part + ".sha256", "w") as f:
+            f.write(digest)
+        with self.server.lock:
+            self.server.received_bytes += len(body)
+        self._json(200, {"sha256": digest})
+
+    def _complete(self, upload_id, request):
+        parts = self._parts(upload_id)
+        count = request.get("parts", 0)
+        if sorted(map(int, parts)) != list(range(count)):
+            self._json(400, {"error": f"thiếu phần: nhận {len(parts)}/{count}"})
+            return
+        checksum = hashlib.sha256(b"".join(bytes.fromhex(parts[str(n)]) for n in range(count))).hexdigest()
+        if checksum != request.get("sha256"):
+            self._json(400, {"error": "checksum tổng không khớp"})
+            return
+        directory = self._dir(upload_id)
+        with open(os.path.join(directory, "upload.json"), encoding="utf-8") as f:
+            name = json.load(f)["name"]
+        with open(os.path.join(directory, name), "wb") as target:
+            for n in range(count):
+                with open(os.path.join(directory, f"part-{n:06d}"), "rb") as part:
+                    shutil.copyfileobj(part, target)
+        for n in range(count):
+            os.remove(os.path.join(directory, f"part-{n:06d}"))
+        self._json(200, {"location": f"{UPLOAD_PATH}/{upload_id}/{name}", "sha256": checksum})
+
+    def _parts(self, upload_id):
+        parts = {}
+        directory = self._dir(upload_id)
+        for name in os.listdir(directory):
+            if name.startswith("part-") and name.endswith(".sha256"):
+                with open(os.path.join(directory, name)) as f:
+                    parts[str(int(name[5:11]))] = f.read()
+        return parts
+
+    def _dir(self, upload_id):
+        return os.path.join(self.server.directory, upload_id)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory=None, host="127.0.0.1", port=0, fail_rate=0.0, delay=0.0):
+    """Chạy server trên thread nền, trả về (server, base_url); server.received_bytes đếm byte phần đã nhận"""
+    server = ThreadingHTTPServer((host, port), _StorageHandler)
+    server.daemon_threads = True
+    server.directory = directory or tempfile.mkdtemp(prefix="mock-storage-")
+    server.fail_rate = fail_rate
+    server.delay = delay
+    server.lock = threading.Lock()
+    server.received_bytes = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", help="thư mục lưu file (mặc định thư mục tạm)")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+    server, url = start_server(args.dir, port=args.port, fail_rate=args.fail_rate, delay=args.delay)
+    print(f"Mock storage listening on {url}, lưu tại {server.directory}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
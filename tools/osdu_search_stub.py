@@ -0,0 +1,63 @@
+"""Server giả lập OSDU Search (query_with_cursor) để chạy thử loader không cần OSDU thật.
+
+Chạy: python -m tools.osdu_search_stub --rows 100000 --port 8089
+rồi mở app với OSDU_SEARCH_URL=http://127.0.0.1:8089
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gui.loaders.osdu_search_loader import OSDU_KINDS, SEARCH_PATH
+
+
+def synthetic_records(data_type, count):
+    """Sinh count bản ghi với các trường data.* theo OSDU_KINDS"""
+    _, field_map = OSDU_KINDS[data_type]
+    return [{"data": {field: f"{col} {i}" for col, field in field_map.items()}} for i in range(count)]
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != SEARCH_PATH:
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        records = self.server.records_by_kind.get(body.get("kind"), [])
+        start = int(body.get("cursor") or 0)
+        stop = start + int(body.get("limit", 10))
+        payload = json.dumps({
+            "results": records[start:stop],
+            "cursor": str(stop) if stop < len(records) else None,
+            "totalCount": len(records),
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(records_by_type, host="127.0.0.1", port=0):
+    """Chạy server trên thread nền, trả về (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), _SearchHandler)
+    server.records_by_kind = {OSDU_KINDS[data_type][0]: records for data_type, records in records_by_type.items()}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+    server, url = start_server({data_type: synthetic_records(data_type, args.rows) for data_type in OSDU_KINDS},
+                               port=args.port)
+    print(f"OSDU search stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()